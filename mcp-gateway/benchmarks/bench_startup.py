@@ -0,0 +1,213 @@
+"""Compare separate server processes per client with one shared gateway.
+
+For each of ``--clients`` clients the ``separate`` scenario spawns every
+backend server over stdio, the way cline_mcp_settings.template.json configures
+them, while the ``gateway`` scenario starts one SSE gateway and connects every
+client to it. Both report:
+
+- ready: seconds until a client has listed the tools of every backend
+- first call: seconds for the client's first one-page PDF conversion, which
+  starts the worker processes of a cold PDF server
+- memory: resident memory of all server processes and their workers
+
+The GitHub server is pointed at the stub API in mcp-server-github/benchmarks
+and the PostgreSQL server is only included when DATABASE_URL is set.
+
+Usage:
+    python benchmarks/bench_startup.py [--clients 3] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+import pymupdf
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+ROOT = Path(__file__).resolve().parents[2]
+GITHUB_DIR = ROOT / "mcp-server-github"
+
+sys.path.insert(0, str(GITHUB_DIR / "benchmarks"))
+
+from stub_api import serve as serve_stub  # noqa: E402
+
+
+def build_document(path: Path, pages: int) -> None:
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {number + 1}", fontsize=18)
+        page.insert_textbox(
+            pymupdf.Rect(72, 90, 540, 700), "Benchmark text. " * 200, fontsize=10
+        )
+    doc.save(path)
+    doc.close()
+
+
+def descendants_rss_mb(root: int) -> float:
+    """Resident memory of every process descended from a process."""
+    output = subprocess.run(
+        ["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True, check=True
+    ).stdout
+    children: dict[int, list[int]] = {}
+    rss: dict[int, int] = {}
+    for line in output.splitlines():
+        pid, ppid, kilobytes = (int(field) for field in line.split())
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kilobytes
+    total, stack = 0, list(children.get(root, []))
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024
+
+
+def server_commands(backends: list[str]) -> dict[str, StdioServerParameters]:
+    python, env = sys.executable, dict(os.environ)
+    commands = {
+        "pdf": StdioServerParameters(command=python, args=["-m", "mcp_server_pdf"], env=env),
+        "postgres": StdioServerParameters(
+            command=python, args=["-m", "mcp_server_postgres"], env=env
+        ),
+        "github": StdioServerParameters(
+            command=python,
+            args=[str(GITHUB_DIR / "mcp_server_github.py")],
+            cwd=GITHUB_DIR,
+            env=env,
+        ),
+    }
+    return {name: commands[name] for name in backends}
+
+
+async def run_client(
+    stack: AsyncExitStack, connect, pdf_tool: str, document: Path, page: int
+) -> dict:
+    """Open a client's sessions, list tools, then convert one PDF page.
+
+    Every client converts a different page so none is served from the cache.
+    """
+    started = time.perf_counter()
+    sessions = []
+    for connection in connect:
+        read_stream, write_stream = await stack.enter_async_context(connection())
+        sessions.append(
+            await stack.enter_async_context(ClientSession(read_stream, write_stream))
+        )
+    # Servers start up concurrently, as they do under an MCP client
+    await asyncio.gather(*(session.initialize() for session in sessions))
+    tools = 0
+    for session in sessions:
+        tools += len((await session.list_tools()).tools)
+    ready = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await sessions[0].call_tool(
+        pdf_tool, {"file_path": str(document), "page_range": str(page), "mode": "fast"}
+    )
+    return {"ready": ready, "first_call": time.perf_counter() - started, "tools": tools}
+
+
+def summarize(results: list[dict], rss_mb: float) -> dict:
+    return {
+        "clients": len(results),
+        "tools_per_client": results[0]["tools"],
+        "ready_seconds": [round(result["ready"], 3) for result in results],
+        "first_call_seconds": [round(result["first_call"], 3) for result in results],
+        "rss_mb": round(rss_mb, 1),
+    }
+
+
+async def separate(backends: list[str], clients: int, document: Path) -> dict:
+    commands = server_commands(backends)
+    # PDF first, so run_client's first session is the PDF server
+    connect = [lambda params=params: stdio_client(params) for params in commands.values()]
+    results = []
+    async with AsyncExitStack() as stack:
+        for client in range(clients):
+            results.append(
+                await run_client(stack, connect, "process_pdf_file", document, client + 1)
+            )
+        return summarize(results, descendants_rss_mb(os.getpid()))
+
+
+async def gateway(backends: list[str], clients: int, document: Path, port: int) -> dict:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "mcp_gateway", "--transport", "sse", "--port", str(port),
+         "--backends", ",".join(backends)],
+    )
+    try:
+        started = time.perf_counter()
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health").close()
+                break
+            except OSError as e:
+                if process.poll() is not None or time.perf_counter() - started > 60:
+                    raise RuntimeError("gateway did not start") from e
+                await asyncio.sleep(0.05)
+        startup = time.perf_counter() - started
+
+        connect = [lambda: sse_client(f"http://127.0.0.1:{port}/sse")]
+        results = []
+        async with AsyncExitStack() as stack:
+            for client in range(clients):
+                results.append(
+                    await run_client(
+                        stack, connect, "pdf__process_pdf_file", document, client + 1
+                    )
+                )
+            summary = summarize(results, descendants_rss_mb(os.getpid()))
+        summary["startup_seconds"] = round(startup, 3)
+        return summary
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8818)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    backends = ["pdf", "github"]
+    if os.environ.get("DATABASE_URL"):
+        backends.insert(1, "postgres")
+
+    stub = serve_stub(0, repos=250)
+    workdir = Path(tempfile.mkdtemp())
+    os.environ.update(
+        GITHUB_API_URL=f"http://127.0.0.1:{stub.server_address[1]}",
+        GITHUB_PERSONAL_ACCESS_TOKEN=os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN", "dummy"),
+        GITHUB_CACHE_DIR=str(workdir / "github"),
+        PDF_CACHE_DIR=str(workdir / "pdf"),
+        GATEWAY_GITHUB_SERVER_DIR=str(GITHUB_DIR),
+    )
+    document = workdir / "bench.pdf"
+    build_document(document, args.clients)
+
+    results = {
+        "backends": backends,
+        "separate": asyncio.run(separate(backends, args.clients, document)),
+        "gateway": asyncio.run(gateway(backends, args.clients, document, args.port)),
+    }
+    stub.shutdown()
+    print(json.dumps(results, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
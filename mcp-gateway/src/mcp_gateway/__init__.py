@@ -0,0 +1,6 @@
+"""Single-process MCP gateway hosting the local servers."""
+
+from .server import Gateway, serve
+
+__version__ = "0.1.0"
+__all__ = ["Gateway", "serve"]
@@ -0,0 +1,35 @@
+"""Main entry point for the MCP gateway."""
+
+import argparse
+import asyncio
+import os
+
+from .server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+# Defaults for the command-line options
+GATEWAY_TRANSPORT_ENV = "GATEWAY_TRANSPORT"
+GATEWAY_HOST_ENV = "GATEWAY_HOST"
+GATEWAY_PORT_ENV = "GATEWAY_PORT"
+
+
+def main() -> None:
+    """Run the MCP gateway."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse"],
+        default=os.environ.get(GATEWAY_TRANSPORT_ENV) or "stdio",
+    )
+    parser.add_argument("--host", default=os.environ.get(GATEWAY_HOST_ENV) or DEFAULT_HOST)
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get(GATEWAY_PORT_ENV) or DEFAULT_PORT)
+    )
+    parser.add_argument(
+        "--backends", help="Comma-separated backends to load (default: GATEWAY_BACKENDS or all)"
+    )
+    args = parser.parse_args()
+    asyncio.run(serve(args.transport, args.host, args.port, args.backends))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Servers the gateway hosts in-process."""
+
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from mcp.server import Server
+
+# Comma-separated backends to load. Backends that fail to load (missing
+# package, credentials or database URL) are reported by the health tool
+# instead of stopping the gateway.
+GATEWAY_BACKENDS_ENV = "GATEWAY_BACKENDS"
+DEFAULT_BACKENDS = ("pdf", "postgres", "github")
+
+# Directory holding mcp_server_github.py, which is a script rather than an
+# installed package. Defaults to the checkout next to this package.
+GATEWAY_GITHUB_SERVER_DIR_ENV = "GATEWAY_GITHUB_SERVER_DIR"
+
+# Tools are exposed as <backend><SEPARATOR><tool>
+SEPARATOR = "__"
+
+Builder = Callable[
+    [bool], tuple[Server, Callable[[], Awaitable[dict]], Callable[[], Awaitable[None]]]
+]
+
+
+@dataclass
+class Backend:
+    """A hosted server with its shared resources and call statistics."""
+
+    name: str
+    server: Server | None = None
+    health: Callable[[], Awaitable[dict]] | None = None
+    aclose: Callable[[], Awaitable[None]] | None = None
+    error: str | None = None
+    load_seconds: float = 0.0
+    calls: int = 0
+    errors: int = 0
+    last_error: str | None = None
+
+    @property
+    def available(self) -> bool:
+        return self.server is not None
+
+
+def _build_pdf(warm: bool):
+    from mcp_server_pdf.server import create_server
+
+    return create_server(warm=warm)
+
+
+def _build_postgres(warm: bool):
+    from mcp_server_postgres import create_server
+
+    return create_server()
+
+
+def _build_github(warm: bool):
+    directory = os.environ.get(GATEWAY_GITHUB_SERVER_DIR_ENV) or str(
+        Path(__file__).resolve().parents[3] / "mcp-server-github"
+    )
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    from mcp_server_github import create_server
+
+    return create_server()
+
+
+BUILDERS: dict[str, Builder] = {
+    "pdf": _build_pdf,
+    "postgres": _build_postgres,
+    "github": _build_github,
+}
+
+
+def backend_names(value: str | None = None) -> list[str]:
+    """Backends to load from a comma-separated list or the environment."""
+    value = value or os.environ.get(GATEWAY_BACKENDS_ENV, "")
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    names = names or list(DEFAULT_BACKENDS)
+    unknown = set(names) - set(BUILDERS)
+    if unknown:
+        raise ValueError(
+            f"Unknown backends: {', '.join(sorted(unknown))} "
+            f"(available: {', '.join(BUILDERS)})"
+        )
+    return names
+
+
+def load_backends(names: list[str], warm: bool = True) -> list[Backend]:
+    """Build every backend, recording load failures instead of raising.
+
+    Args:
+        names: Backends to load, see BUILDERS
+        warm: Start worker processes now rather than on first use
+    """
+    backends = []
+    for name in names:
+        backend = Backend(name)
+        started = time.perf_counter()
+        try:
+            backend.server, backend.health, backend.aclose = BUILDERS[name](warm)
+        except Exception as e:
+            backend.error = f"{type(e).__name__}: {e}"
+            print(f"[mcp-gateway] {name} unavailable: {backend.error}", file=sys.stderr)
+        backend.load_seconds = round(time.perf_counter() - started, 3)
+        backends.append(backend)
+    return backends
+
+
+async def close_backends(backends: list[Backend]) -> None:
+    for backend in backends:
+        if backend.aclose is not None:
+            try:
+                await backend.aclose()
+            except Exception as e:
+                print(f"[mcp-gateway] closing {backend.name} failed: {e}", file=sys.stderr)
@@ -0,0 +1,272 @@
+"""Gateway MCP server routing namespaced tools to in-process backends."""
+
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from typing import Literal
+
+from mcp import types
+from mcp.server import Server
+from mcp.server.stdio import stdio_server
+
+from .backends import SEPARATOR, Backend, backend_names, close_backends, load_backends
+
+HEALTH_TOOL = f"gateway{SEPARATOR}health"
+
+# Longest a backend health check may take before it is reported as failed
+HEALTH_TIMEOUT = 10.0
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8808
+
+Transport = Literal["stdio", "sse"]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / 1024**2 if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _error_result(message: str) -> types.ServerResult:
+    return types.ServerResult(
+        types.CallToolResult(content=[types.TextContent(type="text", text=message)], isError=True)
+    )
+
+
+class Gateway:
+    """One MCP server exposing the tools and prompts of several backends.
+
+    Backend servers are built once and their request handlers are called
+    directly, so every client session shares their worker pools, caches,
+    connection pools and HTTP clients. Tool and prompt names are prefixed
+    with the backend name (``pdf__process_pdf_file``). Backends read the
+    request context from the SDK's context variable, so progress
+    notifications they send reach the gateway's client session unchanged.
+    """
+
+    def __init__(self, backends: list[Backend]):
+        self.backends = {backend.name: backend for backend in backends}
+        self.started = time.time()
+        self.sessions = {"active": 0, "total": 0}
+        self.server = Server("mcp-gateway")
+        self._tools: list[types.Tool] | None = None
+        self._lock = asyncio.Lock()
+
+        handlers = self.server.request_handlers
+        handlers[types.ListToolsRequest] = self.list_tools
+        handlers[types.CallToolRequest] = self.call_tool
+        if any(
+            types.ListPromptsRequest in backend.server.request_handlers
+            for backend in self._available()
+        ):
+            handlers[types.ListPromptsRequest] = self.list_prompts
+            handlers[types.GetPromptRequest] = self.get_prompt
+
+    def _available(self) -> list[Backend]:
+        return [backend for backend in self.backends.values() if backend.available]
+
+    def _route(self, name: str) -> tuple[Backend | None, str]:
+        prefix, _, inner = name.partition(SEPARATOR)
+        backend = self.backends.get(prefix)
+        if backend is None or not backend.available or not inner:
+            return None, name
+        return backend, inner
+
+    async def _backend_tools(self) -> list[types.Tool]:
+        async with self._lock:
+            if self._tools is None:
+                tools = []
+                for backend in self._available():
+                    handler = backend.server.request_handlers[types.ListToolsRequest]
+                    result = await handler(types.ListToolsRequest(method="tools/list"))
+                    tools.extend(
+                        tool.model_copy(update={"name": f"{backend.name}{SEPARATOR}{tool.name}"})
+                        for tool in result.root.tools
+                    )
+                self._tools = tools
+            return self._tools
+
+    async def list_tools(self, request: types.ListToolsRequest) -> types.ServerResult:
+        health = types.Tool(
+            name=HEALTH_TOOL,
+            description="""Report the state of every backend hosted by the gateway.
+            Returns JSON with each backend's status (ok, error or unavailable), load
+            time, call and error counts, and backend details such as worker processes,
+            cache and index sizes, database latency and GitHub rate limits.""",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "backend": {
+                        "type": "string",
+                        "enum": list(self.backends),
+                        "description": "Only check this backend",
+                    }
+                },
+            },
+        )
+        tools = await self._backend_tools()
+        return types.ServerResult(types.ListToolsResult(tools=[health, *tools]))
+
+    async def call_tool(self, request: types.CallToolRequest) -> types.ServerResult:
+        name = request.params.name
+        if name == HEALTH_TOOL:
+            backend = (request.params.arguments or {}).get("backend")
+            if backend is not None and backend not in self.backends:
+                return _error_result(f"Unknown backend: {backend}")
+            report = await self.health(backend)
+            return types.ServerResult(
+                types.CallToolResult(
+                    content=[types.TextContent(type="text", text=json.dumps(report, indent=2))]
+                )
+            )
+
+        backend, tool = self._route(name)
+        if backend is None:
+            return _error_result(f"Unknown tool: {name}")
+        params = request.params.model_copy(update={"name": tool})
+        backend.calls += 1
+        try:
+            result = await backend.server.request_handlers[types.CallToolRequest](
+                request.model_copy(update={"params": params})
+            )
+        except Exception as e:
+            backend.errors += 1
+            backend.last_error = f"{tool}: {e}"
+            raise
+        if getattr(result.root, "isError", False):
+            backend.errors += 1
+            text = next((item.text for item in result.root.content if item.type == "text"), "")
+            backend.last_error = f"{tool}: {text[:200]}"
+        return result
+
+    async def list_prompts(self, request: types.ListPromptsRequest) -> types.ServerResult:
+        prompts = []
+        for backend in self._available():
+            handler = backend.server.request_handlers.get(types.ListPromptsRequest)
+            if handler is None:
+                continue
+            result = await handler(request)
+            prompts.extend(
+                prompt.model_copy(update={"name": f"{backend.name}{SEPARATOR}{prompt.name}"})
+                for prompt in result.root.prompts
+            )
+        return types.ServerResult(types.ListPromptsResult(prompts=prompts))
+
+    async def get_prompt(self, request: types.GetPromptRequest) -> types.ServerResult:
+        backend, prompt = self._route(request.params.name)
+        handler = backend.server.request_handlers.get(types.GetPromptRequest) if backend else None
+        if handler is None:
+            raise ValueError(f"Unknown prompt: {request.params.name}")
+        params = request.params.model_copy(update={"name": prompt})
+        return await handler(request.model_copy(update={"params": params}))
+
+    async def _check(self, backend: Backend) -> dict:
+        entry = {
+            "status": "unavailable",
+            "load_seconds": backend.load_seconds,
+            "calls": backend.calls,
+            "errors": backend.errors,
+            "last_error": backend.last_error,
+        }
+        if not backend.available:
+            entry["error"] = backend.error
+            return entry
+        started = time.perf_counter()
+        try:
+            entry["details"] = await asyncio.wait_for(backend.health(), HEALTH_TIMEOUT)
+            entry["status"] = "ok"
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        entry["check_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return entry
+
+    async def health(self, only: str | None = None) -> dict:
+        """Check every backend, or one, concurrently."""
+        names = [only] if only else list(self.backends)
+        checks = await asyncio.gather(*(self._check(self.backends[name]) for name in names))
+        return {
+            "uptime_seconds": round(time.time() - self.started),
+            "pid": os.getpid(),
+            "peak_rss_mb": _peak_rss_mb(),
+            "sessions": dict(self.sessions),
+            "backends": dict(zip(names, checks)),
+        }
+
+    async def run_session(self, read_stream, write_stream) -> None:
+        """Serve one client session; sessions may run concurrently."""
+        self.sessions["active"] += 1
+        self.sessions["total"] += 1
+        try:
+            await self.server.run(
+                read_stream, write_stream, self.server.create_initialization_options()
+            )
+        finally:
+            self.sessions["active"] -= 1
+
+    def sse_app(self):
+        """Starlette app serving sessions over SSE, plus GET /health."""
+        from mcp.server.sse import SseServerTransport
+        from starlette.applications import Starlette
+        from starlette.requests import Request
+        from starlette.responses import JSONResponse, Response
+        from starlette.routing import Mount, Route
+
+        transport = SseServerTransport("/messages/")
+
+        async def handle_sse(request: Request) -> Response:
+            async with transport.connect_sse(
+                request.scope, request.receive, request._send
+            ) as (read_stream, write_stream):
+                await self.run_session(read_stream, write_stream)
+            return Response()
+
+        async def handle_health(request: Request) -> Response:
+            return JSONResponse(await self.health())
+
+        return Starlette(
+            routes=[
+                Route("/sse", endpoint=handle_sse, methods=["GET"]),
+                Route("/health", endpoint=handle_health, methods=["GET"]),
+                Mount("/messages/", app=transport.handle_post_message),
+            ]
+        )
+
+
+async def serve(
+    transport: Transport = "stdio",
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    backends: str | None = None,
+) -> None:
+    """Load the backends and serve them until the transport closes.
+
+    Args:
+        transport: ``stdio`` for a single client session, ``sse`` for a
+            long-running endpoint many sessions connect to
+        host: Interface the SSE endpoint binds to
+        port: Port of the SSE endpoint
+        backends: Comma-separated backends, defaulting to GATEWAY_BACKENDS
+    """
+    loaded = load_backends(backend_names(backends), warm=True)
+    gateway = Gateway(loaded)
+    # An initial health check opens database connections and API keep-alive
+    # connections before the first tool call needs them
+    warmup = asyncio.create_task(gateway.health())
+    try:
+        if transport == "stdio":
+            async with stdio_server() as (read_stream, write_stream):
+                await gateway.run_session(read_stream, write_stream)
+        else:
+            import uvicorn
+
+            config = uvicorn.Config(gateway.sse_app(), host=host, port=port, log_level="warning")
+            print(f"[mcp-gateway] serving SSE on http://{host}:{port}/sse", file=sys.stderr)
+            await uvicorn.Server(config).serve()
+    finally:
+        warmup.cancel()
+        await close_backends(loaded)
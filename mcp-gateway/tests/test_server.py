@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+from mcp import types
+from mcp.server import Server
+
+from mcp_gateway import backends as backends_module
+from mcp_gateway import server as server_module
+from mcp_gateway.backends import Backend, load_backends
+from mcp_gateway.server import HEALTH_TOOL, Gateway
+
+
+def stub_backend(name: str, health_delay: float = 0.0) -> Backend:
+    """A backend with an ``echo`` tool that fails on request."""
+    server = Server(name)
+
+    @server.list_tools()
+    async def list_tools() -> list[types.Tool]:
+        return [
+            types.Tool(
+                name="echo",
+                description="Echo the text back",
+                inputSchema={"type": "object", "properties": {"text": {"type": "string"}}},
+            )
+        ]
+
+    @server.call_tool()
+    async def call_tool(tool: str, arguments: dict) -> list[types.TextContent]:
+        if arguments.get("text") == "fail":
+            raise ValueError("asked to fail")
+        return [types.TextContent(type="text", text=f"{name}:{tool}:{arguments['text']}")]
+
+    async def health() -> dict:
+        await asyncio.sleep(health_delay)
+        return {"backend": name}
+
+    return Backend(name, server=server, health=health)
+
+
+def unavailable_backend(name: str) -> Backend:
+    return Backend(name, error="ValueError: DATABASE_URL is not set")
+
+
+def call(gateway: Gateway, name: str, arguments: dict | None = None) -> types.CallToolResult:
+    request = types.CallToolRequest(
+        method="tools/call", params=types.CallToolRequestParams(name=name, arguments=arguments)
+    )
+    return asyncio.run(gateway.call_tool(request)).root
+
+
+def text(result: types.CallToolResult) -> str:
+    return result.content[0].text
+
+
+@pytest.fixture
+def gateway():
+    return Gateway([stub_backend("pdf"), stub_backend("github"), unavailable_backend("postgres")])
+
+
+def test_tools_are_namespaced_by_backend(gateway):
+    request = types.ListToolsRequest(method="tools/list")
+    tools = asyncio.run(gateway.list_tools(request)).root.tools
+    assert [tool.name for tool in tools] == [HEALTH_TOOL, "pdf__echo", "github__echo"]
+    assert tools[0].inputSchema["properties"]["backend"]["enum"] == ["pdf", "github", "postgres"]
+
+
+def test_calls_are_routed_to_their_backend(gateway):
+    assert text(call(gateway, "pdf__echo", {"text": "hi"})) == "pdf:echo:hi"
+    assert text(call(gateway, "github__echo", {"text": "hi"})) == "github:echo:hi"
+    assert (gateway.backends["pdf"].calls, gateway.backends["github"].calls) == (1, 1)
+
+
+def test_backend_errors_are_counted(gateway):
+    result = call(gateway, "pdf__echo", {"text": "fail"})
+    assert result.isError
+    backend = gateway.backends["pdf"]
+    assert (backend.calls, backend.errors) == (1, 1)
+    assert backend.last_error == "echo: asked to fail"
+
+
+@pytest.mark.parametrize("name", ["postgres__query", "nosuch__echo", "pdf__", "pdf"])
+def test_unroutable_tools(gateway, name):
+    result = call(gateway, name, {"text": "hi"})
+    assert result.isError
+    assert text(result) == f"Unknown tool: {name}"
+
+
+def test_health_reports_each_backend(gateway):
+    report = json.loads(text(call(gateway, HEALTH_TOOL)))
+    backends = report["backends"]
+    assert backends["pdf"]["status"] == "ok"
+    assert backends["pdf"]["details"] == {"backend": "pdf"}
+    assert backends["postgres"]["status"] == "unavailable"
+    assert backends["postgres"]["error"] == "ValueError: DATABASE_URL is not set"
+
+
+def test_health_of_one_backend(gateway):
+    report = json.loads(text(call(gateway, HEALTH_TOOL, {"backend": "github"})))
+    assert list(report["backends"]) == ["github"]
+    result = call(gateway, HEALTH_TOOL, {"backend": "nosuch"})
+    assert result.isError and text(result) == "Unknown backend: nosuch"
+
+
+def test_health_check_times_out_per_backend(monkeypatch):
+    monkeypatch.setattr(server_module, "HEALTH_TIMEOUT", 0.05)
+    gateway = Gateway([stub_backend("pdf"), stub_backend("github", health_delay=5)])
+    report = asyncio.run(gateway.health())
+    assert report["backends"]["pdf"]["status"] == "ok"
+    slow = report["backends"]["github"]
+    assert (slow["status"], slow["error"]) == ("error", "TimeoutError")
+    # The slow backend does not hold up the report
+    assert slow["check_ms"] < 1000
+
+
+def test_load_failures_leave_backend_unavailable(monkeypatch):
+    def broken(warm):
+        raise RuntimeError("no credentials")
+
+    def working(warm):
+        backend = stub_backend("pdf")
+        return backend.server, backend.health, None
+
+    monkeypatch.setitem(backends_module.BUILDERS, "pdf", working)
+    monkeypatch.setitem(backends_module.BUILDERS, "github", broken)
+    pdf, github = load_backends(["pdf", "github"])
+    assert pdf.available and not github.available
+    assert github.error == "RuntimeError: no credentials"
@@ -0,0 +1,349 @@
+"""Benchmark PDF extraction end to end over a deterministic corpus.
+
+Builds the corpus from benchmarks/corpus.py, then converts every document
+through the MCP server's process_pdf_file tool, one fresh server process per
+case with the conversion cache disabled. Records pages/sec, per-page p50/p95
+latency, peak RSS of the server and its workers, and output bytes, and writes
+the results as JSON so runs can be compared.
+
+Per-page latency comes from the progress notifications the server sends as
+pages finish. By default the server runs one worker with one page per task,
+so every notification marks exactly one converted page.
+
+--modes compares the server's conversion modes (fast, balanced, full) on the
+same corpus and reports each mode's throughput relative to full.
+
+With --profile DIR every case is also converted in-process under cProfile,
+writing DIR/<case>.prof plus a text summary; if py-spy is installed a
+flamegraph of the server and its workers is recorded as DIR/<case>.svg.
+
+Usage:
+    python benchmarks/bench_extract.py [--cases text,tables] [--repeat 3]
+        [--modes fast,balanced,full] [--output results.json]
+        [--compare baseline.json] [--profile DIR]
+"""
+
+import argparse
+import asyncio
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from importlib import metadata
+from pathlib import Path
+
+import pymupdf
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from corpus import CASES, build_corpus, sha256
+from mcp_server_pdf.convert import ConversionMode, convert_page, identify_headers
+
+DEFAULT_CORPUS_DIR = Path(__file__).parent / ".corpus"
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Percentile of a non-empty list, taking the sample nearest to q.
+
+    The minimum is the 0th percentile and the maximum the 100th.
+    """
+    ordered = sorted(values)
+    return ordered[round(q / 100 * (len(ordered) - 1))]
+
+
+def _children(pid: int) -> list[int]:
+    """Direct child processes of pid, read from /proc."""
+    children = []
+    for stat_path in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat_path.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(stat_path.parent.name))
+    return children
+
+
+def _process_tree(pid: int) -> list[int]:
+    tree = [pid]
+    for child in _children(pid):
+        tree.extend(_process_tree(child))
+    return tree
+
+
+def _peak_rss(pid: int) -> int:
+    """Peak resident memory (VmHWM) of a process in bytes, 0 if unknown."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _server_pid() -> int | None:
+    """The MCP server started by the stdio client, a child of this process."""
+    for pid in _children(os.getpid()):
+        try:
+            if b"mcp_server_pdf" in Path(f"/proc/{pid}/cmdline").read_bytes():
+                return pid
+        except OSError:
+            continue
+    return None
+
+
+def server_env(args: argparse.Namespace, scratch: Path) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        PDF_WORKERS=str(args.workers),
+        PDF_CHUNK_PAGES=str(args.chunk_pages),
+        PDF_CACHE_MAX_BYTES="0",
+        PDF_INDEX_PATH=str(scratch / "index.db"),
+    )
+    return env
+
+
+MODES = ("fast", "balanced", "full")
+
+
+async def run_case(
+    name: str, path: Path, mode: ConversionMode, args: argparse.Namespace, scratch: Path
+) -> dict:
+    """Convert one document repeatedly in a fresh server and collect metrics."""
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "mcp_server_pdf"],
+        env=server_env(args, scratch),
+    )
+    arguments = {"file_path": str(path), "output_format": args.format, "mode": mode}
+    elapsed: list[float] = []
+    latencies: list[float] = []
+    first_page: list[float] = []
+    output_bytes = 0
+    flamegraph = None
+
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                # Start the worker pool outside the timed runs
+                await session.call_tool(
+                    "process_pdf_file", {**arguments, "page_range": "1"}
+                )
+                server_pid = _server_pid()
+
+                spy = None
+                if args.profile and shutil.which("py-spy") and server_pid:
+                    flamegraph = Path(args.profile) / f"{name}-{mode}.svg"
+                    spy = subprocess.Popen(
+                        ["py-spy", "record", "--subprocesses", "--pid", str(server_pid),
+                         "--output", str(flamegraph)],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+
+                for _ in range(args.repeat):
+                    marks: list[float] = []
+
+                    async def on_progress(progress, total, message) -> None:
+                        marks.append(time.perf_counter())
+
+                    started = time.perf_counter()
+                    result = await session.call_tool(
+                        "process_pdf_file", arguments, progress_callback=on_progress
+                    )
+                    finished = time.perf_counter()
+                    if result.isError:
+                        raise RuntimeError(f"{name}: {result.content[0].text}")
+                    elapsed.append(finished - started)
+                    if marks:
+                        first_page.append((marks[0] - started) * 1000)
+                        latencies.extend(
+                            (later - earlier) * 1000 for earlier, later in zip(marks, marks[1:])
+                        )
+                    # The last item is the status line
+                    output_bytes = sum(
+                        len(item.text.encode("utf-8")) for item in result.content[:-1]
+                    )
+
+                if spy is not None:
+                    spy.send_signal(signal.SIGINT)
+                    spy.wait()
+                peak_rss = sum(_peak_rss(pid) for pid in _process_tree(server_pid or 0))
+
+    with pymupdf.open(path) as doc:
+        pages = doc.page_count
+    median = sorted(elapsed)[len(elapsed) // 2]
+    return {
+        "case": name,
+        "mode": mode,
+        "pages": pages,
+        "pdf_bytes": path.stat().st_size,
+        "sha256": sha256(path),
+        "runs": len(elapsed),
+        "seconds": round(median, 3),
+        "pages_per_sec": round(pages / median, 2),
+        "p50_ms": round(percentile(latencies, 50), 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95), 2) if latencies else None,
+        "first_page_ms": round(sorted(first_page)[len(first_page) // 2], 2)
+        if first_page
+        else None,
+        "peak_rss_mb": round(peak_rss / 1024**2, 1),
+        "output_bytes": output_bytes,
+        "flamegraph": str(flamegraph) if flamegraph and flamegraph.exists() else None,
+    }
+
+
+def profile_case(
+    name: str, path: Path, mode: ConversionMode, directory: Path, top: int = 25
+) -> Path:
+    """Convert a document in-process under cProfile and save the stats."""
+    profiler = cProfile.Profile()
+    with pymupdf.open(path) as doc:
+        pages = list(range(doc.page_count))
+        profiler.enable()
+        hdr_info = identify_headers(doc, pages) if mode != "fast" else None
+        for page_number in pages:
+            convert_page(doc, page_number, hdr_info, mode)
+        profiler.disable()
+
+    stats_path = directory / f"{name}-{mode}.prof"
+    profiler.dump_stats(stats_path)
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(top)
+    (directory / f"{name}-{mode}.txt").write_text(summary.getvalue(), encoding="utf-8")
+    return stats_path
+
+
+def environment() -> dict:
+    def version(package: str) -> str | None:
+        try:
+            return metadata.version(package)
+        except metadata.PackageNotFoundError:
+            return None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pymupdf": version("pymupdf"),
+        "pymupdf4llm": version("pymupdf4llm"),
+        "mcp": version("mcp"),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> bool:
+    """Print per-case changes against a baseline; False if throughput regressed."""
+    previous = {
+        (case["case"], case.get("mode", "full")): case for case in baseline["cases"]
+    }
+    ok = True
+    print("case,mode,metric,baseline,current,change_pct")
+    for case in current["cases"]:
+        old = previous.get((case["case"], case["mode"]))
+        if old is None:
+            continue
+        label = f"{case['case']},{case['mode']}"
+        if old["sha256"] != case["sha256"]:
+            print(f"{label},corpus,changed,,", file=sys.stderr)
+        for metric in ("pages_per_sec", "p50_ms", "p95_ms", "peak_rss_mb", "output_bytes"):
+            if old.get(metric) is None or case.get(metric) is None:
+                continue
+            change = (case[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+            print(f"{label},{metric},{old[metric]},{case[metric]},{change:+.1f}")
+            if metric == "pages_per_sec" and change < -threshold:
+                ok = False
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--cases", default=",".join(CASES), help="Comma-separated cases to run"
+    )
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-pages", type=int, default=1)
+    parser.add_argument(
+        "--format", default="markdown", choices=["markdown", "page_chunks", "llamaindex"]
+    )
+    parser.add_argument(
+        "--modes", default="full", help="Comma-separated conversion modes to run"
+    )
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Pages/sec drop in percent that fails --compare",
+    )
+    parser.add_argument("--profile", type=Path, help="Directory for cProfile/py-spy output")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = set(names) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))}")
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(sorted(unknown))}")
+    if args.profile:
+        args.profile.mkdir(parents=True, exist_ok=True)
+
+    paths = build_corpus(args.corpus_dir, names)
+    results = {
+        "environment": environment(),
+        "settings": {
+            "repeat": args.repeat,
+            "workers": args.workers,
+            "chunk_pages": args.chunk_pages,
+            "format": args.format,
+        },
+        "cases": [],
+    }
+
+    print("case,mode,pages,pages_per_sec,speedup_vs_full,p50_ms,p95_ms,peak_rss_mb,output_bytes")
+    with tempfile.TemporaryDirectory() as scratch:
+        for name, path in paths.items():
+            cases = []
+            for mode in modes:
+                case = asyncio.run(run_case(name, path, mode, args, Path(scratch)))
+                if args.profile:
+                    case["profile"] = str(profile_case(name, path, mode, args.profile))
+                cases.append(case)
+            full = next((case for case in cases if case["mode"] == "full"), None)
+            for case in cases:
+                if full is not None:
+                    case["speedup_vs_full"] = round(
+                        case["pages_per_sec"] / full["pages_per_sec"], 2
+                    )
+                results["cases"].append(case)
+                print(
+                    f"{name},{case['mode']},{case['pages']},{case['pages_per_sec']},"
+                    f"{case.get('speedup_vs_full')},{case['p50_ms']},{case['p95_ms']},"
+                    f"{case['peak_rss_mb']},{case['output_bytes']}"
+                )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if not compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark parallel page conversion across process pool sizes.
+
+Generates a multi-hundred-page PDF with text and ruled tables, converts it
+with one ConversionPool per worker count and reports throughput and speedup
+relative to a single worker.
+
+Usage:
+    python benchmarks/bench_pool.py [--pages 400] [--workers 1,2,4,8]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pymupdf
+
+from mcp_server_pdf.convert import identify_headers
+from mcp_server_pdf.pool import ConversionPool
+
+
+def build_document(path: Path, pages: int) -> None:
+    """Write a deterministic PDF with a heading, paragraphs and a table per page."""
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Section {number + 1}", fontsize=18)
+        body = " ".join(f"Paragraph text {number}-{i}." for i in range(60))
+        page.insert_textbox(pymupdf.Rect(72, 90, 540, 300), body, fontsize=10)
+        top = 320
+        for row in range(8):
+            for col in range(4):
+                x0, y0 = 72 + col * 117, top + row * 20
+                cell = pymupdf.Rect(x0, y0, x0 + 117, y0 + 20)
+                page.draw_rect(cell, width=0.5)
+                page.insert_text((cell.x0 + 4, cell.y1 - 6), f"r{row}c{col}", fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+async def run(path: Path, workers: int) -> float:
+    """Convert every page of the document and return elapsed seconds."""
+    with pymupdf.open(path) as doc:
+        pages = list(range(doc.page_count))
+        hdr_info = identify_headers(doc, pages)
+
+    pool = ConversionPool(workers=workers)
+    try:
+        # Warm the workers so process start-up is not part of the timing
+        await pool.convert(str(path), pages[:workers], hdr_info)
+        started = time.perf_counter()
+        await pool.convert(str(path), pages, hdr_info)
+        return time.perf_counter() - started
+    finally:
+        pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument(
+        "--workers",
+        default=",".join(str(n) for n in (1, 2, 4, 8) if n <= (os.cpu_count() or 1)),
+        help="Comma-separated worker counts to compare",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.pdf"
+        build_document(path, args.pages)
+
+        baseline = None
+        print("workers,seconds,pages_per_sec,speedup")
+        for workers in (int(n) for n in args.workers.split(",")):
+            elapsed = asyncio.run(run(path, workers))
+            baseline = baseline or elapsed
+            print(f"{workers},{elapsed:.2f},{args.pages / elapsed:.1f},{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
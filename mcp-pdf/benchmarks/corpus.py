@@ -0,0 +1,178 @@
+"""Deterministic PDF corpus for extraction benchmarks.
+
+Every document is generated from a fixed seed, so the same corpus is built on
+every machine and results from different runs can be compared. Each case
+stresses a different part of the conversion: plain text, column detection,
+table extraction, image handling and very long documents.
+"""
+
+import hashlib
+import random
+from collections.abc import Callable
+from pathlib import Path
+
+import pymupdf
+
+WORDS = (
+    "analysis budget capital delivery estimate forecast growth inventory "
+    "margin network operations portfolio quarter revenue schedule strategy "
+    "supplier throughput utilisation variance warehouse yield region segment "
+    "contract customer demand expense facility logistics"
+).split()
+
+PAGE = pymupdf.paper_rect("a4")
+MARGIN = 56
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+def _heading(page: pymupdf.Page, text: str, y: float = MARGIN + 16) -> float:
+    page.insert_text((MARGIN, y), text, fontsize=18, fontname="hebo")
+    return y + 14
+
+
+def build_text(path: Path, pages: int, seed: int) -> None:
+    """Single-column prose with headings."""
+    rng = random.Random(seed)
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page(width=PAGE.width, height=PAGE.height)
+        top = _heading(page, f"Chapter {number + 1}")
+        body = "\n\n".join(_paragraph(rng, 5) for _ in range(4))
+        page.insert_textbox(
+            pymupdf.Rect(MARGIN, top, PAGE.width - MARGIN, PAGE.height - MARGIN),
+            body,
+            fontsize=10,
+        )
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def build_multicolumn(path: Path, pages: int, seed: int) -> None:
+    """Two- and three-column layouts, alternating per page."""
+    rng = random.Random(seed)
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page(width=PAGE.width, height=PAGE.height)
+        top = _heading(page, f"Report {number + 1}")
+        columns = 2 + number % 2
+        gap = 18
+        width = (PAGE.width - 2 * MARGIN - gap * (columns - 1)) / columns
+        for column in range(columns):
+            x0 = MARGIN + column * (width + gap)
+            body = "\n\n".join(_paragraph(rng, 3) for _ in range(4))
+            page.insert_textbox(
+                pymupdf.Rect(x0, top, x0 + width, PAGE.height - MARGIN), body, fontsize=9
+            )
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def build_tables(path: Path, pages: int, seed: int) -> None:
+    """Ruled numeric tables with a short caption on every page."""
+    rng = random.Random(seed)
+    doc = pymupdf.open()
+    rows, cols = 18, 6
+    for number in range(pages):
+        page = doc.new_page(width=PAGE.width, height=PAGE.height)
+        top = _heading(page, f"Table {number + 1}")
+        page.insert_textbox(
+            pymupdf.Rect(MARGIN, top, PAGE.width - MARGIN, top + 40),
+            _sentence(rng, 14),
+            fontsize=10,
+        )
+        top += 50
+        width = (PAGE.width - 2 * MARGIN) / cols
+        for row in range(rows):
+            for col in range(cols):
+                cell = pymupdf.Rect(
+                    MARGIN + col * width,
+                    top + row * 22,
+                    MARGIN + (col + 1) * width,
+                    top + (row + 1) * 22,
+                )
+                page.draw_rect(cell, width=0.5)
+                if row == 0:
+                    text = WORDS[(number + col) % len(WORDS)].title()
+                elif col == 0:
+                    text = f"Q{row}"
+                else:
+                    text = f"{rng.uniform(0, 10000):,.2f}"
+                page.insert_text((cell.x0 + 4, cell.y1 - 7), text, fontsize=8)
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def _image(rng: random.Random, width: int, height: int) -> pymupdf.Pixmap:
+    """A smooth RGB gradient with noise, so it neither compresses away nor is trivial."""
+    red, green, blue = rng.random(), rng.random(), rng.random()
+    samples = bytearray()
+    for y in range(height):
+        for x in range(width):
+            noise = rng.randint(0, 24)
+            samples += bytes(
+                (
+                    int(255 * red * x / width) ^ noise,
+                    int(255 * green * y / height) ^ noise,
+                    int(255 * blue * (x + y) / (width + height)) ^ noise,
+                )
+            )
+    return pymupdf.Pixmap(pymupdf.csRGB, width, height, bytes(samples), 0)
+
+
+def build_images(path: Path, pages: int, seed: int) -> None:
+    """Pages dominated by raster images with captions."""
+    rng = random.Random(seed)
+    images = [_image(rng, 320, 200) for _ in range(4)]
+    doc = pymupdf.open()
+    for number in range(pages):
+        page = doc.new_page(width=PAGE.width, height=PAGE.height)
+        top = _heading(page, f"Figure set {number + 1}")
+        width = (PAGE.width - 2 * MARGIN - 16) / 2
+        for slot in range(4):
+            x0 = MARGIN + (slot % 2) * (width + 16)
+            y0 = top + (slot // 2) * 300
+            rect = pymupdf.Rect(x0, y0, x0 + width, y0 + width * 0.625)
+            page.insert_image(rect, pixmap=images[(number + slot) % len(images)])
+            page.insert_text(
+                (x0, rect.y1 + 14), f"Figure {number + 1}.{slot + 1}: {_sentence(rng, 6)}",
+                fontsize=8,
+            )
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+# name -> (builder, pages, seed)
+CASES: dict[str, tuple[Callable[[Path, int, int], None], int, int]] = {
+    "text": (build_text, 60, 1),
+    "multicolumn": (build_multicolumn, 60, 2),
+    "tables": (build_tables, 40, 3),
+    "images": (build_images, 30, 4),
+    "large": (build_text, 1200, 5),
+}
+
+
+def sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def build_corpus(directory: Path, names: list[str] | None = None) -> dict[str, Path]:
+    """Build the requested cases into a directory, reusing files already there."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name in names or list(CASES):
+        builder, pages, seed = CASES[name]
+        path = directory / f"{name}.pdf"
+        if not path.exists():
+            tmp_path = path.with_suffix(".tmp")
+            builder(tmp_path, pages, seed)
+            tmp_path.replace(path)
+        paths[name] = path
+    return paths
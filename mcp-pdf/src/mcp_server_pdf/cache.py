@@ -0,0 +1,265 @@
+"""Content-addressed on-disk cache for PDF conversion results."""
+
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pymupdf
+import pymupdf4llm
+
+# Cache location and size budget. A budget of 0 disables the cache.
+PDF_CACHE_DIR_ENV = "PDF_CACHE_DIR"
+PDF_CACHE_MAX_BYTES_ENV = "PDF_CACHE_MAX_BYTES"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mcp-pdf"
+DEFAULT_CACHE_MAX_BYTES = 1024**3
+
+# Bumped whenever the index layout changes; older indexes are rebuilt.
+SCHEMA_VERSION = 2
+
+# Part of every entry key, so upgrading the converter or MuPDF does not serve
+# markdown produced by the previous version.
+CONVERTER_VERSION = f"pymupdf4llm-{pymupdf4llm.__version__}:pymupdf-{pymupdf.VersionBind}"
+
+
+class ConversionCache:
+    """Persistent cache of converted pages keyed by PDF content and options.
+
+    Entries are JSON files named by the SHA-256 of the PDF bytes combined with
+    the conversion options. A small SQLite index tracks entry sizes and access
+    times for LRU eviction, and remembers the digest of local files by
+    (path, mtime, size) so unchanged files are not rehashed.
+
+    Downloaded PDFs are kept alongside the entries together with their
+    ETag/Last-Modified validators, so unchanged remote documents can be
+    revalidated with a conditional request instead of downloaded again. They
+    share the same size budget.
+    """
+
+    def __init__(self, directory: Path | str | None = None, max_bytes: int | None = None):
+        self.directory = Path(
+            directory or os.environ.get(PDF_CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        ).expanduser()
+        if max_bytes is None:
+            value = os.environ.get(PDF_CACHE_MAX_BYTES_ENV, "").strip()
+            max_bytes = int(value) if value else DEFAULT_CACHE_MAX_BYTES
+        self.max_bytes = max_bytes
+        if self.enabled:
+            (self.directory / "entries").mkdir(parents=True, exist_ok=True)
+            with self._connect() as db:
+                (version,) = db.execute("PRAGMA user_version").fetchone()
+                if version != SCHEMA_VERSION:
+                    db.executescript(
+                        """
+                        DROP TABLE IF EXISTS entries;
+                        DROP TABLE IF EXISTS files;
+                        DROP TABLE IF EXISTS urls;
+                        """
+                    )
+                db.executescript(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        path TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_access REAL NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS files (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        digest TEXT NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS urls (
+                        url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_modified TEXT,
+                        digest TEXT NOT NULL
+                    );
+                    PRAGMA user_version = {SCHEMA_VERSION};
+                    """
+                )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.directory / "cache.db", timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / "entries" / key[:2] / f"{key}.json"
+
+    def _body_path(self, digest: str) -> Path:
+        return self.directory / "bodies" / digest[:2] / f"{digest}.pdf"
+
+    def _register(self, key: str, path: Path, size: int) -> None:
+        """Record a stored file in the index and evict over budget."""
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, str(path.relative_to(self.directory)), size, time.time()),
+            )
+            self._evict(db)
+
+    def _touch(self, key: str) -> None:
+        with self._connect() as db:
+            db.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+
+    @staticmethod
+    def bytes_digest(data: bytes) -> str:
+        """SHA-256 hex digest of in-memory PDF bytes."""
+        return hashlib.sha256(data).hexdigest()
+
+    def file_digest(self, path: str | Path) -> str:
+        """SHA-256 hex digest of a local file.
+
+        Short-circuits on (path, mtime, size) so an unchanged file is only
+        hashed once.
+        """
+        path = os.path.realpath(path)
+        stat = os.stat(path)
+        if self.enabled:
+            with self._connect() as db:
+                row = db.execute(
+                    "SELECT digest FROM files WHERE path = ? AND mtime_ns = ? AND size = ?",
+                    (path, stat.st_mtime_ns, stat.st_size),
+                ).fetchone()
+            if row:
+                return row[0]
+
+        with open(path, "rb") as f:
+            if stat.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest = hashlib.sha256(mapped).hexdigest()
+            else:
+                digest = hashlib.sha256(b"").hexdigest()
+
+        if self.enabled:
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, digest),
+                )
+        return digest
+
+    @staticmethod
+    def key(digest: str, options: dict) -> str:
+        """Cache key for a document digest, its conversion options and the converter."""
+        encoded = json.dumps(options, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{digest}:{encoded}:{CONVERTER_VERSION}".encode()).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return a cached entry and mark it as recently used."""
+        if not self.enabled:
+            return None
+        try:
+            entry = json.loads(self._entry_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._touch(key)
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """Store an entry, then evict least recently used entries over budget."""
+        if not self.enabled:
+            return
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(entry).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        self._register(key, path, len(data))
+
+    def url_validators(self, url: str) -> dict | None:
+        """Return the stored validators for a URL whose body is still cached."""
+        if not self.enabled:
+            return None
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT etag, last_modified, digest FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or not self._body_path(row[2]).exists():
+            return None
+        etag, last_modified, digest = row
+        return {"etag": etag, "last_modified": last_modified, "digest": digest}
+
+    def url_body(self, digest: str) -> Path | None:
+        """Path of a cached PDF body, marked as recently used.
+
+        Returns None if the body has been evicted.
+        """
+        path = self._body_path(digest)
+        if not path.exists():
+            return None
+        self._touch(f"body:{digest}")
+        return path
+
+    def store_url(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        digest: str,
+        body: bytes | bytearray | memoryview,
+    ) -> Path | None:
+        """Store a downloaded PDF body and its validators.
+
+        Returns:
+            Path of the cached body, or None if the cache cannot hold it
+        """
+        size = len(body)
+        if not self.enabled or size > self.max_bytes:
+            return None
+        path = self._body_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(body)
+            os.replace(tmp_path, path)
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, digest),
+            )
+        self._register(f"body:{digest}", path, size)
+        return path if path.exists() else None
+
+    def usage(self) -> dict:
+        """Number and total size of stored entries against the budget."""
+        if not self.enabled:
+            return {"enabled": False}
+        with self._connect() as db:
+            entries, size = db.execute(
+                "SELECT count(*), coalesce(sum(size), 0) FROM entries"
+            ).fetchone()
+        return {"enabled": True, "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute("SELECT coalesce(sum(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        for key, path, size in db.execute(
+            "SELECT key, path, size FROM entries ORDER BY last_access"
+        ).fetchall():
+            (self.directory / path).unlink(missing_ok=True)
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
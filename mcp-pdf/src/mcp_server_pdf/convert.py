@@ -0,0 +1,156 @@
+"""Page selection and page-by-page conversion helpers."""
+
+import mmap
+from pathlib import Path
+from typing import Literal
+
+import pymupdf
+import pymupdf4llm
+
+# A PDF given either as a local path or as bytes already in memory
+PDFSource = str | Path | bytes | bytearray | memoryview
+
+# Conversion modes, cheapest first:
+#   fast      plain text blocks in reading order, no layout analysis at all
+#   balanced  markdown with headers and column detection, but no table,
+#             image or vector graphics analysis
+#   full      complete pymupdf4llm layout, table and graphics analysis
+ConversionMode = Literal["fast", "balanced", "full"]
+
+BALANCED_OPTIONS = {
+    "ignore_images": True,
+    "ignore_graphics": True,
+    "detect_bg_color": False,
+    # Implied by ignore_graphics, but stated so table detection stays off
+    "table_strategy": None,
+}
+
+# Newer pymupdf4llm releases switch to the PyMuPDF Layout engine whenever
+# pymupdf.layout is installed. That path has no IdentifyHeaders and silently
+# ignores hdr_info and the balanced options, so keep the classic converter.
+if hasattr(pymupdf4llm, "use_layout"):
+    pymupdf4llm.use_layout(False)
+
+
+class OpenDocument:
+    """A PyMuPDF document opened over memory, without an intermediate copy.
+
+    Local paths are memory-mapped so pages are read straight from the page
+    cache, and in-memory buffers are wrapped in a memoryview so PyMuPDF does
+    not copy them. The backing buffer is released when the document closes.
+    """
+
+    def __init__(self, source: PDFSource):
+        self._mapped: mmap.mmap | None = None
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mapped)
+        else:
+            self._view = memoryview(source)
+        try:
+            self.doc = pymupdf.open(stream=self._view, filetype="pdf")
+        except BaseException:
+            self._release()
+            raise
+
+    def _release(self) -> None:
+        self._view.release()
+        if self._mapped is not None:
+            self._mapped.close()
+
+    def close(self) -> None:
+        self.doc.close()
+        # PyMuPDF keeps a reference to the stream after closing
+        self.doc.stream = None
+        self._release()
+
+    def __enter__(self) -> pymupdf.Document:
+        return self.doc
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def parse_page_range(
+    page_range: str | None, page_count: int, max_pages: int | None = None
+) -> list[int]:
+    """Resolve a 1-based page range expression into 0-based page numbers.
+
+    Accepts comma-separated pages and inclusive ranges such as ``"40-45"``,
+    ``"1,3,10-12"``, ``"-5"`` (first five pages) or ``"100-"`` (page 100 to the
+    end). Pages are returned in document order without duplicates.
+
+    Args:
+        page_range: Range expression, or None for the whole document
+        page_count: Number of pages in the document
+        max_pages: Optional cap on the number of pages returned
+
+    Returns:
+        Sorted list of 0-based page numbers
+
+    Raises:
+        ValueError: If the expression is malformed or out of bounds
+    """
+    if not page_range or not page_range.strip():
+        pages = list(range(page_count))
+    else:
+        selected: set[int] = set()
+        for part in page_range.split(","):
+            part = part.strip()
+            try:
+                if "-" in part:
+                    start_text, end_text = part.split("-", 1)
+                    start = int(start_text) if start_text.strip() else 1
+                    end = int(end_text) if end_text.strip() else page_count
+                else:
+                    start = end = int(part)
+            except ValueError as e:
+                raise ValueError(f"Invalid page range: {page_range!r}") from e
+            if start < 1 or end > page_count or start > end:
+                raise ValueError(
+                    f"Page range {part!r} is outside the document (1-{page_count})"
+                )
+            selected.update(range(start - 1, end))
+        pages = sorted(selected)
+
+    if max_pages is not None:
+        pages = pages[:max_pages]
+    return pages
+
+
+def identify_headers(doc: pymupdf.Document, pages: list[int]):
+    """Compute header levels from the selected pages only.
+
+    ``pymupdf4llm.to_markdown`` scans every page of the document for font sizes
+    when no header info is passed, which makes a six-page extract cost as much
+    as the whole document.
+
+    Returns None, so ``to_markdown`` detects headers itself, when the
+    installed pymupdf4llm has no ``IdentifyHeaders``.
+    """
+    identify = getattr(pymupdf4llm, "IdentifyHeaders", None)
+    if identify is None:
+        return None
+    return identify(doc, pages=pages)
+
+
+def page_text(page: pymupdf.Page) -> str:
+    """Text blocks of a page in reading order, separated by blank lines."""
+    blocks = [
+        block[4].strip() for block in page.get_text("blocks", sort=True) if block[6] == 0
+    ]
+    return "\n\n".join(block for block in blocks if block) + "\n\n"
+
+
+def convert_page(
+    doc: pymupdf.Document, page_number: int, hdr_info, mode: ConversionMode = "full"
+) -> str:
+    """Convert a single page to markdown, or to plain text in fast mode."""
+    if mode == "fast":
+        return page_text(doc[page_number])
+    options = BALANCED_OPTIONS if mode == "balanced" else {}
+    return pymupdf4llm.to_markdown(
+        doc, pages=[page_number], hdr_info=hdr_info, show_progress=False, **options
+    )
+
@@ -0,0 +1,137 @@
+"""Async streaming PDF downloads with size limits and HTTP revalidation."""
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from .cache import ConversionCache
+
+# Download limits. Sizes are in bytes, timeouts in seconds.
+PDF_DOWNLOAD_MAX_BYTES_ENV = "PDF_DOWNLOAD_MAX_BYTES"
+PDF_CONNECT_TIMEOUT_ENV = "PDF_CONNECT_TIMEOUT"
+PDF_READ_TIMEOUT_ENV = "PDF_READ_TIMEOUT"
+DEFAULT_DOWNLOAD_MAX_BYTES = 200 * 1024**2
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+
+class DownloadError(Exception):
+    """Raised when a PDF cannot be downloaded."""
+
+
+@dataclass
+class Download:
+    """A downloaded PDF, either in memory or already stored in the cache."""
+
+    digest: str
+    size: int
+    path: Path | None = None
+    data: bytearray | None = None
+    not_modified: bool = False
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else default
+
+
+class PDFDownloader:
+    """Streams PDFs over a shared async HTTP client.
+
+    Bodies are collected in memory in chunks while being hashed, and the
+    transfer is aborted as soon as it exceeds the size limit. When the
+    conversion cache is enabled the body and its ETag/Last-Modified validators
+    are kept, and later requests for the same URL send a conditional GET.
+    """
+
+    def __init__(
+        self,
+        cache: ConversionCache,
+        max_bytes: int | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.cache = cache
+        if max_bytes is None:
+            max_bytes = int(_env_number(PDF_DOWNLOAD_MAX_BYTES_ENV, DEFAULT_DOWNLOAD_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.client = client or httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=httpx.Timeout(
+                _env_number(PDF_READ_TIMEOUT_ENV, DEFAULT_READ_TIMEOUT),
+                connect=_env_number(PDF_CONNECT_TIMEOUT_ENV, DEFAULT_CONNECT_TIMEOUT),
+            ),
+        )
+
+    async def fetch(self, url: str) -> Download:
+        """Download a PDF, revalidating a cached copy when one exists.
+
+        Raises:
+            DownloadError: On HTTP errors, timeouts or oversized bodies
+        """
+        cached = await asyncio.to_thread(self.cache.url_validators, url)
+        download = await self._get(url, cached)
+        if download is None:
+            # The cached body was evicted after its validators were read, so
+            # the 304 cannot be used; fetch the body again unconditionally.
+            download = await self._get(url, None)
+        return download
+
+    async def _get(self, url: str, cached: dict | None) -> Download | None:
+        """Send one GET, conditional on the cached validators if any.
+
+        Returns:
+            The download, or None on a 304 whose cached body is gone
+        """
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            async with self.client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and cached:
+                    path = await asyncio.to_thread(self.cache.url_body, cached["digest"])
+                    if path is None:
+                        return None
+                    return Download(
+                        digest=cached["digest"], size=0, path=path, not_modified=True
+                    )
+                response.raise_for_status()
+
+                length = response.headers.get("Content-Length")
+                if length and length.isdigit() and int(length) > self.max_bytes:
+                    raise DownloadError(
+                        f"PDF is {int(length)} bytes, over the {self.max_bytes} byte limit"
+                    )
+
+                body = bytearray()
+                hasher = hashlib.sha256()
+                async for chunk in response.aiter_bytes():
+                    if len(body) + len(chunk) > self.max_bytes:
+                        raise DownloadError(
+                            f"PDF exceeds the {self.max_bytes} byte download limit"
+                        )
+                    hasher.update(chunk)
+                    body += chunk
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except httpx.HTTPError as e:
+            raise DownloadError(str(e)) from e
+
+        digest = hasher.hexdigest()
+        path = None
+        if etag or last_modified:
+            path = await asyncio.to_thread(
+                self.cache.store_url, url, etag, last_modified, digest, body
+            )
+        if path is not None:
+            return Download(digest=digest, size=len(body), path=path)
+        return Download(digest=digest, size=len(body), data=body)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
@@ -0,0 +1,273 @@
+"""Persistent full-text index over converted PDF pages (SQLite FTS5)."""
+
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .cache import DEFAULT_CACHE_DIR, PDF_CACHE_DIR_ENV
+
+# Location of the index database. Defaults to index.db in the cache directory.
+PDF_INDEX_PATH_ENV = "PDF_INDEX_PATH"
+
+# Pages are split on paragraph boundaries into chunks of roughly this size
+CHUNK_CHARS = 2000
+
+# Shortest sha256 prefix accepted in place of a source path or URL
+MIN_DIGEST_PREFIX = 8
+
+
+def split_chunks(text: str, max_chars: int = CHUNK_CHARS) -> list[str]:
+    """Split page markdown into paragraph-aligned chunks."""
+    chunks: list[str] = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            chunks.append(current)
+            current = paragraph
+        else:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _match_expression(query: str) -> str:
+    """Quote every term so arbitrary user text is a valid FTS5 query."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class PDFIndex:
+    """Full-text index of converted pages keyed by document digest and page.
+
+    Chunks live in a regular table with an external-content FTS5 table over
+    their text, so lookups by document and page use ordinary indexes while
+    searches are ranked with BM25. Indexing is incremental: pages already
+    stored for a digest are skipped unless they were converted in a different
+    mode, in which case their chunks are replaced.
+    """
+
+    def __init__(self, path: Path | str | None = None):
+        if path is None:
+            path = os.environ.get(PDF_INDEX_PATH_ENV) or Path(
+                os.environ.get(PDF_CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+            ) / "index.db"
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    digest TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    page_count INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS chunks (
+                    id INTEGER PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    chunk INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    mode TEXT,
+                    UNIQUE (digest, page, chunk)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                    text,
+                    content='chunks',
+                    content_rowid='id',
+                    tokenize='porter unicode61'
+                );
+                """
+            )
+            columns = {row[1] for row in db.execute("PRAGMA table_info(chunks)")}
+            if "mode" not in columns:
+                # Pages indexed before modes were recorded are replaced on
+                # their next conversion
+                db.execute("ALTER TABLE chunks ADD COLUMN mode TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def add(
+        self,
+        digest: str,
+        source: str,
+        page_count: int,
+        pages: list[tuple[int, str]],
+        mode: str = "full",
+    ) -> int:
+        """Index converted pages of a document.
+
+        Args:
+            digest: SHA-256 of the PDF bytes
+            source: File path or URL the document came from
+            page_count: Total number of pages in the document
+            pages: ``(page_number, markdown)`` pairs, 0-based
+            mode: Conversion mode the pages were produced with
+
+        Returns:
+            Number of pages newly indexed
+        """
+        with self._connect() as db:
+            db.execute(
+                """
+                INSERT INTO documents VALUES (?, ?, ?, ?)
+                ON CONFLICT (digest) DO UPDATE SET source = excluded.source
+                """,
+                (digest, source, page_count, time.time()),
+            )
+            indexed = dict(
+                db.execute(
+                    "SELECT DISTINCT page, mode FROM chunks WHERE digest = ?", (digest,)
+                )
+            )
+            added = 0
+            for page_number, text in pages:
+                page = page_number + 1
+                if page in indexed:
+                    if indexed[page] == mode:
+                        continue
+                    self._remove_page(db, digest, page)
+                for chunk, chunk_text in enumerate(split_chunks(text), start=1):
+                    cursor = db.execute(
+                        "INSERT INTO chunks (digest, page, chunk, text, mode) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (digest, page, chunk, chunk_text, mode),
+                    )
+                    db.execute(
+                        "INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)",
+                        (cursor.lastrowid, chunk_text),
+                    )
+                added += 1
+            return added
+
+    @staticmethod
+    def _remove_page(db: sqlite3.Connection, digest: str, page: int) -> None:
+        """Delete the chunks of a page and their full-text entries."""
+        rows = db.execute(
+            "SELECT id, text FROM chunks WHERE digest = ? AND page = ?", (digest, page)
+        ).fetchall()
+        db.executemany(
+            "INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', ?, ?)", rows
+        )
+        db.execute("DELETE FROM chunks WHERE digest = ? AND page = ?", (digest, page))
+
+    def stats(self) -> dict:
+        with self._connect() as db:
+            (documents,) = db.execute("SELECT count(*) FROM documents").fetchone()
+            (chunks,) = db.execute("SELECT count(*) FROM chunks").fetchone()
+        return {"documents": documents, "chunks": chunks}
+
+    def _resolve(self, db: sqlite3.Connection, document: str) -> list[str]:
+        """Digests matching a source path/URL or a digest prefix.
+
+        Raises:
+            ValueError: If nothing has this source and it is too short, or not
+                hexadecimal, to be a digest prefix
+        """
+        digests = [
+            digest
+            for (digest,) in db.execute(
+                "SELECT digest FROM documents WHERE source = ?", (document,)
+            )
+        ]
+        if digests:
+            return digests
+        prefix = document.strip().lower()
+        if len(prefix) < MIN_DIGEST_PREFIX or prefix.strip("0123456789abcdef"):
+            raise ValueError(
+                f"{document!r} is not an indexed source, nor a sha256 prefix of at "
+                f"least {MIN_DIGEST_PREFIX} hex characters"
+            )
+        return [
+            digest
+            for (digest,) in db.execute(
+                "SELECT digest FROM documents WHERE substr(digest, 1, length(?)) = ?",
+                (prefix, prefix),
+            )
+        ]
+
+    def search(self, query: str, limit: int = 10, document: str | None = None) -> list[dict]:
+        """Return the best matching chunks with highlighted snippets.
+
+        Args:
+            query: Search terms. FTS5 syntax is used when valid, otherwise the
+                terms are matched literally
+            limit: Maximum number of results
+            document: Optional source path/URL or digest prefix to search within
+        """
+        sql = """
+            SELECT d.source, c.digest, c.page, c.chunk,
+                   snippet(chunks_fts, 0, '**', '**', '...', 24),
+                   bm25(chunks_fts)
+            FROM chunks_fts
+            JOIN chunks c ON c.id = chunks_fts.rowid
+            JOIN documents d ON d.digest = c.digest
+            WHERE chunks_fts MATCH ?
+        """
+        with self._connect() as db:
+            params: list = []
+            if document is not None:
+                digests = self._resolve(db, document)
+                if not digests:
+                    return []
+                sql += f" AND c.digest IN ({','.join('?' * len(digests))})"
+                params = digests
+            sql += " ORDER BY bm25(chunks_fts) LIMIT ?"
+            try:
+                rows = db.execute(sql, [query, *params, limit]).fetchall()
+            except sqlite3.OperationalError:
+                rows = db.execute(sql, [_match_expression(query), *params, limit]).fetchall()
+        return [
+            {
+                "source": source,
+                "sha256": digest,
+                "page": page,
+                "chunk": chunk,
+                "snippet": snippet,
+                "score": round(-score, 4),
+            }
+            for source, digest, page, chunk, snippet, score in rows
+        ]
+
+    def get_chunks(
+        self, document: str, page: int, chunk: int | None = None
+    ) -> list[dict]:
+        """Fetch the chunks of a page, or a single chunk.
+
+        Args:
+            document: Source path/URL or digest prefix
+            page: 1-based page number
+            chunk: Optional 1-based chunk number within the page
+        """
+        with self._connect() as db:
+            digests = self._resolve(db, document)
+            if not digests:
+                return []
+            sql = f"""
+                SELECT d.source, c.digest, c.page, c.chunk, c.text
+                FROM chunks c
+                JOIN documents d ON d.digest = c.digest
+                WHERE c.digest IN ({','.join('?' * len(digests))}) AND c.page = ?
+            """
+            params = [*digests, page]
+            if chunk is not None:
+                sql += " AND c.chunk = ?"
+                params.append(chunk)
+            rows = db.execute(sql + " ORDER BY c.digest, c.chunk", params).fetchall()
+        return [
+            {"source": source, "sha256": digest, "page": page, "chunk": chunk, "text": text}
+            for source, digest, page, chunk, text in rows
+        ]
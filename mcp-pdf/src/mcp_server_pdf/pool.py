@@ -0,0 +1,309 @@
+"""Persistent process pool for parallel page conversion."""
+
+import asyncio
+import gc
+import multiprocessing
+import os
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import pymupdf
+
+from .convert import ConversionMode, OpenDocument, convert_page
+
+# Number of worker processes. Defaults to one per CPU.
+PDF_WORKERS_ENV = "PDF_WORKERS"
+
+# Upper bound on pages per task. Smaller tasks give finer-grained progress
+# and better load balancing, larger ones amortise per-task overhead.
+PDF_CHUNK_PAGES_ENV = "PDF_CHUNK_PAGES"
+DEFAULT_CHUNK_PAGES = 16
+
+# Ceiling on the combined resident memory of the server and its workers, in
+# MiB, for low-memory conversions. Above it no new pages are submitted until
+# the pages in flight are written out. Empty or 0 disables the ceiling.
+PDF_MAX_RSS_MB_ENV = "PDF_MAX_RSS_MB"
+
+# Open file handles kept per worker, so consecutive ranges of the same file do
+# not reopen and reparse it.
+WORKER_DOCUMENT_CACHE = 4
+
+_documents: OrderedDict[tuple, OpenDocument] = OrderedDict()
+
+
+@dataclass(frozen=True)
+class SharedBuffer:
+    """Handle to a PDF held in shared memory, passed to workers by name."""
+
+    name: str
+    size: int
+
+
+class SharedPDF:
+    """Places in-memory PDF bytes in shared memory for the worker processes.
+
+    The bytes are copied once; the parent and every worker open the document
+    directly over the shared block, so nothing is written to disk.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self._shm = SharedMemory(create=True, size=max(len(data), 1))
+        self._shm.buf[: len(data)] = data
+        self.handle = SharedBuffer(self._shm.name, len(data))
+
+    def view(self) -> memoryview:
+        return self._shm.buf[: self.handle.size]
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedPDF":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+def _init_worker() -> None:
+    """Keep worker output off the MCP stdio channel."""
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+
+def rss_bytes(pid: int | str = "self") -> int:
+    """Resident set size of a process, or 0 where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _attach_shared(name: str) -> SharedMemory:
+    """Attach to a parent-owned shared block.
+
+    Spawned workers share the parent's resource tracker, so on older Pythons
+    registering the block again is harmless; the parent unlinks it.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+@contextmanager
+def _worker_document(source: str | SharedBuffer) -> Iterator[pymupdf.Document]:
+    """Yield this worker's handle for a document for the duration of a task.
+
+    Files are kept open between tasks, keyed by path, mtime and size, and
+    reopened if they changed. Shared buffers are detached when the task ends:
+    the parent unlinks the block once the request is done, and a mapping kept
+    here would hold on to its memory for the life of the worker.
+    """
+    if isinstance(source, SharedBuffer):
+        shm = _attach_shared(source.name)
+        try:
+            buffer = shm.buf[: source.size]
+            try:
+                with OpenDocument(buffer) as doc:
+                    yield doc
+            finally:
+                buffer.release()
+        finally:
+            shm.close()
+        return
+
+    stat = os.stat(source)
+    key = (source, stat.st_mtime_ns, stat.st_size)
+    document = _documents.get(key)
+    if document is not None:
+        _documents.move_to_end(key)
+    else:
+        document = OpenDocument(source)
+        _documents[key] = document
+        while len(_documents) > WORKER_DOCUMENT_CACHE:
+            _, stale = _documents.popitem(last=False)
+            stale.close()
+    yield document.doc
+
+
+def _convert_range(
+    source: str | SharedBuffer, pages: list[int], hdr_info, mode: ConversionMode
+) -> list[tuple[int, str]]:
+    """Convert a range of pages inside a worker process."""
+    with _worker_document(source) as doc:
+        return [
+            (page_number, convert_page(doc, page_number, hdr_info, mode))
+            for page_number in pages
+        ]
+
+
+def _convert_page_lean(
+    source: str | SharedBuffer, page_number: int, hdr_info, mode: ConversionMode
+) -> str:
+    """Convert one page, then release MuPDF's cached fonts and images."""
+    with _worker_document(source) as doc:
+        text = convert_page(doc, page_number, hdr_info, mode)
+    pymupdf.TOOLS.store_shrink(100)
+    gc.collect()
+    return text
+
+
+def split_pages(pages: list[int], workers: int, chunk_pages: int) -> list[list[int]]:
+    """Split pages into contiguous tasks, at least one per worker when possible."""
+    if not pages:
+        return []
+    size = max(1, min(chunk_pages, -(-len(pages) // workers)))
+    return [pages[i : i + size] for i in range(0, len(pages), size)]
+
+
+class ConversionPool:
+    """Process pool that converts page ranges of a document in parallel.
+
+    Workers are started on first use and kept alive for the life of the
+    server, so imports and document handles stay warm between calls.
+    """
+
+    def __init__(self, workers: int | None = None, chunk_pages: int | None = None):
+        self.workers = workers or _env_int(PDF_WORKERS_ENV, os.cpu_count() or 1)
+        self.chunk_pages = chunk_pages or _env_int(PDF_CHUNK_PAGES_ENV, DEFAULT_CHUNK_PAGES)
+        self.max_rss = _env_int(PDF_MAX_RSS_MB_ENV, 0) * 1024**2
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def convert(
+        self,
+        source: str | SharedBuffer,
+        pages: list[int],
+        hdr_info,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+        mode: ConversionMode = "full",
+    ) -> list[tuple[int, str]]:
+        """Convert pages of a document and return them in page order.
+
+        Args:
+            source: Path of the PDF file or a shared buffer holding it; each
+                worker opens its own handle
+            pages: 0-based page numbers to convert
+            hdr_info: Header info shared by all ranges so heading levels agree
+            on_progress: Optional callback receiving (pages_done, pages_total)
+            mode: Conversion mode, see ``convert.ConversionMode``
+
+        Returns:
+            ``(page_number, markdown)`` pairs sorted by page number
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [
+            loop.run_in_executor(self.executor, _convert_range, source, chunk, hdr_info, mode)
+            for chunk in split_pages(pages, self.workers, self.chunk_pages)
+        ]
+        converted: list[tuple[int, str]] = []
+        try:
+            for task in asyncio.as_completed(tasks):
+                converted.extend(await task)
+                if on_progress is not None:
+                    await on_progress(len(converted), len(pages))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        converted.sort(key=lambda item: item[0])
+        return converted
+
+    def start(self) -> None:
+        """Spawn every worker now instead of on first use."""
+        for _ in range(self.workers):
+            self.executor.submit(time.sleep, 0.1)
+
+    def workers_running(self) -> int:
+        processes = getattr(self._executor, "_processes", None) or {}
+        return len(processes)
+
+    def rss(self) -> int:
+        """Combined resident memory of this process and the live workers."""
+        processes = getattr(self._executor, "_processes", None) or {}
+        return rss_bytes() + sum(rss_bytes(pid) for pid in list(processes))
+
+    async def stream(
+        self,
+        source: str | SharedBuffer,
+        pages: list[int],
+        hdr_info,
+        stats: dict | None = None,
+        mode: ConversionMode = "full",
+    ) -> AsyncIterator[tuple[int, str]]:
+        """Convert pages one at a time and yield them in page order.
+
+        At most one page per worker is in flight, so memory is bounded by the
+        largest pages rather than the document. Workers release MuPDF's store
+        after every page. When the RSS ceiling is exceeded, submission pauses
+        until only the page being waited on is outstanding.
+
+        Args:
+            source: Path of the PDF file or a shared buffer holding it
+            pages: 0-based page numbers to convert
+            hdr_info: Header info shared by all pages so heading levels agree
+            stats: Optional dict updated with 'peak_rss' and 'throttled' counts
+            mode: Conversion mode, see ``convert.ConversionMode``
+
+        Yields:
+            ``(page_number, markdown)`` pairs in page order
+        """
+        loop = asyncio.get_running_loop()
+        pending: dict[int, asyncio.Future] = {}
+        submitted = 0
+        if stats is not None:
+            stats.setdefault("peak_rss", 0)
+            stats.setdefault("throttled", 0)
+        try:
+            for position, page_number in enumerate(pages):
+                while submitted < len(pages) and len(pending) < self.workers:
+                    if pending and self.max_rss:
+                        rss = self.rss()
+                        if stats is not None:
+                            stats["peak_rss"] = max(stats["peak_rss"], rss)
+                        if rss > self.max_rss:
+                            if stats is not None:
+                                stats["throttled"] += 1
+                            gc.collect()
+                            break
+                    pending[submitted] = loop.run_in_executor(
+                        self.executor,
+                        _convert_page_lean,
+                        source,
+                        pages[submitted],
+                        hdr_info,
+                        mode,
+                    )
+                    submitted += 1
+                text = await pending.pop(position)
+                if stats is not None:
+                    stats["peak_rss"] = max(stats["peak_rss"], self.rss())
+                yield page_number, text
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,36 +1,121 @@
 """MCP server implementation for PDF processing using PyMuPDF4LLM."""
 
+import asyncio
+import json
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from tempfile import NamedTemporaryFile
 from typing import Annotated, Literal
+from urllib.parse import urlparse
 
-import pymupdf4llm
-import requests
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.shared.exceptions import McpError
 from mcp.types import (
     INTERNAL_ERROR,
     INVALID_PARAMS,
+    ErrorData,
     TextContent,
     Tool,
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from .cache import ConversionCache
+from .convert import ConversionMode, OpenDocument, identify_headers, parse_page_range
+from .download import DownloadError, PDFDownloader
+from .index import PDFIndex
+from .pool import ConversionPool, SharedPDF
+
+# PyMuPDF is not thread-safe, so in-process document work (page selection,
+# header detection) runs on one dedicated thread. Page conversion itself runs
+# in the process pool.
+_pdf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-pdf")
+
+# Pages written in low-memory mode are added to the full-text index in
+# batches of this size
+INDEX_BATCH_PAGES = 32
+
+
+def _error(code: int, message: str) -> McpError:
+    return McpError(ErrorData(code=code, message=message))
 
 
 class PDFProcessBase(BaseModel):
     """Base parameters for PDF processing."""
 
     output_format: Annotated[
-        Literal["markdown", "llamaindex"],
+        Literal["markdown", "page_chunks", "llamaindex"],
         Field(
             default="markdown",
-            description="Output format - 'markdown' or 'llamaindex'",
+            description="Output format - 'markdown' (one document), 'page_chunks' "
+            "(one markdown item per page) or 'llamaindex' (JSON documents with "
+            "page metadata)",
+        ),
+    ]
+    page_range: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="1-based pages to convert, e.g. '40-45' or '1,3,10-12'. "
+            "Defaults to the whole document",
+        ),
+    ]
+    max_pages: Annotated[
+        int | None,
+        Field(
+            default=None,
+            ge=1,
+            description="Maximum number of pages to convert",
+        ),
+    ]
+    mode: Annotated[
+        ConversionMode,
+        Field(
+            default="full",
+            description="'fast' extracts plain text blocks in reading order with no "
+            "layout, table or image analysis; 'balanced' produces markdown with headers "
+            "and columns but skips tables, images and vector graphics; 'full' runs the "
+            "complete analysis",
+        ),
+    ]
+    low_memory: Annotated[
+        bool,
+        Field(
+            default=False,
+            description="Convert one page at a time and write pages to disk as they "
+            "finish, so memory depends on the largest page rather than the document. "
+            "Bypasses the conversion cache",
+        ),
+    ]
+
+    def conversion_options(self) -> dict:
+        """Options that change the converted pages, used in the cache key."""
+        return self.model_dump(include={"page_range", "max_pages", "mode"})
+
+
+class PDFProcessSingle(PDFProcessBase):
+    """Parameters shared by the single-document tools."""
+
+    output_path: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="File to write the converted document to instead of returning "
+            "it. Required with low_memory",
         ),
     ]
 
+    @model_validator(mode="after")
+    def check_output_path(self) -> "PDFProcessSingle":
+        if self.low_memory and self.output_path is None:
+            raise ValueError("'output_path' is required when 'low_memory' is set")
+        return self
 
-class PDFProcessFile(PDFProcessBase):
+
+class PDFProcessFile(PDFProcessSingle):
     """Parameters for processing PDF from file path."""
 
     file_path: Annotated[
@@ -39,7 +124,7 @@ class PDFProcessFile(PDFProcessBase):
     ]
 
 
-class PDFProcessURL(PDFProcessBase):
+class PDFProcessURL(PDFProcessSingle):
     """Parameters for processing PDF from URL."""
 
     url: Annotated[
@@ -48,9 +133,238 @@ class PDFProcessURL(PDFProcessBase):
     ]
 
 
-async def serve() -> None:
-    """Run the PDF processing MCP server."""
+class PDFProcessBatch(PDFProcessBase):
+    """Parameters for converting many PDFs into an output directory."""
+
+    directory: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="Directory containing the PDF files to process",
+        ),
+    ]
+    pattern: Annotated[
+        str,
+        Field(
+            default="*.pdf",
+            description="Glob pattern matched inside directory, e.g. '**/*.pdf'",
+        ),
+    ]
+    urls: Annotated[
+        list[str] | None,
+        Field(
+            default=None,
+            description="URLs of PDF files to process, instead of a directory",
+        ),
+    ]
+    output_dir: Annotated[
+        str,
+        Field(description="Directory to write one converted file per PDF into"),
+    ]
+    concurrency: Annotated[
+        int,
+        Field(
+            default=4,
+            ge=1,
+            le=32,
+            description="Maximum number of documents downloaded or converted at once",
+        ),
+    ]
+
+    @model_validator(mode="after")
+    def check_sources(self) -> "PDFProcessBatch":
+        if (self.directory is None) == (self.urls is None):
+            raise ValueError("Provide exactly one of 'directory' or 'urls'")
+        return self
+
+
+class SearchPDFs(BaseModel):
+    """Parameters for searching converted PDFs."""
+
+    query: Annotated[
+        str,
+        Field(
+            description="Search terms. FTS5 syntax such as \"exact phrase\", OR and "
+            "prefix* is supported",
+        ),
+    ]
+    limit: Annotated[
+        int,
+        Field(default=10, ge=1, le=50, description="Maximum number of results"),
+    ]
+    document: Annotated[
+        str | None,
+        Field(
+            default=None,
+            description="Only search this document, given as its path, URL or sha256 "
+            "prefix (at least 8 hex characters)",
+        ),
+    ]
+
+
+class GetPDFChunk(BaseModel):
+    """Parameters for fetching indexed text of a converted PDF."""
+
+    document: Annotated[
+        str,
+        Field(
+            description="Path, URL or sha256 prefix (at least 8 hex characters) of the document"
+        ),
+    ]
+    page: Annotated[
+        int,
+        Field(ge=1, description="1-based page number"),
+    ]
+    chunk: Annotated[
+        int | None,
+        Field(
+            default=None,
+            ge=1,
+            description="1-based chunk within the page. Defaults to every chunk of the page",
+        ),
+    ]
+
+
+def output_name(source: str, output_format: str, taken: set[str]) -> str:
+    """Pick a file name for a converted document that is unique in the batch.
+
+    Only http(s) sources are parsed as URLs, so a local path containing
+    ``#`` or ``?`` keeps its full file name.
+    """
+    if source.lower().startswith(("http://", "https://")):
+        source = urlparse(source).path
+    stem = Path(source).stem or "document"
+    extension = "json" if output_format == "llamaindex" else "md"
+    name = f"{stem}.{extension}"
+    counter = 1
+    while name in taken:
+        counter += 1
+        name = f"{stem}-{counter}.{extension}"
+    taken.add(name)
+    return name
+
+
+def format_result(
+    pages: list[tuple[int, str]],
+    output_format: str,
+    source: str,
+    page_count: int,
+) -> list[TextContent]:
+    """Shape converted pages into the requested output format.
+
+    Args:
+        pages: ``(page_number, markdown)`` pairs in page order, 0-based
+        output_format: 'markdown', 'page_chunks' or 'llamaindex'
+        source: File path or URL the document came from
+        page_count: Total number of pages in the document
+
+    Returns:
+        List of TextContent for the tool response
+    """
+    if output_format == "page_chunks":
+        return [
+            TextContent(
+                type="text",
+                text=f"<!-- page {number + 1} of {page_count} -->\n{text}",
+            )
+            for number, text in pages
+        ]
+
+    if output_format == "llamaindex":
+        documents = [
+            {
+                "text": text,
+                "metadata": {
+                    "file_path": source,
+                    "page": number + 1,
+                    "total_pages": page_count,
+                },
+            }
+            for number, text in pages
+        ]
+        return [TextContent(type="text", text=json.dumps(documents))]
+
+    return [TextContent(type="text", text="".join(text for _, text in pages))]
+
+
+class PageWriter:
+    """Writes converted pages to a file as they arrive.
+
+    The file content matches the joined output of ``format_result``. Pages go
+    to a temporary file that replaces the target only once every page has
+    been written.
+    """
+
+    def __init__(self, path: str | Path, output_format: str, source: str, page_count: int):
+        self.path = Path(path)
+        self.output_format = output_format
+        self.source = source
+        self.page_count = page_count
+        self.pages = 0
+        self.bytes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.partial")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        if output_format == "llamaindex":
+            self._emit("[")
+
+    def _emit(self, text: str) -> None:
+        self._file.write(text)
+        self.bytes += len(text.encode("utf-8"))
+
+    def write(self, page_number: int, text: str) -> None:
+        if self.output_format == "page_chunks":
+            separator = "\n" if self.pages else ""
+            self._emit(f"{separator}<!-- page {page_number + 1} of {self.page_count} -->\n{text}")
+        elif self.output_format == "llamaindex":
+            document = {
+                "text": text,
+                "metadata": {
+                    "file_path": self.source,
+                    "page": page_number + 1,
+                    "total_pages": self.page_count,
+                },
+            }
+            self._emit((", " if self.pages else "") + json.dumps(document))
+        else:
+            self._emit(text)
+        self.pages += 1
+
+    def finish(self) -> None:
+        """Complete the file and move it into place."""
+        if self.output_format == "llamaindex":
+            self._emit("]")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def create_server(
+    warm: bool = False,
+) -> tuple[Server, Callable[[], Awaitable[dict]], Callable[[], Awaitable[None]]]:
+    """Build the PDF processing MCP server.
+
+    The conversion pool, cache, downloader and index belong to the returned
+    server rather than to a client session, so a process serving several
+    sessions in turn or at once (such as mcp-gateway) keeps them warm.
+
+    Args:
+        warm: Start the conversion workers now instead of on the first call
+
+    Returns:
+        The server, a coroutine function reporting the state of its
+        resources, and one releasing them
+    """
     server = Server("mcp-pdf")
+    pool = ConversionPool()
+    cache = ConversionCache()
+    downloader = PDFDownloader(cache)
+    index = PDFIndex()
+    if warm:
+        pool.start()
 
     @server.list_tools()
     async def list_tools() -> list[Tool]:
@@ -61,8 +375,12 @@ async def serve() -> None:
                 Extracts content using PyMuPDF4LLM with support for:
                 - Multi-column page layouts
                 - Image and vector graphics extraction
-                - Page chunking
-                - Output in Markdown or LlamaIndex format
+                - Page ranges (page_range, max_pages) so only the requested pages are converted
+                - Per-page chunks with progress notifications as pages finish
+                - Output in Markdown, page chunks or LlamaIndex format
+                - Conversion modes: 'fast' plain text, 'balanced' markdown without
+                  tables and images, 'full' complete layout analysis (default)
+                - Writing to output_path, page by page with low_memory for very large PDFs
                 
                 Ideal for converting PDFs into formats suitable for LLMs and RAG systems.""",
                 inputSchema=PDFProcessFile.model_json_schema(),
@@ -73,21 +391,345 @@ async def serve() -> None:
                 Downloads and extracts content using PyMuPDF4LLM with support for:
                 - Multi-column page layouts
                 - Image and vector graphics extraction
-                - Page chunking
-                - Output in Markdown or LlamaIndex format
+                - Page ranges (page_range, max_pages) so only the requested pages are converted
+                - Per-page chunks with progress notifications as pages finish
+                - Output in Markdown, page chunks or LlamaIndex format
+                - Conversion modes: 'fast' plain text, 'balanced' markdown without
+                  tables and images, 'full' complete layout analysis (default)
+                - Writing to output_path, page by page with low_memory for very large PDFs
                 
                 Ideal for converting PDFs into formats suitable for LLMs and RAG systems.""",
                 inputSchema=PDFProcessURL.model_json_schema(),
             ),
+            Tool(
+                name="process_pdf_batch",
+                description="""Convert many PDFs in one call.
+                Takes either a directory plus glob pattern or a list of URLs, converts
+                the documents with bounded concurrency (parallel downloads plus the
+                conversion process pool) and writes one file per document to output_dir.
+                
+                Returns a JSON manifest instead of the converted text, with per-document
+                status, page count, timing, cache status and output path. The manifest
+                is also written to output_dir/manifest.json. Progress notifications are
+                sent as documents finish.""",
+                inputSchema=PDFProcessBatch.model_json_schema(),
+            ),
+            Tool(
+                name="search_pdfs",
+                description="""Full-text search over every PDF converted so far.
+                Returns BM25-ranked snippets with the source, sha256, page and chunk
+                number of each match. Use get_pdf_chunk to read a match in full.""",
+                inputSchema=SearchPDFs.model_json_schema(),
+            ),
+            Tool(
+                name="get_pdf_chunk",
+                description="""Fetch indexed text of a converted PDF by page and chunk.
+                Documents are identified by path, URL or sha256 prefix as returned by
+                search_pdfs.""",
+                inputSchema=GetPDFChunk.model_json_schema(),
+            ),
         ]
 
-    def process_pdf(file_path: str | Path, output_format: str) -> str:
-        """Process a PDF file and return extracted content."""
+    async def report_progress(done: int, total: int) -> None:
+        """Send a progress notification if the client asked for them."""
+        ctx = server.request_context
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is not None:
+            await ctx.session.send_progress_notification(token, done, total)
+
+    def plan_conversion(
+        document: str | SharedPDF, args: PDFProcessBase
+    ) -> tuple[list[int], object, int]:
+        """Resolve the page selection and shared header info for a document."""
+        buffer = document if isinstance(document, str) else document.view()
+        with OpenDocument(buffer) as doc:
+            pages = parse_page_range(args.page_range, doc.page_count, args.max_pages)
+            # Fast mode emits no headings, so skip the font-size scan
+            hdr_info = identify_headers(doc, pages) if args.mode != "fast" else None
+            return pages, hdr_info, doc.page_count
+
+    async def convert_document(
+        document: str | SharedPDF,
+        args: PDFProcessBase,
+        digest: str,
+        source: str,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    ) -> tuple[dict, str]:
+        """Convert the selected pages of a PDF, going through the cache.
+
+        Converted pages are looked up in, and stored to, the conversion cache
+        under the document digest and the page selection options, and added
+        to the full-text index.
+
+        Args:
+            document: Local path of the PDF, or the PDF bytes in shared memory
+            args: Tool arguments
+            digest: SHA-256 of the PDF bytes
+            source: Path or URL recorded in the full-text index
+            on_progress: Optional callback receiving (pages_done, pages_total)
+
+        Returns:
+            The cache entry (page_count and converted pages) and 'hit' or 'miss'
+        """
+        key = cache.key(digest, args.conversion_options())
+        entry = await asyncio.to_thread(cache.get, key)
+        if entry is not None:
+            await asyncio.to_thread(
+                index.add, digest, source, entry["page_count"], entry["pages"], args.mode
+            )
+            return entry, "hit"
+
+        loop = asyncio.get_running_loop()
         try:
-            result = pymupdf4llm.to_markdown(str(file_path))
-            return result
+            pages, hdr_info, page_count = await loop.run_in_executor(
+                _pdf_executor, plan_conversion, document, args
+            )
+        except ValueError as e:
+            raise _error(INVALID_PARAMS, str(e)) from e
+        except Exception as e:
+            raise _error(INTERNAL_ERROR, f"Failed to open PDF: {str(e)}") from e
+
+        try:
+            worker_source = document if isinstance(document, str) else document.handle
+            converted = await pool.convert(
+                worker_source, pages, hdr_info, on_progress, args.mode
+            )
+        except Exception as e:
+            raise _error(INTERNAL_ERROR, f"Failed to process PDF: {str(e)}") from e
+
+        entry = {"page_count": page_count, "pages": converted}
+        await asyncio.to_thread(cache.put, key, entry)
+        await asyncio.to_thread(
+            index.add, digest, source, page_count, converted, args.mode
+        )
+        return entry, "miss"
+
+    async def stream_document(
+        document: str | SharedPDF,
+        args: PDFProcessBase,
+        digest: str,
+        source: str,
+        output_path: str | Path,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    ) -> dict:
+        """Convert a PDF page by page straight into a file (low-memory mode).
+
+        Only the pages in flight are held in memory. Pages are added to the
+        full-text index in small batches as they are written.
+
+        Returns:
+            Summary with page counts, output size and peak RSS
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            pages, hdr_info, page_count = await loop.run_in_executor(
+                _pdf_executor, plan_conversion, document, args
+            )
+        except ValueError as e:
+            raise _error(INVALID_PARAMS, str(e)) from e
         except Exception as e:
-            raise McpError(INTERNAL_ERROR, f"Failed to process PDF: {str(e)}")
+            raise _error(INTERNAL_ERROR, f"Failed to open PDF: {str(e)}") from e
+
+        writer = PageWriter(output_path, args.output_format, source, page_count)
+        stats: dict = {}
+        unindexed: list[tuple[int, str]] = []
+        try:
+            worker_source = document if isinstance(document, str) else document.handle
+            async for page_number, text in pool.stream(
+                worker_source, pages, hdr_info, stats, args.mode
+            ):
+                writer.write(page_number, text)
+                unindexed.append((page_number, text))
+                if len(unindexed) >= INDEX_BATCH_PAGES:
+                    await asyncio.to_thread(
+                        index.add, digest, source, page_count, unindexed, args.mode
+                    )
+                    unindexed = []
+                if on_progress is not None:
+                    await on_progress(writer.pages, len(pages))
+            if unindexed:
+                await asyncio.to_thread(
+                    index.add, digest, source, page_count, unindexed, args.mode
+                )
+            writer.finish()
+        except BaseException as e:
+            writer.abort()
+            if isinstance(e, Exception) and not isinstance(e, McpError):
+                raise _error(INTERNAL_ERROR, f"Failed to process PDF: {str(e)}") from e
+            raise
+        return {
+            "pages": writer.pages,
+            "page_count": page_count,
+            "output": str(writer.path),
+            "bytes": writer.bytes,
+            "peak_rss_mb": round(stats["peak_rss"] / 1024**2, 1),
+            "throttled": stats["throttled"],
+        }
+
+    @asynccontextmanager
+    async def fetch_document(url: str) -> AsyncIterator[tuple[str | SharedPDF, str, str]]:
+        """Download a PDF and yield (document, digest, status note) for conversion.
+
+        Raises:
+            DownloadError: If the download fails
+        """
+        download = await downloader.fetch(url)
+        note = ", not modified" if download.not_modified else ""
+        if download.path is not None:
+            yield str(download.path), download.digest, note
+        else:
+            with SharedPDF(download.data) as shared:
+                # The shared block is now the only copy of the bytes
+                download.data = None
+                yield shared, download.digest, note
+
+    async def process_pdf(
+        document: str | SharedPDF,
+        args: PDFProcessBase,
+        digest: str,
+        source: str,
+        note: str = "",
+    ) -> list[TextContent]:
+        """Process the selected pages of a PDF and format the result.
+
+        Args:
+            document: Local path of the PDF, or the PDF bytes in shared memory
+            args: Tool arguments
+            digest: SHA-256 of the PDF bytes
+            source: Path or URL reported in metadata
+            note: Extra detail appended to the status line
+        """
+        started = time.perf_counter()
+        if args.low_memory:
+            summary = await stream_document(
+                document, args, digest, source, args.output_path, report_progress
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Wrote {summary['pages']} of {summary['page_count']} pages "
+                    f"({summary['bytes']} bytes) to {summary['output']} in "
+                    f"{elapsed_ms:.0f} ms (low memory, peak RSS {summary['peak_rss_mb']} MiB, "
+                    f"sha256 {digest[:12]}{note})",
+                )
+            ]
+
+        entry, cache_status = await convert_document(
+            document, args, digest, source, report_progress
+        )
+        converted = [(number, text) for number, text in entry["pages"]]
+        result = format_result(
+            converted, args.output_format, source, entry["page_count"]
+        )
+        if args.output_path is not None:
+            text = "\n".join(item.text for item in result)
+            output_path = Path(args.output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(output_path.write_text, text, encoding="utf-8")
+            result = [
+                TextContent(
+                    type="text",
+                    text=f"Wrote {len(text.encode('utf-8'))} bytes to {output_path}",
+                )
+            ]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        result.append(
+            TextContent(
+                type="text",
+                text=f"Converted {len(converted)} of {entry['page_count']} pages "
+                f"in {elapsed_ms:.0f} ms (cache {cache_status}, sha256 {digest[:12]}{note})",
+            )
+        )
+        return result
+
+    async def process_batch(args: PDFProcessBatch) -> list[TextContent]:
+        """Convert every matched file or URL and return a manifest."""
+        if args.directory is not None:
+            directory = Path(args.directory)
+            if not directory.is_dir():
+                raise _error(INVALID_PARAMS, f"Directory not found: {args.directory}")
+            sources = sorted(str(p) for p in directory.glob(args.pattern) if p.is_file())
+        else:
+            sources = list(args.urls)
+
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # The manifest is written to the same directory
+        taken: set[str] = {"manifest.json"}
+        names = [output_name(source, args.output_format, taken) for source in sources]
+        semaphore = asyncio.Semaphore(args.concurrency)
+        manifest: list[dict] = [{} for _ in sources]
+        finished = 0
+
+        async def convert_to_file(
+            document: str | SharedPDF, digest: str, source: str, output_path: Path
+        ) -> dict:
+            """Write one converted document to output_path and describe it."""
+            if args.low_memory:
+                summary = await stream_document(document, args, digest, source, output_path)
+                return {
+                    "pages": summary["pages"],
+                    "page_count": summary["page_count"],
+                    "cache": "bypass",
+                    "bytes": summary["bytes"],
+                    "peak_rss_mb": summary["peak_rss_mb"],
+                }
+            entry, cache_status = await convert_document(document, args, digest, source)
+            converted = [(number, text) for number, text in entry["pages"]]
+            text = "\n".join(
+                item.text
+                for item in format_result(
+                    converted, args.output_format, source, entry["page_count"]
+                )
+            )
+            await asyncio.to_thread(output_path.write_text, text, encoding="utf-8")
+            return {
+                "pages": len(converted),
+                "page_count": entry["page_count"],
+                "cache": cache_status,
+                "bytes": len(text.encode("utf-8")),
+            }
+
+        async def run(index: int, source: str) -> None:
+            nonlocal finished
+            async with semaphore:
+                started = time.perf_counter()
+                record: dict = {"source": source}
+                output_path = output_dir / names[index]
+                try:
+                    if args.directory is not None:
+                        digest = await asyncio.to_thread(cache.file_digest, source)
+                        details = await convert_to_file(source, digest, source, output_path)
+                    else:
+                        async with fetch_document(source) as (document, digest, _):
+                            details = await convert_to_file(
+                                document, digest, source, output_path
+                            )
+                    record.update(status="ok", sha256=digest, output=str(output_path))
+                    record.update(details)
+                except Exception as e:
+                    record.update(status="error", error=str(e))
+                record["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+                manifest[index] = record
+            finished += 1
+            await report_progress(finished, len(sources))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run(i, source) for i, source in enumerate(sources)))
+        summary = {
+            "documents": len(sources),
+            "succeeded": sum(1 for r in manifest if r["status"] == "ok"),
+            "failed": sum(1 for r in manifest if r["status"] == "error"),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+            "output_dir": str(output_dir),
+            "results": manifest,
+        }
+        manifest_text = json.dumps(summary, indent=2)
+        await asyncio.to_thread(
+            (output_dir / "manifest.json").write_text, manifest_text, encoding="utf-8"
+        )
+        return [TextContent(type="text", text=manifest_text)]
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
@@ -95,44 +737,88 @@ async def serve() -> None:
             if name == "process_pdf_file":
                 args = PDFProcessFile(**arguments)
                 if not Path(args.file_path).exists():
-                    raise McpError(INVALID_PARAMS, f"File not found: {args.file_path}")
-                result = process_pdf(args.file_path, args.output_format)
+                    raise _error(INVALID_PARAMS, f"File not found: {args.file_path}")
+                digest = await asyncio.to_thread(cache.file_digest, args.file_path)
+                result = await process_pdf(args.file_path, args, digest, args.file_path)
 
             elif name == "process_pdf_url":
                 args = PDFProcessURL(**arguments)
                 try:
-                    response = requests.get(args.url)
-                    response.raise_for_status()
+                    async with fetch_document(args.url) as (document, digest, note):
+                        result = await process_pdf(document, args, digest, args.url, note)
+                except DownloadError as e:
+                    raise _error(INVALID_PARAMS, f"Failed to download PDF: {str(e)}") from e
 
-                    # Save downloaded PDF to temporary file
-                    with NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                        temp_file.write(response.content)
-                        temp_path = temp_file.name
+            elif name == "process_pdf_batch":
+                args = PDFProcessBatch(**arguments)
+                result = await process_batch(args)
 
-                    try:
-                        result = process_pdf(temp_path, args.output_format)
-                    finally:
-                        # Clean up temporary file
-                        Path(temp_path).unlink(missing_ok=True)
+            elif name == "search_pdfs":
+                args = SearchPDFs(**arguments)
+                try:
+                    matches = await asyncio.to_thread(
+                        index.search, args.query, args.limit, args.document
+                    )
+                except ValueError as e:
+                    raise _error(INVALID_PARAMS, str(e)) from e
+                result = [TextContent(type="text", text=json.dumps(matches, indent=2))]
 
-                except requests.RequestException as e:
-                    raise McpError(INVALID_PARAMS, f"Failed to download PDF: {str(e)}")
+            elif name == "get_pdf_chunk":
+                args = GetPDFChunk(**arguments)
+                try:
+                    chunks = await asyncio.to_thread(
+                        index.get_chunks, args.document, args.page, args.chunk
+                    )
+                except ValueError as e:
+                    raise _error(INVALID_PARAMS, str(e)) from e
+                if not chunks:
+                    raise _error(
+                        INVALID_PARAMS,
+                        f"No indexed text for page {args.page} of {args.document}",
+                    )
+                result = [
+                    TextContent(
+                        type="text",
+                        text=f"<!-- {c['source']} page {c['page']} chunk {c['chunk']} -->\n{c['text']}",
+                    )
+                    for c in chunks
+                ]
 
             else:
-                raise McpError(INVALID_PARAMS, f"Unknown tool: {name}")
+                raise _error(INVALID_PARAMS, f"Unknown tool: {name}")
 
-            return [
-                TextContent(
-                    type="text",
-                    text=result,
-                )
-            ]
+            return result
 
         except Exception as e:
             if isinstance(e, McpError):
                 raise
-            raise McpError(INTERNAL_ERROR, str(e))
+            raise _error(INTERNAL_ERROR, str(e)) from e
+
+    async def health() -> dict:
+        cache_usage, index_stats = await asyncio.gather(
+            asyncio.to_thread(cache.usage), asyncio.to_thread(index.stats)
+        )
+        return {
+            "workers": pool.workers,
+            "workers_running": pool.workers_running(),
+            "rss_mb": round(pool.rss() / 1024**2, 1),
+            "cache": cache_usage,
+            "index": index_stats,
+        }
 
+    async def aclose() -> None:
+        pool.shutdown()
+        await downloader.aclose()
+
+    return server, health, aclose
+
+
+async def serve() -> None:
+    """Run the PDF processing MCP server on stdio."""
+    server, _, aclose = create_server()
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        await aclose()
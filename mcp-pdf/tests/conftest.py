@@ -0,0 +1,20 @@
+import pymupdf
+import pytest
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a PDF with the given number of text pages and return its path."""
+
+    def make(pages: int = 3, name: str = "doc.pdf"):
+        doc = pymupdf.open()
+        for number in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Heading {number + 1}", fontsize=20)
+            page.insert_text((72, 110), f"Body text of page {number + 1}.", fontsize=10)
+        path = tmp_path / name
+        doc.save(path)
+        doc.close()
+        return path
+
+    return make
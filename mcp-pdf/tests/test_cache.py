@@ -0,0 +1,82 @@
+import itertools
+import json
+
+import pytest
+
+from mcp_server_pdf import cache as cache_module
+from mcp_server_pdf.cache import ConversionCache
+
+
+def entry(size: int) -> dict:
+    """An entry that serializes to exactly ``size`` bytes."""
+    overhead = len(json.dumps({"text": ""}))
+    return {"text": "x" * (size - overhead)}
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """Strictly increasing access times, so LRU order never ties."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(cache_module.time, "time", lambda: float(next(ticks)))
+
+
+def test_put_and_get(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    key = cache.key("abc", {"pages": [0]})
+    assert cache.get(key) is None
+    cache.put(key, {"pages": ["text"]})
+    assert cache.get(key) == {"pages": ["text"]}
+    assert cache.key("abc", {"pages": [1]}) != key
+
+
+def test_key_changes_with_converter_version(monkeypatch):
+    key = ConversionCache.key("abc", {"pages": [0]})
+    monkeypatch.setattr(cache_module, "CONVERTER_VERSION", "pymupdf4llm-0.0.1:pymupdf-1.0.0")
+    assert ConversionCache.key("abc", {"pages": [0]}) != key
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=250)
+    cache.put("a", entry(100))
+    cache.put("b", entry(100))
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put("c", entry(100))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.usage() == {"enabled": True, "entries": 2, "bytes": 200, "max_bytes": 250}
+
+
+def test_skips_entries_over_budget(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=50)
+    cache.put("big", entry(100))
+    assert cache.get("big") is None
+    assert cache.usage()["entries"] == 0
+
+
+def test_downloaded_bodies_share_the_budget(tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=250)
+    cache.store_url("http://example.test/a.pdf", '"v1"', None, "d" * 64, b"%" * 100)
+    assert cache.url_validators("http://example.test/a.pdf")["etag"] == '"v1"'
+    cache.put("a", entry(100))
+    cache.put("b", entry(100))
+    assert cache.url_validators("http://example.test/a.pdf") is None
+
+
+def test_disabled(tmp_path):
+    cache = ConversionCache(tmp_path / "cache", max_bytes=0)
+    cache.put("a", entry(100))
+    assert cache.get("a") is None
+    assert not (tmp_path / "cache").exists()
+    assert cache.usage() == {"enabled": False}
+
+
+def test_file_digest_is_remembered(tmp_path, monkeypatch):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.7 test")
+    cache = ConversionCache(tmp_path / "cache", max_bytes=10_000)
+    digest = cache.file_digest(path)
+    assert digest == ConversionCache.bytes_digest(b"%PDF-1.7 test")
+    monkeypatch.setattr(cache_module.hashlib, "sha256", None)
+    assert cache.file_digest(path) == digest
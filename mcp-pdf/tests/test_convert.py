@@ -0,0 +1,124 @@
+import pymupdf
+import pymupdf4llm
+import pytest
+
+from mcp_server_pdf.convert import (
+    OpenDocument,
+    convert_page,
+    identify_headers,
+    parse_page_range,
+)
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        (None, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+        ("  ", [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]),
+        ("3", [2]),
+        ("4-6", [3, 4, 5]),
+        ("1,3,8-9", [0, 2, 7, 8]),
+        ("-3", [0, 1, 2]),
+        ("9-", [8, 9]),
+        ("5,2-3,3", [1, 2, 4]),
+        (" 2 , 4 ", [1, 3]),
+    ],
+)
+def test_parse_page_range(expression, expected):
+    assert parse_page_range(expression, 10) == expected
+
+
+def test_parse_page_range_max_pages():
+    assert parse_page_range("2-", 10, max_pages=3) == [1, 2, 3]
+    assert parse_page_range(None, 10, max_pages=20) == list(range(10))
+
+
+@pytest.mark.parametrize("expression", ["a", "1-b", "1,,2", "2-1", "0", "11", "5-11"])
+def test_parse_page_range_rejects(expression):
+    with pytest.raises(ValueError):
+        parse_page_range(expression, 10)
+
+
+def test_identify_headers_without_identify_headers(make_pdf, monkeypatch):
+    monkeypatch.delattr(pymupdf4llm, "IdentifyHeaders", raising=False)
+    with pymupdf.open(make_pdf(2)) as doc:
+        assert identify_headers(doc, [0]) is None
+        assert "Body text of page 2" in convert_page(doc, 1, None)
+
+
+def test_convert_page_uses_header_info(make_pdf):
+    with pymupdf.open(make_pdf(3)) as doc:
+        text = convert_page(doc, 1, identify_headers(doc, [1]))
+    assert "# Heading 2" in text
+    assert "page 1" not in text and "page 3" not in text
+
+
+@pytest.fixture
+def analysis_calls(monkeypatch):
+    """Count calls to PyMuPDF's table, vector graphics and image analysis."""
+    calls = {"find_tables": 0, "get_drawings": 0, "get_image_info": 0}
+    for name in calls:
+        original = getattr(pymupdf.Page, name)
+
+        def counted(self, *args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(pymupdf.Page, name, counted)
+    return calls
+
+
+def table_pdf(path):
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((72, 60), "Quarterly figures", fontsize=16)
+    for row in range(4):
+        for col in range(3):
+            rect = pymupdf.Rect(72 + col * 120, 80 + row * 24, 192 + col * 120, 104 + row * 24)
+            page.draw_rect(rect, color=(0, 0, 0), width=0.5)
+            page.insert_text((rect.x0 + 4, rect.y1 - 8), f"r{row}c{col}", fontsize=10)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_balanced_mode_skips_table_and_graphics_analysis(tmp_path, analysis_calls):
+    with pymupdf.open(table_pdf(tmp_path / "table.pdf")) as doc:
+        text = convert_page(doc, 0, identify_headers(doc, [0]), "balanced")
+    assert "r2c1" in text and "|" not in text
+    assert analysis_calls == {"find_tables": 0, "get_drawings": 0, "get_image_info": 0}
+
+
+def test_full_mode_runs_table_and_graphics_analysis(tmp_path, analysis_calls):
+    with pymupdf.open(table_pdf(tmp_path / "table.pdf")) as doc:
+        text = convert_page(doc, 0, identify_headers(doc, [0]), "full")
+    assert "|" in text
+    assert all(analysis_calls.values()), analysis_calls
+
+
+def test_fast_mode_is_plain_text(make_pdf):
+    with pymupdf.open(make_pdf(2)) as doc:
+        assert convert_page(doc, 1, None, "fast") == "Heading 2\n\nBody text of page 2.\n\n"
+
+
+def test_open_document_maps_a_file(make_pdf):
+    document = OpenDocument(make_pdf(2))
+    assert "Body text of page 2." in document.doc[1].get_text()
+    document.close()
+    assert document.doc.is_closed
+    assert document._mapped.closed
+
+
+def test_open_document_wraps_bytes_without_copying(make_pdf):
+    data = bytearray(make_pdf(1).read_bytes())
+    with OpenDocument(data) as doc:
+        assert "Heading 1" in doc[0].get_text()
+    # Every view of the buffer has been released, so it can be resized again
+    data.extend(b"\n")
+
+
+def test_open_document_releases_buffer_on_error():
+    data = bytearray(b"not a pdf")
+    with pytest.raises(pymupdf.FileDataError):
+        OpenDocument(data)
+    data.extend(b"\n")
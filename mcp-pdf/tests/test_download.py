@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mcp_server_pdf.cache import ConversionCache
+from mcp_server_pdf.download import DownloadError, PDFDownloader
+
+
+class PDFHandler(BaseHTTPRequestHandler):
+    """Serves the server's ``body`` with an ETag, honouring If-None-Match."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.path != "/doc.pdf":
+            self.send_error(404)
+            return
+        etag = f'"{hashlib.sha256(server.body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(server.body)))
+        if server.validators:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pdf_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PDFHandler)
+    server.body = b"%PDF-1.7 first version"
+    server.validators = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch_all(cache, url, count=1, max_bytes=None):
+    async def run():
+        downloader = PDFDownloader(cache, max_bytes=max_bytes)
+        try:
+            return [await downloader.fetch(url) for _ in range(count)]
+        finally:
+            await downloader.aclose()
+
+    return asyncio.run(run())
+
+
+def test_revalidates_with_etag(pdf_server, tmp_path):
+    url = f"http://127.0.0.1:{pdf_server.server_port}/doc.pdf"
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    first, second = fetch_all(cache, url, count=2)
+
+    assert not first.not_modified
+    assert first.digest == hashlib.sha256(pdf_server.body).hexdigest()
+    assert first.path.read_bytes() == pdf_server.body
+
+    # The 304 reuses the stored body and its digest without hashing anything
+    assert "If-None-Match" not in pdf_server.requests[0]
+    assert pdf_server.requests[1]["If-None-Match"]
+    assert second.not_modified
+    assert (second.digest, second.path, second.size) == (first.digest, first.path, 0)
+
+
+def test_changed_body_is_downloaded_again(pdf_server, tmp_path):
+    url = f"http://127.0.0.1:{pdf_server.server_port}/doc.pdf"
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    (first,) = fetch_all(cache, url)
+    pdf_server.body = b"%PDF-1.7 second version"
+    (second,) = fetch_all(cache, url)
+    assert not second.not_modified
+    assert second.digest == hashlib.sha256(pdf_server.body).hexdigest() != first.digest
+
+
+def test_without_validators_stays_in_memory(pdf_server, tmp_path):
+    pdf_server.validators = False
+    url = f"http://127.0.0.1:{pdf_server.server_port}/doc.pdf"
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    first, second = fetch_all(cache, url, count=2)
+    assert first.path is None and bytes(first.data) == pdf_server.body
+    assert "If-None-Match" not in pdf_server.requests[1]
+    assert not second.not_modified
+
+
+def test_size_limit(pdf_server, tmp_path):
+    url = f"http://127.0.0.1:{pdf_server.server_port}/doc.pdf"
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    with pytest.raises(DownloadError, match="byte limit"):
+        fetch_all(cache, url, max_bytes=8)
+
+
+def test_http_error(pdf_server, tmp_path):
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    with pytest.raises(DownloadError):
+        fetch_all(cache, f"http://127.0.0.1:{pdf_server.server_port}/missing.pdf")
+
+
+def test_zero_size_limit_is_honoured(pdf_server, tmp_path):
+    url = f"http://127.0.0.1:{pdf_server.server_port}/doc.pdf"
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    with pytest.raises(DownloadError, match="byte limit"):
+        fetch_all(cache, url, max_bytes=0)
+
+
+def test_body_evicted_before_not_modified(pdf_server, tmp_path, monkeypatch):
+    url = f"http://127.0.0.1:{pdf_server.server_port}/doc.pdf"
+    cache = ConversionCache(tmp_path, max_bytes=10_000)
+    (first,) = fetch_all(cache, url)
+
+    read_validators = cache.url_validators
+
+    def validators_then_evict(url):
+        # The body disappears between reading the validators and the 304
+        validators = read_validators(url)
+        first.path.unlink()
+        return validators
+
+    monkeypatch.setattr(cache, "url_validators", validators_then_evict)
+    (second,) = fetch_all(cache, url)
+
+    assert pdf_server.requests[1]["If-None-Match"]
+    assert "If-None-Match" not in pdf_server.requests[2]
+    assert not second.not_modified
+    assert second.digest == first.digest
+    assert second.path.read_bytes() == pdf_server.body
@@ -0,0 +1,99 @@
+import sqlite3
+
+import pytest
+
+from mcp_server_pdf.index import PDFIndex, split_chunks
+
+DIGEST = "ab" * 32
+OTHER = "abcd" + "0" * 60
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = PDFIndex(tmp_path / "index.db")
+    index.add(DIGEST, "/data/report.pdf", 3, [(0, "alpha page"), (1, "beta page")])
+    index.add(OTHER, "https://example.com/other.pdf", 1, [(0, "gamma page")])
+    return index
+
+
+def test_split_chunks():
+    text = "one\n\ntwo\n\n\n\nthree"
+    assert split_chunks(text) == ["one\n\ntwo\n\nthree"]
+    assert split_chunks(text, max_chars=8) == ["one\n\ntwo", "three"]
+    assert split_chunks("  \n\n ") == []
+
+
+@pytest.mark.parametrize(
+    "document, expected",
+    [
+        ("/data/report.pdf", [DIGEST]),
+        ("https://example.com/other.pdf", [OTHER]),
+        (DIGEST, [DIGEST]),
+        (DIGEST[:8], [DIGEST]),
+        (DIGEST[:12].upper(), [DIGEST]),
+        ("abcd0000", [OTHER]),
+        ("ffffffff", []),
+    ],
+)
+def test_get_chunks_resolves_documents(index, document, expected):
+    assert [c["sha256"] for c in index.get_chunks(document, 1)] == expected
+
+
+@pytest.mark.parametrize("document", ["", "ab", "abababa", "ab%", "abab_bab", "ab*ababab"])
+def test_rejects_short_or_wildcard_prefixes(index, document):
+    with pytest.raises(ValueError):
+        index.get_chunks(document, 1)
+    with pytest.raises(ValueError):
+        index.search("page", document=document)
+
+
+def test_search_within_document(index):
+    assert {m["sha256"] for m in index.search("page")} == {DIGEST, OTHER}
+    matches = index.search("page", document=DIGEST[:8])
+    assert sorted((m["sha256"], m["page"]) for m in matches) == [(DIGEST, 1), (DIGEST, 2)]
+
+
+def test_add_skips_pages_in_the_same_mode(index):
+    assert index.add(DIGEST, "/data/report.pdf", 3, [(0, "changed"), (2, "delta")]) == 1
+    assert index.get_chunks(DIGEST, 1)[0]["text"] == "alpha page"
+    assert index.get_chunks(DIGEST, 3)[0]["text"] == "delta"
+
+
+def test_add_replaces_pages_from_another_mode(index):
+    assert index.add(DIGEST, "/data/report.pdf", 3, [(0, "plain\n\ntext")], mode="fast") == 1
+    assert [c["text"] for c in index.get_chunks(DIGEST, 1)] == ["plain\n\ntext"]
+    assert index.search("alpha") == []
+    assert [m["page"] for m in index.search("plain")] == [1]
+    # Unchanged pages keep their text
+    assert index.get_chunks(DIGEST, 2)[0]["text"] == "beta page"
+
+
+def test_upgrades_index_without_modes(tmp_path):
+    path = tmp_path / "index.db"
+    db = sqlite3.connect(path)
+    db.executescript(
+        """
+        CREATE TABLE chunks (
+            id INTEGER PRIMARY KEY,
+            digest TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            chunk INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            UNIQUE (digest, page, chunk)
+        );
+        CREATE VIRTUAL TABLE chunks_fts USING fts5(
+            text, content='chunks', content_rowid='id', tokenize='porter unicode61'
+        );
+        """
+    )
+    db.execute(f"INSERT INTO chunks VALUES (1, '{DIGEST}', 1, 1, 'legacy')")
+    db.execute("INSERT INTO chunks_fts (rowid, text) VALUES (1, 'legacy')")
+    db.commit()
+    db.close()
+
+    index = PDFIndex(path)
+    # The legacy page has no recorded mode, so it is indexed again
+    assert index.add(DIGEST, "/data/report.pdf", 1, [(0, "alpha")]) == 1
+    assert index.add(DIGEST, "/data/report.pdf", 1, [(0, "alpha")]) == 0
+    assert index.search("legacy") == []
+    assert [c["text"] for c in index.get_chunks(DIGEST, 1)] == ["alpha"]
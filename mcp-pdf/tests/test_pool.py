@@ -0,0 +1,170 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mcp_server_pdf import pool as pool_module
+from mcp_server_pdf.convert import OpenDocument, convert_page, identify_headers
+from mcp_server_pdf.pool import ConversionPool, SharedPDF, _convert_range, split_pages
+
+
+def test_split_pages_gives_every_worker_a_range():
+    assert split_pages(list(range(8)), workers=4, chunk_pages=16) == [
+        [0, 1],
+        [2, 3],
+        [4, 5],
+        [6, 7],
+    ]
+
+
+def test_split_pages_caps_range_size():
+    chunks = split_pages(list(range(10)), workers=2, chunk_pages=3)
+    assert chunks == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
+def test_split_pages_with_more_workers_than_pages():
+    assert split_pages([4, 7], workers=8, chunk_pages=16) == [[4], [7]]
+
+
+def test_split_pages_keeps_selection_order():
+    pages = [9, 2, 5, 1]
+    chunks = split_pages(pages, workers=2, chunk_pages=16)
+    assert [page for chunk in chunks for page in chunk] == pages
+
+
+def test_split_pages_empty():
+    assert split_pages([], workers=4, chunk_pages=16) == []
+
+
+def test_convert_matches_serial_order(make_pdf):
+    path = str(make_pdf(7))
+    pages = [6, 0, 3, 1, 5, 2, 4]
+    with OpenDocument(path) as doc:
+        hdr_info = identify_headers(doc, pages)
+        serial = sorted((page, convert_page(doc, page, hdr_info)) for page in pages)
+
+    pool = ConversionPool(workers=2, chunk_pages=2)
+    try:
+        converted = asyncio.run(pool.convert(path, pages, hdr_info))
+    finally:
+        pool.shutdown()
+    assert converted == serial
+
+
+def test_convert_empty_page_list():
+    pool = ConversionPool(workers=2)
+    assert asyncio.run(pool.convert("unused.pdf", [], None)) == []
+    assert pool.workers_running() == 0
+
+
+def test_failed_range_cancels_the_rest(monkeypatch):
+    started = []
+
+    def convert_range(source, pages, hdr_info, mode):
+        started.append(pages)
+        if 0 in pages:
+            raise RuntimeError("broken page")
+        return [(page, "") for page in pages]
+
+    monkeypatch.setattr(pool_module, "_convert_range", convert_range)
+    pool = ConversionPool(workers=1, chunk_pages=1)
+    # One thread runs the ranges in submission order, so the failing first
+    # range completes before any other range can start
+    executor = ThreadPoolExecutor(max_workers=1)
+    pool._executor = executor
+    try:
+        with pytest.raises(RuntimeError, match="broken page"):
+            asyncio.run(pool.convert("doc.pdf", list(range(8)), None))
+    finally:
+        executor.shutdown(wait=True)
+    assert started[0] == [0]
+    assert len(started) < 8
+
+
+def shm_mappings(pid: int | str, name: str) -> list[str]:
+    with open(f"/proc/{pid}/maps") as f:
+        return [line for line in f if name in line]
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm")
+def test_shared_pdf_lifecycle(make_pdf):
+    data = make_pdf(2).read_bytes()
+    shared = SharedPDF(data)
+    name = shared.handle.name.lstrip("/")
+    assert os.path.exists(f"/dev/shm/{name}")
+    assert bytes(shared.view()) == data
+
+    # A task attaches to the block, reads it and detaches again
+    pages = _convert_range(shared.handle, [0, 1], None, "fast")
+    assert "Body text of page 2." in pages[1][1]
+    assert shm_mappings("self", name) != []  # the parent's own mapping
+
+    shared.close()
+    assert not os.path.exists(f"/dev/shm/{name}")
+    assert shm_mappings("self", name) == []
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+def test_workers_detach_shared_pdfs(make_pdf):
+    pool = ConversionPool(workers=1, chunk_pages=1)
+    try:
+        with SharedPDF(make_pdf(3).read_bytes()) as shared:
+            name = shared.handle.name.lstrip("/")
+            converted = asyncio.run(pool.convert(shared.handle, [0, 1, 2], None, mode="fast"))
+            assert [page for page, _ in converted] == [0, 1, 2]
+            (pid,) = pool.executor._processes
+            assert shm_mappings(pid, name) == []
+        assert not os.path.exists(f"/dev/shm/{name}")
+    finally:
+        pool.shutdown()
+
+
+async def collect(pool, source, pages, stats=None):
+    return [item async for item in pool.stream(source, pages, None, stats, "fast")]
+
+
+def test_stream_yields_pages_in_order(make_pdf):
+    path = str(make_pdf(6))
+    pages = [5, 0, 4, 1, 3, 2]
+    pool = ConversionPool(workers=3)
+    stats: dict = {}
+    try:
+        streamed = asyncio.run(collect(pool, path, pages, stats))
+    finally:
+        pool.shutdown()
+    assert [page for page, _ in streamed] == pages
+    assert all(f"page {page + 1}." in text for page, text in streamed)
+    assert stats["throttled"] == 0
+
+
+def test_stream_throttles_above_max_rss(make_pdf):
+    path = str(make_pdf(4))
+    pool = ConversionPool(workers=2)
+    pool.max_rss = 1
+    stats: dict = {}
+    try:
+        streamed = asyncio.run(collect(pool, path, [0, 1, 2, 3], stats))
+    finally:
+        pool.shutdown()
+    assert [page for page, _ in streamed] == [0, 1, 2, 3]
+    # Every page after the first waits for the one in flight
+    assert stats["throttled"] == 3
+    assert stats["peak_rss"] > pool.max_rss
+
+
+def test_stream_failure_propagates(make_pdf):
+    path = str(make_pdf(2))
+    pool = ConversionPool(workers=2)
+    streamed = []
+
+    async def run():
+        async for item in pool.stream(path, [0, 1, 7], None, None, "fast"):
+            streamed.append(item[0])
+
+    try:
+        with pytest.raises(IndexError):
+            asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert streamed == [0, 1]
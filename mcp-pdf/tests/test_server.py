@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from mcp_server_pdf.server import PageWriter, format_result, output_name
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("/data/report.pdf", "report.md"),
+        ("relative/notes v2.pdf", "notes v2.md"),
+        ("/data/q#3?.pdf", "q#3?.md"),
+        ("https://example.com/files/paper.pdf?download=1#page=2", "paper.md"),
+        ("HTTP://example.com/slides.pdf", "slides.md"),
+        ("https://example.com/", "document.md"),
+    ],
+)
+def test_output_name(source, expected):
+    assert output_name(source, "markdown", set()) == expected
+
+
+def test_output_name_is_unique():
+    taken: set[str] = set()
+    names = [
+        output_name(source, "markdown", taken)
+        for source in ["/a/doc.pdf", "/b/doc.pdf", "https://example.com/doc.pdf"]
+    ]
+    assert names == ["doc.md", "doc-2.md", "doc-3.md"]
+    assert taken == set(names)
+
+
+def test_output_name_avoids_manifest():
+    taken = {"manifest.json"}
+    assert output_name("/data/manifest.pdf", "llamaindex", taken) == "manifest-2.json"
+    assert output_name("/data/manifest.pdf", "markdown", taken) == "manifest.md"
+
+
+PAGES = [(0, "# One\n"), (2, 'Three "quoted"\n'), (3, "Four\n")]
+
+
+@pytest.mark.parametrize("output_format", ["markdown", "page_chunks", "llamaindex"])
+def test_page_writer_matches_format_result(tmp_path, output_format):
+    path = tmp_path / "out" / "doc.txt"
+    writer = PageWriter(path, output_format, "/data/doc.pdf", 4)
+    for page_number, text in PAGES:
+        writer.write(page_number, text)
+    writer.finish()
+
+    expected = "\n".join(
+        item.text for item in format_result(PAGES, output_format, "/data/doc.pdf", 4)
+    )
+    assert path.read_text(encoding="utf-8") == expected
+    assert writer.bytes == len(expected.encode("utf-8"))
+    assert writer.pages == len(PAGES)
+    assert [p.name for p in path.parent.iterdir()] == ["doc.txt"]
+
+
+def test_page_writer_llamaindex_is_a_json_array(tmp_path):
+    path = tmp_path / "doc.json"
+    writer = PageWriter(path, "llamaindex", "/data/doc.pdf", 4)
+    for page_number, text in PAGES:
+        writer.write(page_number, text)
+    writer.finish()
+
+    documents = json.loads(path.read_text(encoding="utf-8"))
+    assert [d["metadata"]["page"] for d in documents] == [1, 3, 4]
+    assert documents[1]["text"] == 'Three "quoted"\n'
+
+
+def test_page_writer_llamaindex_without_pages(tmp_path):
+    path = tmp_path / "doc.json"
+    writer = PageWriter(path, "llamaindex", "/data/doc.pdf", 4)
+    writer.finish()
+    assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_page_writer_abort_removes_partial_file(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("previous output", encoding="utf-8")
+    writer = PageWriter(path, "markdown", "/data/doc.pdf", 4)
+    writer.write(0, "partial page")
+    writer.abort()
+
+    # The previous output is left untouched and no partial file remains
+    assert [p.name for p in tmp_path.iterdir()] == ["doc.md"]
+    assert path.read_text(encoding="utf-8") == "previous output"
@@ -1,6 +1,6 @@
 """MCP server for PostgreSQL database access"""
 
-from .server import serve
+from .server import create_server, serve
 
 __version__ = "0.1.0"
-__all__ = ["serve"]
+__all__ = ["create_server", "serve"]
@@ -1,12 +1,15 @@
 """Models for PostgreSQL MCP Server"""
 
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class QueryInput(BaseModel):
     """Input schema for the query tool"""
 
     sql: str
+    max_output_bytes: int | None = Field(default=None, gt=0)
 
 
 class TableInput(BaseModel):
@@ -15,7 +18,24 @@ class TableInput(BaseModel):
     table_name: str
 
 
+class SampleInput(BaseModel):
+    """Input schema for get_table_sample tool"""
+
+    table_name: str
+    max_output_bytes: int | None = Field(default=None, gt=0)
+
+
 class AnalyzeIndexInput(BaseModel):
     """Input schema for analyze_indexes tool"""
 
     table_name: str | None = None
+
+
+class EstimateInput(BaseModel):
+    """Input schema for estimate tool"""
+
+    table_name: str
+    column: str | None = None
+    where: str | None = None
+    mode: Literal["auto", "stats", "sample"] = "auto"
+    sample_percent: float | None = Field(default=None, gt=0, le=100)
@@ -1,6 +1,9 @@
 """PostgreSQL MCP Server implementation"""
 
+import asyncio
 import os
+import time
+from collections.abc import Awaitable, Callable
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -13,13 +16,23 @@ from mcp.types import (
 )
 
 from .tools import TOOL_IMPLEMENTATIONS, TOOLS
+from .utils import close_pools, get_connection, pool_status
 
 
-async def serve(database_url: str | None = None) -> None:
-    """Run the PostgreSQL MCP server.
+def create_server(
+    database_url: str | None = None,
+) -> tuple[Server, Callable[[], Awaitable[dict]], Callable[[], Awaitable[None]]]:
+    """Build the PostgreSQL MCP server.
+
+    Connections are pooled per database URL for the life of the process, so
+    a process serving several sessions (such as mcp-gateway) reuses them.
 
     Args:
         database_url: Optional database URL. If not provided, will use DATABASE_URL env var.
+
+    Returns:
+        The server, a coroutine function checking the database, and one
+        closing the pooled connections
     """
     db_url = database_url or os.getenv("DATABASE_URL")
     if not db_url:
@@ -75,7 +88,9 @@ async def serve(database_url: str | None = None) -> None:
             if name not in TOOL_IMPLEMENTATIONS:
                 return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
-            return await TOOL_IMPLEMENTATIONS[name](db_url, arguments)
+            # Tools make blocking psycopg2 calls, so they run on worker
+            # threads and a slow query does not hold up other requests
+            return await asyncio.to_thread(TOOL_IMPLEMENTATIONS[name], db_url, arguments)
         except Exception as e:
             return [TextContent(type="text", text=f"Error: {str(e)}")]
 
@@ -96,7 +111,7 @@ async def serve(database_url: str | None = None) -> None:
                     ],
                 )
 
-            result = await TOOL_IMPLEMENTATIONS[name](db_url, arguments)
+            result = await asyncio.to_thread(TOOL_IMPLEMENTATIONS[name], db_url, arguments)
             return GetPromptResult(
                 description=f"Results for {name}",
                 messages=[
@@ -117,12 +132,41 @@ async def serve(database_url: str | None = None) -> None:
                 ],
             )
 
+    def check_database() -> dict:
+        started = time.perf_counter()
+        with get_connection(db_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT current_setting('server_version')")
+                (version,) = cur.fetchone()
+        return {
+            "server_version": version,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "pool": pool_status(db_url),
+        }
+
+    async def health() -> dict:
+        return await asyncio.to_thread(check_database)
+
+    async def aclose() -> None:
+        close_pools()
+
+    return server, health, aclose
+
+
+async def serve(database_url: str | None = None) -> None:
+    """Run the PostgreSQL MCP server on stdio.
+
+    Args:
+        database_url: Optional database URL. If not provided, will use DATABASE_URL env var.
+    """
+    server, _, aclose = create_server(database_url)
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        await aclose()
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(serve())
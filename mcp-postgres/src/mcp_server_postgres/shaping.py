@@ -0,0 +1,253 @@
+"""Budgeted result shaping for query output"""
+
+import os
+
+import psycopg2
+
+from .utils import format_as_csv
+
+# Default output budget in bytes for tools that accept max_output_bytes.
+# Unset means results are returned unshaped unless a call passes a budget.
+PG_MAX_OUTPUT_BYTES_ENV = "PG_MAX_OUTPUT_BYTES"
+
+# Clipped cells keep at least this many characters
+MIN_CELL_CHARS = 16
+
+# Rows fetched per round trip from the server-side cursor. The first fetch is
+# small; later ones are sized from the average row so a small budget does not
+# pull a large batch across the wire.
+FIRST_BATCH_ROWS = 10
+FETCH_BATCH_ROWS = 100
+
+# pg_type categories whose values can be arbitrarily long and are clipped in
+# SQL: strings, arrays and user-defined types such as json, jsonb, xml, bytea
+CLIPPABLE_CATEGORIES = {"S", "A", "U"}
+
+
+def output_budget(max_output_bytes: int | None) -> int | None:
+    """Resolve the output budget from the call or the environment."""
+    if max_output_bytes is not None:
+        return max_output_bytes
+    value = os.environ.get(PG_MAX_OUTPUT_BYTES_ENV, "").strip()
+    return int(value) if value else None
+
+
+def _render(value, original_bytes: int | None, cap: int) -> str:
+    """Format a cell, clipping it with a marker giving its full size."""
+    text = str(value if value is not None else "")
+    if original_bytes is None and len(text) <= cap:
+        return text
+    full = original_bytes if original_bytes is not None else len(text.encode("utf-8"))
+    return f"{text[:cap]}...[{full} bytes]"
+
+
+def _csv(names: list[str], rows: list[list], sizes: list[list], caps: list[int]) -> str:
+    return format_as_csv(
+        [
+            {
+                name: _render(row[i], size[i], caps[i])
+                for i, name in enumerate(names)
+            }
+            for row, size in zip(rows, sizes)
+        ]
+    )
+
+
+def _next_batch(rows: int, size: int, budget: int) -> int:
+    """Rows to fetch next so the budget is just exceeded."""
+    if not rows:
+        return FIRST_BATCH_ROWS
+    average = max(size / rows, 1)
+    return max(1, min(FETCH_BATCH_ROWS, int((budget - size) / average) + 1))
+
+
+def _fit(
+    names: list[str],
+    rows: list[list],
+    sizes: list[list],
+    cap: int,
+    budget: int,
+    exhausted: bool,
+) -> str:
+    """Shrink a result until its CSV fits the budget.
+
+    In order: omit columns with the same value in every row, halve the clip
+    width of whichever column takes the most space, then drop trailing rows.
+    A trailing note, counted in the budget, says what was changed.
+    """
+    fetched = len(rows)
+    notes = []
+
+    if fetched > 1 and len(names) > 1:
+        constant = [
+            i
+            for i in range(len(names))
+            if all(size[i] is None for size in sizes)
+            and all(row[i] == rows[0][i] for row in rows)
+        ][: len(names) - 1]
+        if constant:
+            notes.append(
+                "same value in every row: "
+                + ", ".join(f"{names[i]}={_render(rows[0][i], None, 40)}" for i in constant)
+            )
+            keep = [i for i in range(len(names)) if i not in constant]
+            names = [names[i] for i in keep]
+            rows = [[row[i] for i in keep] for row in rows]
+            sizes = [[size[i] for i in keep] for size in sizes]
+
+    def note() -> str:
+        clipped = sorted(
+            {
+                names[i]
+                for row, size in zip(rows, sizes)
+                for i in range(len(names))
+                if size[i] is not None
+                or len(str(row[i] if row[i] is not None else "")) > caps[i]
+            },
+            key=names.index,
+        )
+        total = f"{fetched}" if exhausted else f"{fetched}+"
+        return f"\n-- shaped to max_output_bytes={budget}: " + "; ".join(
+            [f"showing {len(rows)} of {total} rows"]
+            + (["clipped: " + ", ".join(clipped)] if clipped else [])
+            + notes
+        )
+
+    def length() -> int:
+        """Output size with the note, which is counted in the budget."""
+        return len(text.encode("utf-8")) + len(note().encode("utf-8"))
+
+    caps = [cap] * len(names)
+    text = _csv(names, rows, sizes, caps)
+    while length() > budget:
+        widths = [
+            sum(len(_render(row[i], size[i], caps[i])) for row, size in zip(rows, sizes))
+            if caps[i] > MIN_CELL_CHARS
+            else -1
+            for i in range(len(names))
+        ]
+        widest = max(range(len(names)), key=widths.__getitem__)
+        if widths[widest] < 0:
+            break
+        caps[widest] = max(MIN_CELL_CHARS, caps[widest] // 2)
+        text = _csv(names, rows, sizes, caps)
+
+    while True:
+        total = length()
+        if total <= budget or len(rows) <= 1:
+            return text + note()
+        # Drop rows in proportion to the overshoot rather than one at a time
+        keep = max(1, min(len(rows) - 1, int(len(rows) * budget / total)))
+        rows, sizes = rows[:keep], sizes[:keep]
+        text = _csv(names, rows, sizes, caps)
+
+
+def _shape_client_side(conn, query: str, budget: int) -> str:
+    """Fallback for statements that cannot be wrapped in a subquery."""
+    with conn.cursor() as cur:
+        cur.execute(query)
+        names = [column.name for column in cur.description]
+        cap = max(MIN_CELL_CHARS, budget // max(len(names), 1))
+        rows: list[list] = []
+        size = 0
+        exhausted = False
+        while size <= budget:
+            requested = _next_batch(len(rows), size, budget)
+            batch = cur.fetchmany(requested)
+            exhausted = len(batch) < requested
+            for row in batch:
+                rows.append(list(row))
+                size += sum(len(str(value)) + 1 for value in row)
+            if exhausted:
+                break
+    sizes = [[None] * len(names) for _ in rows]
+    fits = exhausted and len(_csv(names, rows, sizes, [cap] * len(names)).encode()) <= budget
+    if fits and all(len(str(v)) <= cap for row in rows for v in row):
+        return format_as_csv([dict(zip(names, row)) for row in rows])
+    return _fit(names, rows, sizes, cap, budget, exhausted)
+
+
+def shaped_csv(conn, query: str, budget: int) -> str:
+    """Run a read-only query and return CSV that fits within budget bytes.
+
+    The query is wrapped in a subquery so long string, array and JSON values
+    are clipped server-side with ``left()``, with their ``octet_length`` sent
+    along for the marker. Rows are streamed from a server-side cursor and
+    fetching stops once the budget is exceeded, so neither the transfer nor
+    the response grows with the result. Results that already fit are
+    returned exactly as the unshaped formatter would.
+
+    Args:
+        conn: Open database connection
+        query: SQL query
+        budget: Maximum size of the CSV output in bytes
+
+    Returns:
+        CSV text, followed by a note line when the result was shaped
+    """
+    query = query.strip().rstrip(";").strip()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT * FROM ({query}) AS q LIMIT 0")
+            names = [column.name for column in cur.description]
+            type_oids = [column.type_code for column in cur.description]
+            cur.execute(
+                "SELECT oid, typcategory FROM pg_type WHERE oid = ANY(%s)",
+                (list(set(type_oids)),),
+            )
+            categories = dict(cur.fetchall())
+    except psycopg2.Error:
+        conn.rollback()
+        return _shape_client_side(conn, query, budget)
+
+    if not names:
+        return ""
+    cap = max(MIN_CELL_CHARS, budget // len(names))
+    aliases = ", ".join(f"c{i}" for i in range(len(names)))
+    columns = []
+    clippable = set()
+    for i, oid in enumerate(type_oids):
+        if categories.get(oid) in CLIPPABLE_CATEGORIES:
+            clippable.add(i)
+            long = f"octet_length(c{i}::text) > {cap}"
+            columns.append(
+                f"CASE WHEN {long} THEN NULL ELSE c{i} END, "
+                f"CASE WHEN {long} THEN left(c{i}::text, {cap}) END, "
+                f"CASE WHEN {long} THEN octet_length(c{i}::text) END"
+            )
+        else:
+            columns.append(f"c{i}")
+
+    rows: list[list] = []
+    sizes: list[list] = []
+    size = len(",".join(names))
+    exhausted = False
+    with conn.cursor(name="shaped_output") as cur:
+        cur.execute(f"SELECT {', '.join(columns)} FROM ({query}) AS q({aliases})")
+        while size <= budget:
+            requested = _next_batch(len(rows), size, budget)
+            batch = cur.fetchmany(requested)
+            exhausted = len(batch) < requested
+            for record in batch:
+                values, lengths, position = [], [], 0
+                for i in range(len(names)):
+                    if i in clippable:
+                        value, clipped, original = record[position : position + 3]
+                        position += 3
+                        values.append(clipped if original is not None else value)
+                        lengths.append(original)
+                    else:
+                        values.append(record[position])
+                        lengths.append(None)
+                        position += 1
+                rows.append(values)
+                sizes.append(lengths)
+                size += sum(len(str(value)) + 1 for value in values)
+            if exhausted:
+                break
+
+    if exhausted and all(length is None for row in sizes for length in row):
+        text = format_as_csv([dict(zip(names, row)) for row in rows])
+        if len(text.encode("utf-8")) <= budget:
+            return text
+    return _fit(names, rows, sizes, cap, budget, exhausted)
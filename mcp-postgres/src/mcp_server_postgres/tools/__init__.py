@@ -2,9 +2,16 @@
 
 from mcp.types import Tool
 
-from ..models import AnalyzeIndexInput, QueryInput, TableInput
+from ..models import (
+    AnalyzeIndexInput,
+    EstimateInput,
+    QueryInput,
+    SampleInput,
+    TableInput,
+)
 from .analyze import analyze_indexes
 from .describe import describe_table
+from .estimate import estimate
 from .list_tables import list_tables
 from .query import execute_query
 from .sample import get_table_sample
@@ -27,7 +34,11 @@ TOOLS = [
         - Only SELECT queries are allowed for security
         - Results include headers by default
         - NULL values are shown as empty strings
-        - Special characters are properly escaped""",
+        - Special characters are properly escaped
+        - Optional max_output_bytes caps the response size: long text/JSON values are
+          clipped in SQL with a "...[N bytes]" marker, columns with the same value in
+          every row are folded into a note, and rows are trimmed to fit. A final
+          "-- shaped to ..." line reports what was changed""",
         inputSchema=QueryInput.model_json_schema(),
     ),
     Tool(
@@ -109,8 +120,40 @@ TOOLS = [
         Sample Data:
         id,name,email
         1,John Doe,john@example.com
-        2,Jane Smith,jane@example.com""",
-        inputSchema=TableInput.model_json_schema(),
+        2,Jane Smith,jane@example.com
+        
+        Optional max_output_bytes caps the sample data size the same way as execute_query.""",
+        inputSchema=SampleInput.model_json_schema(),
+    ),
+    Tool(
+        name="estimate",
+        description="""Estimate row counts and distinct counts without scanning the table.
+        
+        Use this instead of COUNT(*) / COUNT(DISTINCT) in execute_query for exploratory
+        questions on large tables. Answers come from catalog statistics and the planner
+        in milliseconds, falling back to a TABLESAMPLE pass when statistics are missing
+        or stale.
+        
+        Parameters:
+        - table_name: Table to estimate (optionally schema-qualified)
+        - column: Optional column to count distinct values of
+        - where: Optional WHERE clause (without the WHERE keyword)
+        - mode: auto (default), stats (catalog and planner only, never reads the table)
+          or sample (always run a TABLESAMPLE pass)
+        - sample_percent: Optional sampling percentage (default: about 1000 pages)
+        
+        Output is in CSV format:
+        metric,estimate,low,high,bound,method,elapsed_ms
+        
+        The bound column says how far low and high can be trusted: a 95% confidence
+        interval from a sampling pass, "approximate: ..." for ranges derived from
+        catalog statistics or an estimated table size, or "unbounded" with low and
+        high left empty when no useful range is known (stats mode on a
+        high-cardinality column).
+        
+        Example output:
+        count,1204000,1198211,1209789,approximate: ANALYZE sample plus rows modified since,pg_class.reltuples,0.8""",
+        inputSchema=EstimateInput.model_json_schema(),
     ),
 ]
 
@@ -121,4 +164,5 @@ TOOL_IMPLEMENTATIONS = {
     "list_tables": list_tables,
     "analyze_indexes": analyze_indexes,
     "get_table_sample": get_table_sample,
+    "estimate": estimate,
 }
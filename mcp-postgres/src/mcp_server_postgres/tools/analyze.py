@@ -6,7 +6,7 @@ from ..models import AnalyzeIndexInput
 from ..utils import format_as_csv, get_connection
 
 
-async def analyze_indexes(db_url: str, arguments: dict) -> list[TextContent]:
+def analyze_indexes(db_url: str, arguments: dict) -> list[TextContent]:
     """Analyze database index usage and provide optimization recommendations.
 
     Args:
@@ -6,7 +6,7 @@ from ..models import TableInput
 from ..utils import format_as_csv, get_connection
 
 
-async def describe_table(db_url: str, arguments: dict) -> list[TextContent]:
+def describe_table(db_url: str, arguments: dict) -> list[TextContent]:
     """Get detailed schema information for a database table.
 
     Args:
@@ -0,0 +1,346 @@
+"""Approximate count and distinct estimation tool implementation"""
+
+import math
+import time
+
+from mcp.types import TextContent
+from psycopg2 import sql
+
+from ..models import EstimateInput
+from ..utils import format_as_csv, get_connection
+
+# Statement timeout applied to every estimate so a sampling pass never turns
+# into the full scan the tool exists to avoid.
+ESTIMATE_TIMEOUT_MS = 5000
+
+# Number of heap pages a sampling pass aims to read when no explicit
+# sample_percent is given. Keeps the pass roughly constant-cost regardless
+# of table size.
+SAMPLE_TARGET_PAGES = 1000
+
+# Catalog statistics are considered stale once more than this fraction of
+# rows has been modified since the last ANALYZE.
+STALE_STATS_RATIO = 0.1
+
+# z-score for the 95% confidence intervals reported by sampling passes
+Z_95 = 1.96
+
+# Bound labels. Catalog statistics come from ANALYZE's own row sample, so
+# intervals derived from them are indicative rather than guaranteed.
+APPROXIMATE = "approximate: ANALYZE sample plus rows modified since"
+# Limits that would be hard if the table size were exact, but scale from
+# reltuples or from a sample
+SCALED_LIMITS = "approximate: limits scaled from estimated table size"
+UNBOUNDED = "unbounded"
+
+# Upper 95% bound on the matches in a sample that found none (rule of three)
+RULE_OF_THREE = 3.0
+
+
+def _table_stats(cur, table_name: str) -> dict:
+    """Fetch catalog statistics for a table."""
+    cur.execute(
+        """
+        SELECT c.oid::regclass::text,
+               c.reltuples,
+               c.relpages,
+               coalesce(s.n_mod_since_analyze, 0),
+               greatest(s.last_analyze, s.last_autoanalyze) IS NOT NULL
+        FROM pg_class c
+        LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+        WHERE c.oid = %s::regclass
+    """,
+        (table_name,),
+    )
+    name, reltuples, relpages, modified, analyzed = cur.fetchone()
+    return {
+        "name": name,
+        "rows": max(reltuples, 0),
+        "pages": relpages,
+        "modified": modified,
+        "analyzed": analyzed and reltuples >= 0,
+    }
+
+
+def _stats_are_fresh(stats: dict) -> bool:
+    """Whether catalog statistics can answer without touching the heap."""
+    if not stats["analyzed"]:
+        return False
+    return stats["modified"] <= STALE_STATS_RATIO * max(stats["rows"], 1)
+
+
+def _sample_fraction(stats: dict, sample_percent: float | None) -> float:
+    """Resolve the TABLESAMPLE fraction for a sampling pass."""
+    if sample_percent is not None:
+        return sample_percent / 100
+    return min(1.0, SAMPLE_TARGET_PAGES / max(stats["pages"], 1))
+
+
+def _where_clause(where: str | None) -> sql.Composable:
+    return sql.SQL("WHERE ({})").format(sql.SQL(where)) if where else sql.SQL("")
+
+
+def _answer(
+    metric: str,
+    estimate: float,
+    low: float | None,
+    high: float | None,
+    bound: str,
+    method: str,
+    started: float,
+) -> dict:
+    """Build a result row; a missing low or high is reported as empty."""
+    return {
+        "metric": metric,
+        "estimate": round(estimate),
+        "low": None if low is None else max(0, math.floor(low)),
+        "high": None if high is None else math.ceil(high),
+        "bound": bound,
+        "method": method,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _count_from_stats(stats: dict, started: float) -> dict:
+    """Row count from pg_class.reltuples, bounded by drift since ANALYZE.
+
+    reltuples is itself extrapolated from ANALYZE's sample, so the interval
+    is only approximate: it collapses to a single value when nothing has been
+    modified, even though reltuples may be off.
+    """
+    rows, drift = stats["rows"], stats["modified"]
+    return _answer(
+        "count",
+        rows,
+        rows - drift,
+        rows + drift,
+        APPROXIMATE,
+        "pg_class.reltuples",
+        started,
+    )
+
+
+def _from_planner(
+    cur, stats: dict, metric: str, query: sql.Composable, started: float
+) -> dict:
+    """Estimate from the planner's row count for the top plan node.
+
+    The range runs up to the table's estimated size, which is itself taken
+    from reltuples, so it is labelled approximate.
+    """
+    cur.execute(sql.SQL("EXPLAIN (FORMAT JSON) {}").format(query))
+    plan = cur.fetchone()[0][0]["Plan"]
+    return _answer(
+        metric,
+        plan["Plan Rows"],
+        0,
+        stats["rows"] + stats["modified"],
+        SCALED_LIMITS,
+        "planner",
+        started,
+    )
+
+
+def _count_from_sample(
+    cur, stats: dict, where: str | None, fraction: float, started: float
+) -> dict:
+    """Row count from a TABLESAMPLE SYSTEM pass.
+
+    SYSTEM sampling selects whole pages, so the variance is computed as for a
+    cluster sample using the per-page match counts. A sample with no matches
+    has no variance to go on; its upper bound follows the rule of three.
+    """
+    cur.execute(
+        sql.SQL(
+            """
+            SELECT coalesce(sum(c), 0), coalesce(sum(c * c), 0)
+            FROM (
+                SELECT count(*) AS c
+                FROM {} TABLESAMPLE SYSTEM ({})
+                {}
+                GROUP BY (ctid::text::point)[0]
+            ) pages
+        """
+        ).format(
+            sql.SQL(stats["name"]),
+            sql.Literal(fraction * 100),
+            _where_clause(where),
+        )
+    )
+    matched, sum_squares = cur.fetchone()
+    estimate = float(matched) / fraction
+    margin = Z_95 * math.sqrt((1 - fraction) * float(sum_squares)) / fraction
+    if matched == 0 and fraction < 1:
+        margin = RULE_OF_THREE / fraction
+    return _answer(
+        "count",
+        estimate,
+        estimate - margin,
+        estimate + margin,
+        "95% confidence",
+        f"tablesample {fraction * 100:.4g}%",
+        started,
+    )
+
+
+def _distinct_from_stats(
+    cur, stats: dict, column: str, started: float, allow_unbounded: bool = False
+) -> dict | None:
+    """Distinct count from pg_stats.n_distinct, if the column has statistics.
+
+    A negative n_distinct, usual for high-cardinality columns, yields no
+    useful bound. It is only answered with allow_unbounded (stats mode);
+    otherwise None is returned so the caller can sample instead.
+    """
+    cur.execute(
+        """
+        SELECT s.n_distinct
+        FROM pg_stats s
+        JOIN pg_class c ON c.relname = s.tablename
+        JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = s.schemaname
+        WHERE c.oid = %s::regclass AND s.attname = %s
+    """,
+        (stats["name"], column),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+
+    n_distinct = row[0]
+    drift = stats["modified"]
+    if n_distinct >= 0:
+        # ANALYZE stores a positive value when it saw the whole domain
+        return _answer(
+            f"distinct({column})",
+            n_distinct,
+            n_distinct - drift,
+            n_distinct + drift,
+            APPROXIMATE,
+            "pg_stats.n_distinct",
+            started,
+        )
+    # A negative value is a ratio of the row count. The only hard limits are
+    # 1 and the number of non-null rows, which carry no information.
+    if not allow_unbounded:
+        return None
+    return _answer(
+        f"distinct({column})",
+        -n_distinct * stats["rows"],
+        None,
+        None,
+        UNBOUNDED,
+        "pg_stats.n_distinct",
+        started,
+    )
+
+
+def _distinct_from_sample(
+    cur,
+    stats: dict,
+    column: str,
+    where: str | None,
+    fraction: float,
+    started: float,
+) -> dict:
+    """Distinct count from a TABLESAMPLE SYSTEM pass.
+
+    Uses the Haas-Stokes (Duj1) estimator, the same one ANALYZE uses, computed
+    server-side so only three numbers cross the wire. The sample's distinct
+    values are a hard floor. The ceiling assumes every unsampled row adds a
+    new value, but the row total is extrapolated from the sample, so the
+    range is labelled approximate.
+    """
+    column_id = sql.Identifier(column)
+    filters = [sql.SQL("{} IS NOT NULL").format(column_id)]
+    if where:
+        filters.append(sql.SQL("({})").format(sql.SQL(where)))
+    cur.execute(
+        sql.SQL(
+            """
+            SELECT coalesce(sum(c), 0), count(*), count(*) FILTER (WHERE c = 1)
+            FROM (
+                SELECT count(*) AS c
+                FROM {} TABLESAMPLE SYSTEM ({})
+                WHERE {}
+                GROUP BY {}
+            ) values_seen
+        """
+        ).format(
+            sql.SQL(stats["name"]),
+            sql.Literal(fraction * 100),
+            sql.SQL(" AND ").join(filters),
+            column_id,
+        )
+    )
+    sampled, distinct, singletons = cur.fetchone()
+    sampled = float(sampled)
+    total = sampled / fraction
+    if sampled == 0:
+        estimate = 0.0
+    else:
+        estimate = sampled * distinct / (sampled - singletons + singletons * sampled / total)
+    high = max(distinct, total - (sampled - distinct))
+    return _answer(
+        f"distinct({column})",
+        min(max(estimate, distinct), high),
+        distinct,
+        high,
+        SCALED_LIMITS,
+        f"tablesample {fraction * 100:.4g}% (Haas-Stokes)",
+        started,
+    )
+
+
+def estimate(db_url: str, arguments: dict) -> list[TextContent]:
+    """Estimate row counts and distinct counts without a full scan.
+
+    Args:
+        db_url: Database connection URL
+        arguments: Tool arguments containing table name, optional column,
+            WHERE clause, mode and sample percentage
+
+    Returns:
+        List of TextContent with the estimate and its error bound in CSV format
+    """
+    est = EstimateInput(**arguments)
+    with get_connection(db_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL statement_timeout = %s", (ESTIMATE_TIMEOUT_MS,))
+            started = time.perf_counter()
+            stats = _table_stats(cur, est.table_name)
+            fraction = _sample_fraction(stats, est.sample_percent)
+            use_stats = est.mode == "stats" or (
+                est.mode == "auto" and _stats_are_fresh(stats)
+            )
+
+            table = sql.SQL(stats["name"])
+            if est.column is None:
+                if use_stats and not est.where:
+                    answer = _count_from_stats(stats, started)
+                elif est.mode == "stats":
+                    query = sql.SQL("SELECT 1 FROM {} {}").format(
+                        table, _where_clause(est.where)
+                    )
+                    answer = _from_planner(cur, stats, "count", query, started)
+                else:
+                    answer = _count_from_sample(cur, stats, est.where, fraction, started)
+            else:
+                answer = None
+                if use_stats and not est.where:
+                    answer = _distinct_from_stats(
+                        cur, stats, est.column, started, allow_unbounded=est.mode == "stats"
+                    )
+                if answer is None and est.mode == "stats":
+                    column = sql.Identifier(est.column)
+                    query = sql.SQL("SELECT {} FROM {} {} GROUP BY {}").format(
+                        column, table, _where_clause(est.where), column
+                    )
+                    answer = _from_planner(
+                        cur, stats, f"distinct({est.column})", query, started
+                    )
+                if answer is None:
+                    answer = _distinct_from_sample(
+                        cur, stats, est.column, est.where, fraction, started
+                    )
+
+            return [TextContent(type="text", text=format_as_csv([answer]))]
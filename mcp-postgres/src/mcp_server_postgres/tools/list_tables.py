@@ -5,7 +5,7 @@ from mcp.types import TextContent
 from ..utils import format_as_csv, get_connection
 
 
-async def list_tables(db_url: str, arguments: dict) -> list[TextContent]:
+def list_tables(db_url: str, arguments: dict) -> list[TextContent]:
     """List all tables in the database with their sizes and row counts.
 
     Args:
@@ -4,21 +4,25 @@ from mcp.types import TextContent
 from psycopg2.extras import RealDictCursor
 
 from ..models import QueryInput
+from ..shaping import output_budget, shaped_csv
 from ..utils import format_as_csv, get_connection
 
 
-async def execute_query(db_url: str, arguments: dict) -> list[TextContent]:
+def execute_query(db_url: str, arguments: dict) -> list[TextContent]:
     """Execute a read-only SQL query.
 
     Args:
         db_url: Database connection URL
-        arguments: Tool arguments containing SQL query
+        arguments: Tool arguments containing SQL query and optional max_output_bytes
 
     Returns:
         List of TextContent with query results in CSV format
     """
     query = QueryInput(**arguments)
+    budget = output_budget(query.max_output_bytes)
     with get_connection(db_url) as conn:
+        if budget is not None:
+            return [TextContent(type="text", text=shaped_csv(conn, query.sql, budget))]
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(query.sql)
             results = cur.fetchall()
@@ -3,21 +3,23 @@
 from mcp.types import TextContent
 from psycopg2.extras import RealDictCursor
 
-from ..models import TableInput
+from ..models import SampleInput
+from ..shaping import output_budget, shaped_csv
 from ..utils import format_as_csv, get_connection
 
 
-async def get_table_sample(db_url: str, arguments: dict) -> list[TextContent]:
+def get_table_sample(db_url: str, arguments: dict) -> list[TextContent]:
     """Get table schema and sample data.
 
     Args:
         db_url: Database connection URL
-        arguments: Tool arguments containing table name
+        arguments: Tool arguments containing table name and optional max_output_bytes
 
     Returns:
         List of TextContent with schema and sample data in CSV format
     """
-    table = TableInput(**arguments)
+    table = SampleInput(**arguments)
+    budget = output_budget(table.max_output_bytes)
     with get_connection(db_url) as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
             # Get schema
@@ -33,29 +35,34 @@ async def get_table_sample(db_url: str, arguments: dict) -> list[TextContent]:
             schema = cur.fetchall()
 
             # Get sample data
-            cur.execute(f"""
+            sample_sql = f"""
                 SELECT *
                 FROM {table.table_name}
                 ORDER BY random()
                 LIMIT 10
-            """)
-            sample_data = cur.fetchall()
+            """
+            if budget is None:
+                cur.execute(sample_sql)
+                sample_data = cur.fetchall()
 
             # Format schema as CSV
             schema_csv = format_as_csv(
                 [
                     {
-                        "column": s[0],
-                        "type": s[1],
-                        "nullable": s[2],
-                        "default": s[3],
+                        "column": s["column_name"],
+                        "type": s["data_type"],
+                        "nullable": s["is_nullable"],
+                        "default": s["column_default"],
                     }
                     for s in schema
                 ]
             )
 
-            # Format sample data as CSV
-            sample_csv = format_as_csv(sample_data)
+            # Format sample data as CSV, within the output budget if one is set
+            if budget is None:
+                sample_csv = format_as_csv(sample_data)
+            else:
+                sample_csv = shaped_csv(conn, sample_sql, budget)
 
             result = "SCHEMA:\n" + schema_csv + "\n\nSAMPLE DATA:\n" + sample_csv
             return [TextContent(type="text", text=result)]
@@ -1,6 +1,57 @@
 """Utility functions for PostgreSQL MCP Server"""
 
-import psycopg2
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN, connection
+from psycopg2.pool import ThreadedConnectionPool
+
+# Most connections open at once per database URL
+PG_POOL_SIZE_ENV = "PG_POOL_SIZE"
+DEFAULT_POOL_SIZE = 4
+
+# Idle connections kept between calls; psycopg2 closes returned connections
+# beyond that
+IDLE_CONNECTIONS = 1
+
+
+class _BlockingPool(ThreadedConnectionPool):
+    """Pool whose getconn waits for a free connection instead of raising
+
+    No connection is opened until the first getconn. psycopg2 uses minconn
+    both for the connections opened up front and for the idle connections it
+    keeps, so the pool is created with none and then allowed to keep ``idle``.
+    """
+
+    def __init__(self, maxconn: int, idle: int, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        self.minconn = min(idle, maxconn)
+        self._slots = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        self._slots.acquire()
+        try:
+            return super().getconn(key)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._slots.release()
+
+    def status(self) -> tuple[int, int]:
+        """Numbers of open and in-use connections"""
+        with self._lock:
+            return len(self._pool) + len(self._used), len(self._used)
+
+
+_pools: dict[str, _BlockingPool] = {}
+_pools_lock = threading.Lock()
 
 
 def format_as_csv(data: list, include_headers: bool = True) -> str:
@@ -37,12 +88,48 @@ def format_as_csv(data: list, include_headers: bool = True) -> str:
     return "\n".join(lines)
 
 
-def get_connection(database_url: str):
-    """Get a database connection with read-only transaction
+def _pool(database_url: str) -> _BlockingPool:
+    with _pools_lock:
+        if database_url not in _pools:
+            size = int(os.environ.get(PG_POOL_SIZE_ENV, "").strip() or DEFAULT_POOL_SIZE)
+            _pools[database_url] = _BlockingPool(max(size, 1), IDLE_CONNECTIONS, database_url)
+        return _pools[database_url]
+
+
+@contextmanager
+def get_connection(database_url: str) -> Iterator[connection]:
+    """Borrow a read-only connection from the pool for a database URL
+
+    Waits for a connection when PG_POOL_SIZE are already in use.
+    The transaction is committed or rolled back on exit and the connection
+    goes back to the pool, so later calls skip connection setup. Connections
+    left broken by an error are closed instead of reused.
 
     Args:
         database_url: PostgreSQL connection URL
     """
-    conn = psycopg2.connect(database_url)
-    conn.set_session(readonly=True)
-    return conn
+    pool = _pool(database_url)
+    conn = pool.getconn()
+    try:
+        if not conn.readonly:
+            conn.set_session(readonly=True)
+        with conn:
+            yield conn
+    finally:
+        broken = conn.closed or conn.info.transaction_status == TRANSACTION_STATUS_UNKNOWN
+        pool.putconn(conn, close=bool(broken))
+
+
+def pool_status(database_url: str) -> dict:
+    """Connections of the pool for a database URL that are open and in use"""
+    pool = _pool(database_url)
+    open_connections, in_use = pool.status()
+    return {"size": pool.maxconn, "open": open_connections, "in_use": in_use}
+
+
+def close_pools() -> None:
+    """Close every pooled connection"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.closeall()
+        _pools.clear()
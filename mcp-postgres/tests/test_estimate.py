@@ -0,0 +1,112 @@
+"""Tests for the bounds reported by the estimate tool"""
+
+import time
+
+from psycopg2 import sql
+
+from mcp_server_postgres.tools.estimate import (
+    APPROXIMATE,
+    SCALED_LIMITS,
+    UNBOUNDED,
+    _count_from_sample,
+    _count_from_stats,
+    _distinct_from_sample,
+    _distinct_from_stats,
+    _from_planner,
+)
+
+
+class FakeCursor:
+    """Cursor that answers every query with one fixed row."""
+
+    def __init__(self, row):
+        self.row = row
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    def fetchone(self):
+        return self.row
+
+
+def stats(rows=1000.0, modified=0):
+    return {"name": "events", "rows": rows, "pages": 10, "modified": modified, "analyzed": True}
+
+
+def test_count_from_stats_is_approximate_without_drift():
+    answer = _count_from_stats(stats(modified=0), time.perf_counter())
+    assert (answer["estimate"], answer["low"], answer["high"]) == (1000, 1000, 1000)
+    assert answer["bound"] == APPROXIMATE
+
+
+def test_count_from_stats_widens_by_drift():
+    answer = _count_from_stats(stats(modified=50), time.perf_counter())
+    assert (answer["low"], answer["high"]) == (950, 1050)
+
+
+def test_positive_n_distinct_is_bounded_by_drift():
+    answer = _distinct_from_stats(
+        FakeCursor((42.0,)), stats(modified=3), "kind", time.perf_counter()
+    )
+    assert (answer["estimate"], answer["low"], answer["high"]) == (42, 39, 45)
+    assert answer["bound"] == APPROXIMATE
+
+
+def test_negative_n_distinct_falls_back_outside_stats_mode():
+    answer = _distinct_from_stats(
+        FakeCursor((-0.25,)), stats(), "user_id", time.perf_counter()
+    )
+    assert answer is None
+
+
+def test_negative_n_distinct_is_unbounded_in_stats_mode():
+    answer = _distinct_from_stats(
+        FakeCursor((-0.25,)), stats(), "user_id", time.perf_counter(), allow_unbounded=True
+    )
+    assert answer["estimate"] == 250
+    assert answer["low"] is None and answer["high"] is None
+    assert answer["bound"] == UNBOUNDED
+
+
+def test_missing_column_statistics():
+    assert _distinct_from_stats(FakeCursor(None), stats(), "kind", time.perf_counter()) is None
+
+
+def test_distinct_from_sample_range_is_approximate():
+    # 100 sampled rows over 40 values, 10 of them seen once, at a 10% sample
+    answer = _distinct_from_sample(
+        FakeCursor((100, 40, 10)), stats(), "kind", None, 0.1, time.perf_counter()
+    )
+    # At least the values seen, at most one new value per unsampled row
+    assert answer["low"] == 40
+    assert answer["high"] == 1000 - 60
+    assert answer["low"] <= answer["estimate"] <= answer["high"]
+    assert answer["bound"] == SCALED_LIMITS
+
+
+def test_distinct_from_empty_sample():
+    answer = _distinct_from_sample(
+        FakeCursor((0, 0, 0)), stats(), "kind", None, 0.1, time.perf_counter()
+    )
+    assert (answer["estimate"], answer["low"], answer["high"]) == (0, 0, 0)
+
+
+def test_count_from_sample_with_no_matches_uses_rule_of_three():
+    answer = _count_from_sample(FakeCursor((0, 0)), stats(), "id < 0", 0.1, time.perf_counter())
+    assert (answer["estimate"], answer["low"], answer["high"]) == (0, 0, 30)
+    assert answer["bound"] == "95% confidence"
+
+
+def test_count_from_full_sample_with_no_matches_is_exact():
+    answer = _count_from_sample(FakeCursor((0, 0)), stats(), "id < 0", 1.0, time.perf_counter())
+    assert (answer["low"], answer["high"]) == (0, 0)
+
+
+def test_planner_range_is_approximate():
+    cursor = FakeCursor(([{"Plan": {"Plan Rows": 12}}],))
+    answer = _from_planner(
+        cursor, stats(modified=5), "count", sql.SQL("SELECT 1"), time.perf_counter()
+    )
+    assert (answer["estimate"], answer["low"], answer["high"]) == (12, 0, 1005)
+    assert answer["bound"] == SCALED_LIMITS
@@ -0,0 +1,123 @@
+"""Tests for budgeted result shaping"""
+
+import os
+
+import pytest
+
+from mcp_server_postgres.shaping import (
+    FIRST_BATCH_ROWS,
+    MIN_CELL_CHARS,
+    PG_MAX_OUTPUT_BYTES_ENV,
+    _fit,
+    _next_batch,
+    _render,
+    output_budget,
+    shaped_csv,
+)
+
+
+def shape(names, rows, budget, cap=1000, exhausted=True, sizes=None):
+    sizes = sizes or [[None] * len(names) for _ in rows]
+    return _fit(names, rows, sizes, cap, budget, exhausted)
+
+
+def test_output_budget(monkeypatch):
+    monkeypatch.delenv(PG_MAX_OUTPUT_BYTES_ENV, raising=False)
+    assert output_budget(None) is None
+    assert output_budget(500) == 500
+    monkeypatch.setenv(PG_MAX_OUTPUT_BYTES_ENV, "2000")
+    assert output_budget(None) == 2000
+    assert output_budget(500) == 500
+
+
+def test_render_marks_clipped_values():
+    assert _render("short", None, 10) == "short"
+    assert _render(None, None, 10) == ""
+    assert _render("x" * 30, None, 10) == "xxxxxxxxxx...[30 bytes]"
+    # Clipped server-side: the prefix arrives with the full size
+    assert _render("abc", 6000, 10) == "abc...[6000 bytes]"
+    assert _render("é" * 12, None, 4) == "éééé...[24 bytes]"
+
+
+def test_next_batch_is_sized_from_rows_seen():
+    assert _next_batch(0, 0, 1000) == FIRST_BATCH_ROWS
+    # 10 rows of 50 bytes with 500 bytes left: 10 more rows, plus one to overshoot
+    assert _next_batch(10, 500, 1000) == 11
+    assert _next_batch(10, 1500, 1000) == 1
+    assert _next_batch(10, 10, 1_000_000) == 100
+
+
+def test_fit_stays_within_budget():
+    names = ["id", "body"]
+    rows = [[i, f"{i} " + "word " * 200] for i in range(50)]
+    text = shape(names, rows, budget=2000)
+    assert len(text.encode("utf-8")) <= 2000
+    assert "...[100" in text
+    assert "clipped: body" in text
+    assert "showing" in text.splitlines()[-1]
+
+
+def test_fit_clips_widest_column_before_dropping_rows():
+    names = ["id", "narrow", "wide"]
+    rows = [[i, f"n{i}", str(i) * 400] for i in range(4)]
+    text = shape(names, rows, budget=600)
+    lines = text.splitlines()
+    assert lines[-1].startswith("-- shaped to max_output_bytes=600: showing 4 of 4 rows")
+    assert all(f"n{i}" in text for i in range(4))
+    assert "clipped: wide" in lines[-1]
+
+
+def test_fit_never_clips_below_minimum():
+    names = ["a", "b"]
+    rows = [[c * 100, c.upper() * 100] for c in "xyz"]
+    text = shape(names, rows, budget=10)
+    # Nothing fits, so a single row clipped to the minimum width is returned
+    assert text.splitlines()[1] == ",".join(
+        [f"{c * MIN_CELL_CHARS}...[100 bytes]" for c in "xX"]
+    )
+    assert "showing 1 of 3 rows" in text
+
+
+def test_fit_drops_rows_and_reports_unknown_total():
+    names = ["id", "value"]
+    rows = [[i, i * 2] for i in range(200)]
+    text = shape(names, rows, budget=300, exhausted=False)
+    assert len(text.encode("utf-8")) <= 300
+    last = text.splitlines()[-1]
+    assert "of 200+ rows" in last
+    assert "clipped" not in last
+
+
+def test_fit_folds_constant_columns():
+    names = ["id", "tenant", "payload"]
+    rows = [[i, "acme", f"{i:03d}" * 30] for i in range(20)]
+    text = shape(names, rows, budget=800)
+    assert text.splitlines()[0] == "id,payload"
+    assert "same value in every row: tenant=acme" in text.splitlines()[-1]
+
+
+@pytest.fixture
+def connection():
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    import psycopg2
+
+    conn = psycopg2.connect(url)
+    conn.set_session(readonly=True)
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+def test_shaped_csv_clips_server_side(connection):
+    query = "SELECT g AS id, repeat('x', 5000) AS body FROM generate_series(1, 1000) g"
+    text = shaped_csv(connection, query, 1000)
+    assert len(text.encode("utf-8")) <= 1000
+    assert "...[5000 bytes]" in text
+    assert "of 1000 rows" not in text
+
+
+def test_shaped_csv_returns_small_results_unchanged(connection):
+    text = shaped_csv(connection, "SELECT 1 AS a, 'b' AS b", 1000)
+    assert text == "a,b\n1,b"
@@ -0,0 +1,90 @@
+"""Tests for the pooled connections behind get_connection"""
+
+import os
+import threading
+
+import psycopg2
+import pytest
+
+from mcp_server_postgres.utils import (
+    PG_POOL_SIZE_ENV,
+    close_pools,
+    get_connection,
+    pool_status,
+)
+
+
+@pytest.fixture
+def url(monkeypatch):
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    monkeypatch.setenv(PG_POOL_SIZE_ENV, "1")
+    close_pools()
+    yield url
+    close_pools()
+
+
+def backend_pid(url: str) -> int:
+    with get_connection(url) as conn, conn.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid()")
+        return cur.fetchone()[0]
+
+
+def setting(url: str) -> str | None:
+    with get_connection(url) as conn, conn.cursor() as cur:
+        cur.execute("SELECT current_setting('mcp.test', true)")
+        return cur.fetchone()[0]
+
+
+def test_connections_are_read_only_and_reused(url):
+    with get_connection(url) as conn:
+        assert conn.readonly
+        assert pool_status(url) == {"size": 1, "open": 1, "in_use": 1}
+    assert pool_status(url) == {"size": 1, "open": 1, "in_use": 0}
+    assert backend_pid(url) == backend_pid(url)
+
+
+def test_getconn_waits_for_a_free_connection(url):
+    borrowed = threading.Event()
+
+    def borrow():
+        with get_connection(url):
+            borrowed.set()
+
+    with get_connection(url):
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        # The pool is full, so the second caller waits instead of raising
+        assert not borrowed.wait(0.2)
+    thread.join(5)
+    assert borrowed.is_set()
+    assert pool_status(url)["in_use"] == 0
+
+
+def test_broken_connection_is_discarded(url):
+    first = backend_pid(url)
+    with pytest.raises(psycopg2.Error):
+        with get_connection(url) as conn, conn.cursor() as cur:
+            cur.execute("SELECT pg_terminate_backend(pg_backend_pid())")
+    assert pool_status(url) == {"size": 1, "open": 0, "in_use": 0}
+    assert backend_pid(url) != first
+
+
+def test_transaction_is_committed_or_rolled_back(url):
+    with get_connection(url) as conn, conn.cursor() as cur:
+        cur.execute("SELECT set_config('mcp.test', 'kept', false)")
+    assert setting(url) == "kept"
+
+    with pytest.raises(RuntimeError):
+        with get_connection(url) as conn, conn.cursor() as cur:
+            cur.execute("SELECT set_config('mcp.test', 'dropped', false)")
+            raise RuntimeError("query failed")
+    assert setting(url) == "kept"
+
+    with pytest.raises(psycopg2.Error):
+        with get_connection(url) as conn, conn.cursor() as cur:
+            cur.execute("SELECT 1 / 0")
+    # The aborted transaction was rolled back, so the connection is reusable
+    assert setting(url) == "kept"
+    assert pool_status(url)["open"] == 1
@@ -0,0 +1,147 @@
+"""Count the API requests each GitHub tool call makes, against the stub API.
+
+Every scenario runs twice over a fresh stub (benchmarks/stub_api.py):
+
+- ``per_object``: the previous access pattern, without a response cache:
+  list_repositories walked every repository 30 per page (PyGithub's default)
+  on each call, and reading a search result's repository description,
+  visibility and stars takes one repository request per result.
+- ``batched``: the server's GitHubAPI client, with page-sized listing,
+  conditional requests and GraphQL ``nodes(ids:)`` lookups for search results.
+
+Listing scenarios are repeated to show warm-cache behaviour: revalidated
+pages come back as 304s, which count as requests but not against the quota.
+
+Usage:
+    python benchmarks/bench_requests.py [--repos 1000] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from stub_api import serve  # noqa: E402
+
+# Keep the client's search bucket out of the measurements
+os.environ.setdefault("GITHUB_SEARCH_PER_MINUTE", "100000")
+
+from github_api import GitHubAPI, ResponseCache  # noqa: E402
+
+
+def stub_stats(url: str) -> dict:
+    with urllib.request.urlopen(f"{url}/_stats") as response:
+        return json.load(response)
+
+
+async def get_uncached(api: GitHubAPI, path: str, params: dict | None = None):
+    if params:
+        path += "?" + urlencode(params)
+    response = await api.request("GET", path)
+    return response.json(), response.headers
+
+
+async def list_per_object(api: GitHubAPI, limit: int) -> int:
+    """Walk every page of /user/repos, 30 at a time."""
+    repos, page = [], 1
+    while True:
+        batch, headers = await get_uncached(
+            api, "/user/repos", {"visibility": "all", "per_page": 30, "page": page}
+        )
+        repos.extend(batch)
+        if 'rel="next"' not in headers.get("Link", ""):
+            return min(len(repos), limit)
+        page += 1
+
+
+async def list_batched(api: GitHubAPI, limit: int) -> int:
+    count, page = 0, 1
+    while count < limit:
+        repos, more = await api.list_user_repos("all", min(limit - count, 100), page)
+        count += len(repos)
+        if not more:
+            break
+        page += 1
+    return count
+
+
+async def search_per_object(api: GitHubAPI, limit: int) -> int:
+    """Search, then fetch each result's repository on its own."""
+    results, _ = await get_uncached(api, "/search/code", {"q": "cache", "per_page": limit})
+    for item in results["items"]:
+        await get_uncached(api, f"/repos/{item['repository']['full_name']}")
+    return len(results["items"])
+
+
+async def search_batched(api: GitHubAPI, limit: int) -> int:
+    return len(await api.search_code("cache", limit))
+
+
+SCENARIOS = {
+    "list_repositories default limit (30)": (list_per_object, list_batched, 30),
+    "list_repositories all": (list_per_object, list_batched, 10**6),
+    "search_code 5 results": (search_per_object, search_batched, 5),
+    "search_code 30 results": (search_per_object, search_batched, 30),
+    "search_code 100 results": (search_per_object, search_batched, 100),
+}
+
+
+async def measure(strategy, limit: int, repos: int, calls: int) -> list[dict]:
+    server = serve(0, repos, search_per_minute=10**6)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    runs = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        api = GitHubAPI("benchmark", url, ResponseCache(cache_dir))
+        try:
+            for call in range(calls):
+                before = stub_stats(url)
+                started = time.perf_counter()
+                items = await strategy(api, limit)
+                elapsed = time.perf_counter() - started
+                after = stub_stats(url)
+                runs.append(
+                    {
+                        "call": call + 1,
+                        "items": items,
+                        "requests": after.get("total", 0) - before.get("total", 0),
+                        "quota_used": after["quota_used"] - before["quota_used"],
+                        "seconds": round(elapsed, 3),
+                    }
+                )
+        finally:
+            await api.aclose()
+            server.shutdown()
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=1000, help="Repositories on the stub")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    args = parser.parse_args()
+
+    results = []
+    print("scenario,strategy,call,items,requests,quota_used,seconds")
+    for name, (per_object, batched, limit) in SCENARIOS.items():
+        calls = 2 if name.startswith("list_") else 1
+        for strategy, label in ((per_object, "per_object"), (batched, "batched")):
+            for run in asyncio.run(measure(strategy, limit, args.repos, calls)):
+                results.append({"scenario": name, "strategy": label, **run})
+                print(
+                    f"{name},{label},{run['call']},{run['items']},{run['requests']},"
+                    f"{run['quota_used']},{run['seconds']}"
+                )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""Local stand-in for the GitHub REST API.
+
+Serves a deterministic set of repositories for the authenticated user with
+the same pagination (Link headers), conditional-request (ETag, 304 Not
+Modified) and rate-limit headers as api.github.com, and counts the requests
+it receives, so the server's request behaviour can be measured without a
+token or quota.
+
+Usage:
+    python benchmarks/stub_api.py [--port 8765] [--repos 250]
+
+then point the server at it with GITHUB_API_URL=http://127.0.0.1:8765.
+GET /_stats returns the request counters; POST /_touch?repo=N bumps a
+repository's pushed_at/updated_at, moving it to the front of sort=updated
+listings; POST
+/_fail?status=502&count=2 makes the next requests fail with that status
+(403/429 carry Retry-After: 1). POST /graphql answers the repository
+nodes(ids:) query.
+
+Like the real API, /search/code allows a limited number of requests per
+minute (--search-per-minute); going over it gets a 403 secondary rate limit
+response with Retry-After, counted as "secondary_limited".
+"""
+
+import argparse
+import collections
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+LANGUAGES = ["Python", "TypeScript", "Go", "Rust", "Shell", None]
+WORDS = "data pipeline service client tool api cache index search sync worker".split()
+
+
+def make_repos(count: int, owner: str = "octocat", seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    repos = []
+    for number in range(count):
+        name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{number}"
+        private = number % 3 == 0
+        repos.append(
+            {
+                "id": 1000 + number,
+                "node_id": f"R_{1000 + number}",
+                "name": name,
+                "full_name": f"{owner}/{name}",
+                "private": private,
+                "visibility": "private" if private else "public",
+                "html_url": f"https://github.com/{owner}/{name}",
+                "description": " ".join(rng.choice(WORDS) for _ in range(6)).capitalize(),
+                "stargazers_count": rng.randint(0, 5000),
+                "language": rng.choice(LANGUAGES),
+                "topics": sorted({rng.choice(WORDS) for _ in range(3)}),
+                "archived": number % 17 == 0,
+                "fork": number % 5 == 0,
+                "pushed_at": f"2024-{1 + number % 12:02d}-{1 + number % 28:02d}T12:00:00Z",
+                "updated_at": f"2024-{1 + number % 12:02d}-{1 + number % 28:02d}T12:00:00Z",
+            }
+        )
+    return repos
+
+
+class StubState:
+    def __init__(self, repos: int, rate_limit: int = 5000, search_per_minute: int = 10):
+        self.repos = make_repos(repos)
+        self.lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset = int(time.time()) + 3600
+        self.search_per_minute = search_per_minute
+        self.searches: collections.deque[float] = collections.deque()
+        self.issues = 0
+        self.failures: list[int] = []
+
+    def search_allowed(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            while self.searches and self.searches[0] <= now - 60:
+                self.searches.popleft()
+            if len(self.searches) >= self.search_per_minute:
+                return False
+            self.searches.append(now)
+            return True
+
+    def next_failure(self) -> int | None:
+        with self.lock:
+            return self.failures.pop(0) if self.failures else None
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def charge(self) -> None:
+        with self.lock:
+            self.remaining = max(0, self.remaining - 1)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    state: StubState
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-RateLimit-Limit", str(self.state.rate_limit))
+        self.send_header("X-RateLimit-Remaining", str(self.state.remaining))
+        self.send_header("X-RateLimit-Reset", str(self.state.reset))
+        self.send_header("X-RateLimit-Resource", self._resource())
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _resource(self) -> str:
+        """Rate-limit resource GitHub reports for the requested path."""
+        path = urlparse(self.path).path
+        if path == "/graphql":
+            return "graphql"
+        if path == "/search/code":
+            return "code_search"
+        return "search" if path.startswith("/search/") else "core"
+
+    def _json(self, payload, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            # Conditional hits are free on the real API
+            self.state.count("not_modified")
+            self._send(304, headers={"ETag": etag})
+            return
+        self.state.charge()
+        self._send(200, body, {"ETag": etag, **(headers or {})})
+
+    def _link(self, path: str, query: dict, page: int, last: int) -> dict:
+        links = []
+        for rel, number in (("next", page + 1), ("last", last)):
+            if page < last:
+                params = {**query, "page": number}
+                links.append(f'<http://{self.headers["Host"]}{path}?{urlencode(params)}>; rel="{rel}"')
+        return {"Link": ", ".join(links)} if links else {}
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/_stats":
+            with self.state.lock:
+                counts = {**self.state.counts, "quota_used": self.state.rate_limit - self.state.remaining}
+                body = json.dumps(counts).encode("utf-8")
+            self._send(200, body)
+            return
+        if self._inject_failure():
+            return
+        self.state.count("total")
+        self.state.count(url.path)
+        if url.path == "/rate_limit":
+            limits = {
+                "limit": self.state.rate_limit,
+                "remaining": self.state.remaining,
+                "reset": self.state.reset,
+            }
+            resources = {
+                "core": limits,
+                "search": limits,
+                "code_search": limits,
+                "graphql": limits,
+            }
+            self._send(200, json.dumps({"resources": resources, "rate": limits}).encode("utf-8"))
+            return
+        if url.path == "/search/code":
+            if not self.state.search_allowed():
+                self.state.count("secondary_limited")
+                self._send(
+                    403,
+                    b'{"message": "You have exceeded a secondary rate limit."}',
+                    {"Retry-After": "60"},
+                )
+                return
+            self.state.charge()
+            self._send(200, json.dumps(self._search(query)).encode("utf-8"))
+            return
+        parts = url.path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "repos":
+            self.state.count("/repos/{owner}/{repo}")
+            full_name = f"{parts[1]}/{parts[2]}"
+            for repo in self.state.repos:
+                if repo["full_name"] == full_name:
+                    self._json(repo)
+                    return
+        if url.path == "/user/repos":
+            visibility = query.get("visibility", "all")
+            repos = [
+                repo
+                for repo in self.state.repos
+                if visibility == "all" or repo["visibility"] == visibility
+            ]
+            sort = query.get("sort", "full_name")
+            if sort in ("updated", "pushed", "created"):
+                key = "updated_at" if sort == "updated" else "pushed_at"
+                repos = sorted(
+                    repos, key=lambda repo: repo[key], reverse=query.get("direction") != "asc"
+                )
+            per_page = min(int(query.get("per_page", 30)), 100)
+            page = int(query.get("page", 1))
+            last = max(1, -(-len(repos) // per_page))
+            items = repos[(page - 1) * per_page : page * per_page]
+            self._json(items, self._link(url.path, query, page, last))
+            return
+        self._send(404, b'{"message": "Not Found"}')
+
+    def _inject_failure(self) -> bool:
+        status = self.state.next_failure()
+        if status is None:
+            return False
+        self.state.count("injected_failures")
+        headers = {"Retry-After": "1"} if status in (403, 429) else {}
+        self._send(status, b'{"message": "Injected failure"}', headers)
+        return True
+
+    def _search(self, query: dict) -> dict:
+        terms = query.get("q", "")
+        rng = random.Random(terms)
+        per_page = min(int(query.get("per_page", 30)), 100)
+        total = rng.randint(per_page, 500)
+        items = []
+        for number in range(per_page):
+            repo = rng.choice(self.state.repos)
+            path = f"src/{rng.choice(WORDS)}/{rng.choice(WORDS)}_{number}.py"
+            items.append(
+                {
+                    "name": path.rsplit("/", 1)[1],
+                    "path": path,
+                    "sha": hashlib.sha1(f"{terms}{number}".encode()).hexdigest(),
+                    "html_url": f"{repo['html_url']}/blob/main/{path}",
+                    "repository": {
+                        "id": repo["id"],
+                        "node_id": repo["node_id"],
+                        "name": repo["name"],
+                        "full_name": repo["full_name"],
+                        "private": repo["private"],
+                        "html_url": repo["html_url"],
+                    },
+                    "score": 1.0,
+                }
+            )
+        return {"total_count": total, "incomplete_results": False, "items": items}
+
+    def _graphql(self, body: dict) -> dict:
+        """Answer the nodes(ids:) repository query the server sends."""
+        if "nodes(" not in body.get("query", ""):
+            return {"errors": [{"message": "Stub only supports nodes(ids:) queries"}]}
+        by_id = {repo["node_id"]: repo for repo in self.state.repos}
+        ids = body.get("variables", {}).get("ids", [])
+        if len(ids) > 100:
+            return {"errors": [{"message": "Too many node IDs, the maximum is 100"}]}
+        nodes = []
+        for node_id in ids:
+            repo = by_id.get(node_id)
+            nodes.append(
+                {
+                    "id": repo["node_id"],
+                    "nameWithOwner": repo["full_name"],
+                    "description": repo["description"],
+                    "url": repo["html_url"],
+                    "visibility": repo["visibility"].upper(),
+                    "stargazerCount": repo["stargazers_count"],
+                }
+                if repo
+                else None
+            )
+        return {"data": {"nodes": nodes}}
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/_fail":
+            with self.state.lock:
+                self.state.failures += [int(query.get("status", 502))] * int(query.get("count", 1))
+            self._send(204)
+            return
+        if url.path == "/_touch":
+            repo = self.state.repos[int(query.get("repo", 0))]
+            repo["pushed_at"] = repo["updated_at"] = time.strftime(
+                "%Y-%m-%dT%H:%M:%SZ", time.gmtime()
+            )
+            self._send(204)
+            return
+        body = self._body()
+        if self._inject_failure():
+            return
+        self.state.count("total")
+        if url.path == "/graphql":
+            self.state.count("/graphql")
+            self.state.charge()
+            self._send(200, json.dumps(self._graphql(body)).encode("utf-8"))
+            return
+        parts = url.path.strip("/").split("/")
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] == "issues":
+            self.state.count("/repos/{owner}/{repo}/issues")
+            self.state.charge()
+            with self.state.lock:
+                self.state.issues += 1
+                number = self.state.issues
+            issue = {
+                "number": number,
+                "title": body.get("title"),
+                "body": body.get("body"),
+                "labels": [{"name": label} for label in body.get("labels", [])],
+                "html_url": f"https://github.com/{parts[1]}/{parts[2]}/issues/{number}",
+            }
+            self._send(201, json.dumps(issue).encode("utf-8"))
+            return
+        self._send(404, b'{"message": "Not Found"}')
+
+
+def serve(port: int = 0, repos: int = 250, search_per_minute: int = 10) -> ThreadingHTTPServer:
+    """Start the stub in a background thread; the bound port is server_address[1]."""
+    state = StubState(repos, search_per_minute=search_per_minute)
+    handler = type("Handler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repos", type=int, default=250)
+    parser.add_argument("--search-per-minute", type=int, default=10)
+    args = parser.parse_args()
+    server = serve(args.port, args.repos, args.search_per_minute)
+    print(f"Stub GitHub API on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
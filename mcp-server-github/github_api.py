@@ -0,0 +1,553 @@
+"""Async GitHub REST client with a persistent conditional-request cache.
+
+All tools share one client, so requests made by concurrent tool calls go
+through the same connection pool and the same rate-limit scheduler.
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+# Base URL of the REST API. Point it at a stub server for local testing or at
+# a GitHub Enterprise instance (https://host/api/v3).
+GITHUB_API_URL_ENV = "GITHUB_API_URL"
+DEFAULT_API_URL = "https://api.github.com"
+
+# Directory holding the HTTP cache database.
+GITHUB_CACHE_DIR_ENV = "GITHUB_CACHE_DIR"
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mcp-server-github"
+
+# Largest page size the REST API accepts, and most nodes fetched per GraphQL
+# query.
+MAX_PER_PAGE = 100
+
+# Repository fields fetched for search results, in one GraphQL query per
+# MAX_PER_PAGE repositories instead of one REST request each
+REPOSITORY_NODES_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ... on Repository {
+      id
+      nameWithOwner
+      description
+      url
+      visibility
+      stargazerCount
+    }
+  }
+}
+"""
+
+# Scheduler settings. GitHub's secondary limits cap concurrent requests and
+# points per minute; the search endpoint has its own, much lower limit
+# (code search allows 10 requests per minute), and mutating requests should be
+# at least a second apart.
+GITHUB_MAX_CONCURRENCY_ENV = "GITHUB_MAX_CONCURRENCY"
+GITHUB_REQUESTS_PER_SECOND_ENV = "GITHUB_REQUESTS_PER_SECOND"
+GITHUB_SEARCH_PER_MINUTE_ENV = "GITHUB_SEARCH_PER_MINUTE"
+GITHUB_MAX_RETRIES_ENV = "GITHUB_MAX_RETRIES"
+GITHUB_MAX_WAIT_ENV = "GITHUB_MAX_WAIT"
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+DEFAULT_SEARCH_PER_MINUTE = 10.0
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_MAX_WAIT = 60.0
+
+# Exponential backoff for transient failures: base * 2^attempt seconds,
+# capped, with full jitter
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+# Secondary limit responses without a Retry-After header: wait at least this
+SECONDARY_LIMIT_WAIT = 60.0
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# X-RateLimit-Resource values tracked under the name of the bucket that
+# schedules them. Code search reports its own code_search resource.
+RESOURCE_ALIASES = {"code_search": "search"}
+WRITE_METHODS = {"POST", "PATCH", "PUT", "DELETE"}
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.environ.get(name, "").strip()
+    return float(value) if value else default
+
+
+class GitHubAPIError(Exception):
+    """A request failed; carries the HTTP status when there was a response."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimited(GitHubAPIError):
+    """The rate limit is exhausted for longer than the client will wait."""
+
+
+class ResponseCache:
+    """SQLite store of response bodies keyed by URL, with their validators.
+
+    Stored ETag/Last-Modified values are sent back as conditional headers.
+    GitHub answers unchanged resources with 304 Not Modified, which does not
+    count against the rate limit, and the stored body is used instead.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(
+            directory or os.environ.get(GITHUB_CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        ).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    link TEXT,
+                    body TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.directory / "http.db", timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT etag, last_modified, link, body FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, link, body = row
+        return {"etag": etag, "last_modified": last_modified, "link": link, "body": body}
+
+    def put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        link: Optional[str],
+        body: str,
+    ) -> None:
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, link, body, time.time()),
+            )
+
+
+class TokenBucket:
+    """Async token bucket holding up to capacity tokens, refilled at rate/s.
+
+    Waiters are served in arrival order. ``pause`` empties the bucket until a
+    point in time, holding back every caller rather than only the one that
+    saw the limit.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> float:
+        """Take a token, returning the seconds spent waiting for it."""
+        started = time.monotonic()
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    self.tokens, self.updated = 0.0, time.monotonic()
+                    continue
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return time.monotonic() - started
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class GitHubAPI:
+    """Minimal async REST and GraphQL client for the GitHub tools.
+
+    Keeps one keep-alive connection pool and schedules every request through
+    token buckets: one for all requests, a stricter one for the search
+    endpoint and a one-per-second one for writes. Rate-limit headers from each
+    response are tracked per resource; an exhausted limit pauses the matching
+    bucket until its reset, and ``Retry-After``/secondary-limit responses,
+    5xx errors and connection failures are retried with jittered exponential
+    backoff. Cached GET responses are revalidated with conditional requests.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: Optional[str] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
+        self.base_url = (
+            base_url or os.environ.get(GITHUB_API_URL_ENV) or DEFAULT_API_URL
+        ).rstrip("/")
+        # GitHub Enterprise serves GraphQL at /api/graphql next to /api/v3
+        if self.base_url.endswith("/api/v3"):
+            self.graphql_url = self.base_url[: -len("v3")] + "graphql"
+        else:
+            self.graphql_url = f"{self.base_url}/graphql"
+        self.cache = cache or ResponseCache()
+        concurrency = int(_env_number(GITHUB_MAX_CONCURRENCY_ENV, DEFAULT_MAX_CONCURRENCY))
+        self.client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+        )
+        self.concurrency = asyncio.Semaphore(concurrency)
+        per_second = _env_number(GITHUB_REQUESTS_PER_SECOND_ENV, DEFAULT_REQUESTS_PER_SECOND)
+        per_minute = _env_number(GITHUB_SEARCH_PER_MINUTE_ENV, DEFAULT_SEARCH_PER_MINUTE)
+        # A bucket allows its burst plus a minute of refill within any
+        # minute, so the search bucket splits the limit between the two
+        search_burst = max(1.0, per_minute // 2)
+        self.buckets = {
+            "core": TokenBucket(per_second, per_second),
+            "search": TokenBucket(max(per_minute - search_burst, 1.0) / 60, search_burst),
+            "graphql": TokenBucket(per_second, per_second),
+            "write": TokenBucket(1.0, 1.0),
+        }
+        self.max_retries = int(_env_number(GITHUB_MAX_RETRIES_ENV, DEFAULT_MAX_RETRIES))
+        self.max_wait = _env_number(GITHUB_MAX_WAIT_ENV, DEFAULT_MAX_WAIT)
+        # Latest X-RateLimit-* values per resource (core, search, graphql, ...)
+        self.rate_limits: Dict[str, Dict[str, int]] = {}
+        self.rate_limit: Dict[str, int] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "retries": 0, "throttled_seconds": 0.0}
+
+    @staticmethod
+    def _resource(path: str) -> str:
+        if path == "/graphql":
+            return "graphql"
+        return "search" if path.startswith("/search/") else "core"
+
+    def _record_rate_limit(self, response: httpx.Response, resource: str) -> None:
+        limits = {}
+        for field in ("limit", "remaining", "reset"):
+            value = response.headers.get(f"X-RateLimit-{field.title()}")
+            if value is not None and value.isdigit():
+                limits[field] = int(value)
+        if limits:
+            reported = response.headers.get("X-RateLimit-Resource")
+            if reported:
+                resource = RESOURCE_ALIASES.get(reported, reported)
+            self.rate_limits[resource] = limits
+            self.rate_limit = limits
+
+    def _limit_wait(self, response: httpx.Response) -> Optional[float]:
+        """Seconds to wait if the response is a rate-limit rejection."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = response.headers.get("X-RateLimit-Reset", "")
+            if reset.isdigit():
+                return max(float(reset) - time.time(), 0.0) + 1
+        if response.status_code == 429 or "rate limit" in response.text.lower():
+            return SECONDARY_LIMIT_WAIT
+        return None
+
+    async def _schedule(self, method: str, resource: str) -> None:
+        limits = self.rate_limits.get(resource, {})
+        if limits.get("remaining") == 0 and limits.get("reset", 0) > time.time():
+            wait = limits["reset"] - time.time() + 1
+            if wait > self.max_wait:
+                raise RateLimited(
+                    f"GitHub {resource} rate limit exhausted until "
+                    + time.strftime("%H:%M:%S UTC", time.gmtime(limits["reset"])),
+                    403,
+                )
+            self.buckets[resource].pause(wait)
+        waited = await self.buckets["core"].acquire()
+        if resource != "core":
+            waited += await self.buckets[resource].acquire()
+        # GraphQL queries are POSTs but not writes
+        if method in WRITE_METHODS and resource != "graphql":
+            waited += await self.buckets["write"].acquire()
+        self.stats["throttled_seconds"] += waited
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        json_body: Any = None,
+    ) -> httpx.Response:
+        """Send a scheduled request, retrying rate limits and transient errors.
+
+        ``path`` may include a query string. 304 responses are returned as
+        they are; other error statuses raise GitHubAPIError once retries are
+        exhausted.
+        """
+        resource = self._resource(path)
+        url = self.graphql_url if resource == "graphql" else f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            await self._schedule(method, resource)
+            try:
+                async with self.concurrency:
+                    response = await self.client.request(
+                        method, url, headers=headers, json=json_body
+                    )
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise GitHubAPIError(f"{method} {path} failed: {e}") from e
+                self.stats["retries"] += 1
+                await asyncio.sleep(random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt)))
+                continue
+            self.stats["requests"] += 1
+            self._record_rate_limit(response, resource)
+
+            wait = self._limit_wait(response)
+            if wait is None and response.status_code not in RETRY_STATUSES:
+                if response.status_code >= 400:
+                    try:
+                        message = response.json().get("message", response.text)
+                    except ValueError:
+                        message = response.text
+                    raise GitHubAPIError(
+                        f"{method} {path} returned {response.status_code}: {message}",
+                        response.status_code,
+                    )
+                return response
+            if wait is None:
+                wait = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+            else:
+                if wait > self.max_wait:
+                    raise RateLimited(
+                        f"{method} {path} is rate limited for another {wait:.0f}s", response.status_code
+                    )
+                # Hold back every caller using this resource, plus jitter so
+                # they do not all resume at once
+                wait += random.uniform(0, 1)
+                self.buckets[resource].pause(wait)
+            if attempt == self.max_retries:
+                break
+            self.stats["retries"] += 1
+            await asyncio.sleep(wait)
+        raise GitHubAPIError(
+            f"{method} {path} returned {response.status_code} after {self.max_retries} retries",
+            response.status_code,
+        )
+
+    async def get(
+        self, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, httpx.Headers, bool]:
+        """GET a resource, revalidating any cached copy.
+
+        Returns:
+            The decoded JSON body, the response headers (the stored Link
+            header on a cache hit) and whether the cached body was used
+        """
+        if params:
+            path += "?" + urlencode(sorted(params.items()))
+        url = f"{self.base_url}{path}"
+        # The cache is SQLite, so its disk I/O runs off the event loop
+        cached = await asyncio.to_thread(self.cache.get, url)
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await self.request("GET", path, headers=headers)
+        if response.status_code == 304 and cached:
+            self.stats["cache_hits"] += 1
+            link = {"Link": cached["link"]} if cached["link"] else {}
+            return json.loads(cached["body"]), httpx.Headers(link), True
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            await asyncio.to_thread(
+                self.cache.put, url, etag, last_modified, response.headers.get("Link"), response.text
+            )
+        return response.json(), response.headers, False
+
+    async def list_user_repos(
+        self, visibility: str = "all", limit: int = 30, page: int = 1
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fetch one page of the authenticated user's repositories.
+
+        Pages are ``limit`` repositories long. Only the API pages covering the
+        requested window are fetched, so small pages cost a single request.
+
+        Returns:
+            The repositories and whether more are available after them
+        """
+        start = (page - 1) * limit
+        per_page = limit if limit <= MAX_PER_PAGE else MAX_PER_PAGE
+        api_page = start // per_page + 1
+        skip = start % per_page
+        repos: List[Dict[str, Any]] = []
+        more = False
+        while len(repos) < limit:
+            batch, headers, _ = await self.get(
+                "/user/repos",
+                {"visibility": visibility, "per_page": per_page, "page": api_page},
+            )
+            batch = batch[skip:]
+            skip = 0
+            taken = batch[: limit - len(repos)]
+            repos.extend(taken)
+            has_next = 'rel="next"' in headers.get("Link", "")
+            more = len(taken) < len(batch) or has_next
+            if not has_next:
+                break
+            api_page += 1
+        return repos, more
+
+    async def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a GraphQL query and return its data.
+
+        Errors alongside data (such as a node that is no longer visible) are
+        tolerated; a response with no data raises GitHubAPIError.
+        """
+        response = await self.request(
+            "POST", "/graphql", json_body={"query": query, "variables": variables}
+        )
+        payload = response.json()
+        if payload.get("data") is None:
+            messages = "; ".join(error.get("message", "") for error in payload.get("errors", []))
+            raise GitHubAPIError(f"GraphQL query failed: {messages or response.text}")
+        return payload["data"]
+
+    async def repositories_by_id(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch repository fields for GraphQL node IDs, 100 per query.
+
+        Returns:
+            Repository nodes keyed by node ID; IDs that did not resolve are
+            left out
+        """
+        unique = list(dict.fromkeys(node_ids))
+        batches = [unique[i : i + MAX_PER_PAGE] for i in range(0, len(unique), MAX_PER_PAGE)]
+        results = await asyncio.gather(
+            *(self.graphql(REPOSITORY_NODES_QUERY, {"ids": batch}) for batch in batches)
+        )
+        return {
+            node["id"]: node
+            for data in results
+            for node in data["nodes"]
+            if node
+        }
+
+    async def _repository_or_none(self, full_name: str) -> Optional[Dict[str, Any]]:
+        """GET a single repository, or None if it cannot be read."""
+        try:
+            repository, _, _ = await self.get(f"/repos/{full_name}")
+        except RateLimited:
+            raise
+        except GitHubAPIError:
+            return None
+        return repository
+
+    async def search_code(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Run a code search, returning up to ``limit`` result items.
+
+        Code search items only carry a minimal repository object, so the
+        description, visibility and star count of their repositories are
+        filled in with batched GraphQL node lookups and merged into
+        ``item["repository"]``. Repositories GraphQL cannot resolve, or all
+        of them if the GraphQL query fails, are fetched over REST instead.
+        """
+        results, _, _ = await self.get(
+            "/search/code", {"q": query, "per_page": min(limit, MAX_PER_PAGE)}
+        )
+        items = results.get("items", [])[:limit]
+        ids = [item["repository"]["node_id"] for item in items if item["repository"].get("node_id")]
+        nodes: Dict[str, Dict[str, Any]] = {}
+        if ids:
+            try:
+                nodes = await self.repositories_by_id(ids)
+            except GitHubAPIError:
+                nodes = {}
+
+        missing = list(
+            dict.fromkeys(
+                item["repository"]["full_name"]
+                for item in items
+                if item["repository"].get("node_id") not in nodes
+            )
+        )
+        fetched = await asyncio.gather(*(self._repository_or_none(name) for name in missing))
+        repositories = {name: repo for name, repo in zip(missing, fetched) if repo}
+
+        for item in items:
+            repository = item["repository"]
+            node = nodes.get(repository.get("node_id"))
+            if node:
+                repository.update(
+                    description=node["description"],
+                    visibility=node["visibility"].lower(),
+                    stargazers_count=node["stargazerCount"],
+                )
+            elif repository["full_name"] in repositories:
+                rest = repositories[repository["full_name"]]
+                repository.update(
+                    description=rest.get("description"),
+                    visibility=rest.get("visibility"),
+                    stargazers_count=rest.get("stargazers_count"),
+                )
+        return items
+
+    async def create_issue(
+        self, repo: str, title: str, body: str, labels: List[str]
+    ) -> Dict[str, Any]:
+        response = await self.request(
+            "POST",
+            f"/repos/{repo}/issues",
+            json_body={"title": title, "body": body, "labels": labels},
+        )
+        return response.json()
+
+    def rate_limit_summary(self, resource: Optional[str] = None) -> str:
+        limits = self.rate_limits.get(resource, {}) if resource else self.rate_limit
+        label = f"Rate limit ({resource})" if resource else "Rate limit"
+        if "remaining" not in limits:
+            return f"{label}: unknown"
+        summary = f"{label}: {limits['remaining']}/{limits.get('limit', '?')} remaining"
+        if "reset" in limits:
+            reset = time.strftime("%H:%M:%S UTC", time.gmtime(limits["reset"]))
+            summary += f", resets {reset}"
+        return summary
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
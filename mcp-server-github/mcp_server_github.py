@@ -1,47 +1,51 @@
 #!/usr/bin/env python3
-from typing import Any, Dict, List, Optional
-from modelcontextprotocol.server import Server, StdioServerTransport
-from modelcontextprotocol.types import (
-    CallToolRequestSchema,
-    ErrorCode,
-    ListToolsRequestSchema,
-    McpError,
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mcp.server import Server
+from mcp.server.stdio import stdio_server
+from mcp.shared.exceptions import McpError
+from mcp.types import (
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    ErrorData,
     TextContent,
-    SamplingMessage,
+    Tool,
 )
-from github import Github
-import os
+
+from github_api import GitHubAPI
+from repo_index import RepoIndex
+
+
+def _error(code: int, message: str) -> McpError:
+    return McpError(ErrorData(code=code, message=message))
+
 
 class GitHubServer:
-    def __init__(self):
-        self.server = Server(
-            {
-                "name": "github-server",
-                "version": "0.1.0",
-            },
-            {
-                "capabilities": {
-                    "tools": {},
-                }
-            }
-        )
+    def __init__(self, token: Optional[str] = None):
+        self.server = Server("github-server", version="0.1.0")
         
-        token = os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
+        token = token or os.environ.get("GITHUB_PERSONAL_ACCESS_TOKEN")
         if not token:
-            raise McpError(ErrorCode.InternalError, "GitHub token not found in environment")
+            raise _error(INTERNAL_ERROR, "GitHub token not found in environment")
         
-        self.github = Github(token)
+        self.api = GitHubAPI(token)
+        self.index = RepoIndex()
         
         self.setup_tool_handlers()
-        self.server.onerror = lambda error: print(f"[MCP Error] {error}", file=os.sys.stderr)
 
     def setup_tool_handlers(self):
-        self.server.set_request_handler(ListToolsRequestSchema, self.handle_list_tools)
-        self.server.set_request_handler(CallToolRequestSchema, self.handle_call_tool)
+        self.server.list_tools()(self.handle_list_tools)
+        self.server.call_tool()(self.handle_call_tool)
 
-    async def handle_list_tools(self, _):
-        return {
-            "tools": [
+    async def handle_list_tools(self) -> List[Tool]:
+        return [
+            Tool(**tool)
+            for tool in [
                 {
                     "name": "list_repositories",
                     "description": "List repositories for the authenticated user",
@@ -52,6 +56,77 @@ class GitHubServer:
                                 "type": "string",
                                 "enum": ["all", "public", "private"],
                                 "description": "Filter repositories by visibility"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 1000,
+                                "default": 30,
+                                "description": "Maximum number of repositories to return"
+                            },
+                            "page": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "default": 1,
+                                "description": "Page of results to return, each page being limit repositories long"
+                            }
+                        }
+                    }
+                },
+                {
+                    "name": "find_repositories",
+                    "description": "Find the authenticated user's repositories by name, description, topic or language using a local index, without spending API quota",
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "query": {
+                                "type": "string",
+                                "description": "Words to match against names, descriptions, topics and languages; leave empty to filter only"
+                            },
+                            "language": {
+                                "type": "string",
+                                "description": "Only repositories with this primary language"
+                            },
+                            "topic": {
+                                "type": "string",
+                                "description": "Only repositories with this topic"
+                            },
+                            "owner": {
+                                "type": "string",
+                                "description": "Only repositories of this user or organization"
+                            },
+                            "visibility": {
+                                "type": "string",
+                                "enum": ["all", "public", "private"],
+                                "description": "Filter repositories by visibility"
+                            },
+                            "min_stars": {
+                                "type": "integer",
+                                "minimum": 0,
+                                "description": "Only repositories with at least this many stars"
+                            },
+                            "include_archived": {
+                                "type": "boolean",
+                                "default": True,
+                                "description": "Include archived repositories"
+                            },
+                            "sort": {
+                                "type": "string",
+                                "enum": ["relevance", "stars", "pushed", "name"],
+                                "default": "relevance",
+                                "description": "Result order; relevance applies when query is given, otherwise stars"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 100,
+                                "default": 20,
+                                "description": "Maximum number of repositories to return"
+                            },
+                            "refresh": {
+                                "type": "boolean",
+                                "default": False,
+                                "description": "Refresh the index from the API before searching, even if it is recent"
                             }
                         }
                     }
@@ -96,102 +171,219 @@ class GitHubServer:
                             "language": {
                                 "type": "string",
                                 "description": "Filter by programming language"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 100,
+                                "default": 5,
+                                "description": "Maximum number of results to return"
                             }
                         },
                         "required": ["query"]
                     }
                 }
             ]
-        }
-
-    async def handle_call_tool(self, request):
-        tool_name = request.params.name
-        args = request.params.arguments
+        ]
 
+    async def handle_call_tool(self, tool_name: str, args: Dict[str, Any]) -> List[TextContent]:
         try:
             if tool_name == "list_repositories":
                 return await self.list_repositories(args)
+            elif tool_name == "find_repositories":
+                return await self.find_repositories(args)
             elif tool_name == "create_issue":
                 return await self.create_issue(args)
             elif tool_name == "search_code":
                 return await self.search_code(args)
             else:
-                raise McpError(ErrorCode.MethodNotFound, f"Unknown tool: {tool_name}")
+                raise _error(METHOD_NOT_FOUND, f"Unknown tool: {tool_name}")
+        except McpError:
+            raise
         except Exception as e:
-            raise McpError(ErrorCode.InternalError, str(e))
+            raise _error(INTERNAL_ERROR, str(e)) from e
 
     async def list_repositories(self, args: Dict[str, Any]):
         visibility = args.get("visibility", "all")
-        repos = self.github.get_user().get_repos(visibility=visibility)
+        limit = int(args.get("limit", 30))
+        page = int(args.get("page", 1))
+        if limit < 1 or page < 1:
+            raise _error(INVALID_PARAMS, "limit and page must be at least 1")
+
+        requests = self.api.stats["requests"]
+        cache_hits = self.api.stats["cache_hits"]
+        repos, more = await self.api.list_user_repos(visibility, limit, page)
         repo_list = [
             {
-                "name": repo.full_name,
-                "description": repo.description,
-                "url": repo.html_url,
-                "visibility": "public" if repo.public else "private",
-                "stars": repo.stargazers_count
+                "name": repo["full_name"],
+                "description": repo.get("description"),
+                "url": repo["html_url"],
+                "visibility": repo.get("visibility")
+                or ("private" if repo.get("private") else "public"),
+                "stars": repo.get("stargazers_count", 0)
             }
             for repo in repos
         ]
-        return {
-            "content": [
-                TextContent(
-                    type="text",
-                    text=f"Found {len(repo_list)} repositories:\n" + 
-                         "\n".join([f"- {r['name']} ({r['visibility']}): {r['description'] or 'No description'}"
-                                  for r in repo_list])
-                )
-            ]
-        }
+        requests = self.api.stats["requests"] - requests
+        cache_hits = self.api.stats["cache_hits"] - cache_hits
+        footer = (
+            f"Page {page}" + (f"; more available with page={page + 1}" if more else "; no more results")
+            + f"\nAPI requests: {requests} ({cache_hits} answered 304 Not Modified from cache)"
+            + f"\n{self.api.rate_limit_summary('core')}"
+        )
+        return [
+            TextContent(
+                type="text",
+                text=f"Found {len(repo_list)} repositories:\n" +
+                     "\n".join([f"- {r['name']} ({r['visibility']}, {r['stars']} stars): {r['description'] or 'No description'}"
+                              for r in repo_list]) +
+                     f"\n\n{footer}"
+            )
+        ]
+
+    async def find_repositories(self, args: Dict[str, Any]):
+        limit = int(args.get("limit", 20))
+        if not 1 <= limit <= 100:
+            raise _error(INVALID_PARAMS, "limit must be between 1 and 100")
+
+        refreshed = ""
+        # The index is SQLite; its queries run off the event loop
+        if args.get("refresh") or await asyncio.to_thread(self.index.is_stale):
+            summary = await self.index.refresh(self.api)
+            refreshed = (
+                f"; {summary['mode']} refresh: {summary['requests']} API requests, "
+                f"{summary['changed']} changed, {summary['removed']} removed"
+            )
+        repos = await asyncio.to_thread(
+            self.index.find,
+            query=args.get("query", ""),
+            language=args.get("language"),
+            topic=args.get("topic"),
+            owner=args.get("owner"),
+            visibility=args.get("visibility", "all"),
+            min_stars=int(args.get("min_stars", 0)),
+            include_archived=args.get("include_archived", True),
+            sort=args.get("sort", "relevance"),
+            limit=limit,
+        )
+        status = await asyncio.to_thread(self.index.status)
+        age = int(time.time() - status["last_refresh"])
+        lines = [
+            f"- {r['full_name']} ({r['visibility']}, {r['language'] or 'no language'}, "
+            f"{r['stars']} stars, pushed {(r['pushed_at'] or 'never')[:10]}"
+            + (", archived" if r['archived'] else "")
+            + f"): {r['description'] or 'No description'}"
+            + (f" [topics: {', '.join(r['topics'].split())}]" if r['topics'] else "")
+            for r in repos
+        ]
+        return [
+            TextContent(
+                type="text",
+                text=f"Found {len(repos)} repositories:\n" + "\n".join(lines) +
+                     f"\n\nIndex: {status['repositories']} repositories, refreshed {age}s ago{refreshed}"
+            )
+        ]
 
     async def create_issue(self, args: Dict[str, Any]):
-        repo = self.github.get_repo(args["repo"])
+        if args["repo"].count("/") != 1:
+            raise _error(INVALID_PARAMS, "repo must be in format owner/repo")
         labels = args.get("labels", [])
-        issue = repo.create_issue(
+        issue = await self.api.create_issue(
+            args["repo"],
             title=args["title"],
             body=args["body"],
             labels=labels
         )
-        return {
-            "content": [
-                TextContent(
-                    type="text",
-                    text=f"Created issue #{issue.number}: {issue.title}\nURL: {issue.html_url}"
-                )
-            ]
-        }
+        return [
+            TextContent(
+                type="text",
+                text=f"Created issue #{issue['number']}: {issue['title']}\nURL: {issue['html_url']}"
+            )
+        ]
 
     async def search_code(self, args: Dict[str, Any]):
         query = args["query"]
         if "language" in args:
             query += f" language:{args['language']}"
         
-        results = self.github.search_code(query)
+        limit = int(args.get("limit", 5))
+        if not 1 <= limit <= 100:
+            raise _error(INVALID_PARAMS, "limit must be between 1 and 100")
+
+        requests = self.api.stats["requests"]
+        results = await self.api.search_code(query, limit=limit)
         code_results = []
-        for result in results[:5]:  # Limit to first 5 results
+        for result in results:
+            repository = result["repository"]
             code_results.append({
-                "repository": result.repository.full_name,
-                "path": result.path,
-                "url": result.html_url
+                "repository": repository["full_name"],
+                "visibility": repository.get("visibility")
+                or ("private" if repository.get("private") else "public"),
+                "stars": repository.get("stargazers_count"),
+                "description": repository.get("description"),
+                "path": result["path"],
+                "url": result["html_url"]
             })
-        
+        requests = self.api.stats["requests"] - requests
+
+        return [
+            TextContent(
+                type="text",
+                text="Search results:\n" +
+                     "\n".join([f"- [{r['repository']}] {r['path']}"
+                                f" ({r['visibility']}, {r['stars'] if r['stars'] is not None else '?'} stars)"
+                                f"\n  {r['url']}"
+                                + (f"\n  {r['description']}" if r['description'] else "")
+                              for r in code_results]) +
+                     f"\n\nAPI requests: {requests}\n{self.api.rate_limit_summary('search')}"
+            )
+        ]
+
+    async def health(self) -> Dict[str, Any]:
+        # GET /rate_limit does not count against the rate limit
+        response = await self.api.request("GET", "/rate_limit")
+        resources = response.json().get("resources", {})
         return {
-            "content": [
-                TextContent(
-                    type="text",
-                    text="Search results:\n" +
-                         "\n".join([f"- [{r['repository']}] {r['path']}\n  {r['url']}"
-                                  for r in code_results])
-                )
-            ]
+            "api_url": self.api.base_url,
+            "rate_limits": {
+                name: {"remaining": limits.get("remaining"), "limit": limits.get("limit")}
+                for name, limits in resources.items()
+                if name in ("core", "search", "graphql")
+            },
+            "client": dict(self.api.stats),
+            "index": await asyncio.to_thread(self.index.status),
         }
 
+    async def aclose(self) -> None:
+        await self.api.aclose()
+
     async def run(self):
-        transport = StdioServerTransport()
-        await self.server.connect(transport)
-        print("GitHub MCP server running on stdio", file=os.sys.stderr)
+        options = self.server.create_initialization_options()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                print("GitHub MCP server running on stdio", file=sys.stderr)
+                await self.server.run(read_stream, write_stream, options)
+        finally:
+            await self.aclose()
+
+
+def create_server(
+    token: Optional[str] = None,
+) -> Tuple[Server, Callable[[], Awaitable[Dict[str, Any]]], Callable[[], Awaitable[None]]]:
+    """Build the GitHub MCP server.
+
+    The HTTP client, its rate-limit scheduler and the repository index belong
+    to the returned server rather than to a client session, so a process
+    serving several sessions (such as mcp-gateway) shares them.
+
+    Returns:
+        The server, a coroutine function checking the API, and one closing
+        the client
+    """
+    github = GitHubServer(token)
+    return github.server, github.health, github.aclose
+
 
 if __name__ == "__main__":
-    import asyncio
     server = GitHubServer()
-    asyncio.run(server.run())
\ No newline at end of file
+    asyncio.run(server.run())
@@ -0,0 +1,329 @@
+"""Local index of the user's repository metadata (SQLite FTS5)."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from github_api import DEFAULT_CACHE_DIR, GITHUB_CACHE_DIR_ENV, MAX_PER_PAGE, GitHubAPI
+
+# Location of the index database. Defaults to repos.db in the cache directory.
+GITHUB_INDEX_PATH_ENV = "GITHUB_INDEX_PATH"
+
+# Seconds after which find_repositories refreshes the index before answering
+GITHUB_INDEX_MAX_AGE_ENV = "GITHUB_INDEX_MAX_AGE"
+DEFAULT_INDEX_MAX_AGE = 300
+
+# Incremental refreshes cannot see deleted repositories or lost access, so
+# the whole listing is walked again at least this often
+FULL_REFRESH_INTERVAL = 24 * 3600
+
+# Repositories the user owns, collaborates on or can see through an org
+AFFILIATION = "owner,collaborator,organization_member"
+
+# bm25 column weights: full_name, description, topics, language
+RANK_WEIGHTS = (10.0, 2.0, 4.0, 1.0)
+
+SORT_ORDERS = {
+    "stars": "r.stars DESC, r.full_name",
+    "pushed": "r.pushed_at DESC, r.full_name",
+    "name": "r.full_name",
+}
+
+
+def _match_expression(query: str) -> str:
+    """Quote every term as a prefix so partial names match and any text is valid."""
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in query.split())
+
+
+class RepoIndex:
+    """Repository metadata kept in SQLite with an FTS5 table for lookups.
+
+    Refreshes walk ``/user/repos`` newest-updated first through the client's
+    conditional-request cache. An incremental refresh stops at the first page
+    that is unchanged (a free 304) or that reaches repositories already
+    indexed at their current ``updated_at``, so a refresh with nothing new
+    costs a single request and no quota. Full refreshes also drop
+    repositories that are no longer listed.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = os.environ.get(GITHUB_INDEX_PATH_ENV) or Path(
+                os.environ.get(GITHUB_CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+            ) / "repos.db"
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = float(
+            os.environ.get(GITHUB_INDEX_MAX_AGE_ENV, "").strip() or DEFAULT_INDEX_MAX_AGE
+        )
+        self.lock = asyncio.Lock()
+        with self._connect() as db:
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS repositories (
+                    id INTEGER PRIMARY KEY,
+                    full_name TEXT NOT NULL,
+                    description TEXT,
+                    topics TEXT NOT NULL,
+                    language TEXT,
+                    stars INTEGER NOT NULL,
+                    visibility TEXT NOT NULL,
+                    archived INTEGER NOT NULL,
+                    fork INTEGER NOT NULL,
+                    html_url TEXT NOT NULL,
+                    pushed_at TEXT,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS repositories_fts USING fts5(
+                    full_name,
+                    description,
+                    topics,
+                    language,
+                    tokenize='porter unicode61'
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _meta(self, db: sqlite3.Connection) -> Dict[str, Any]:
+        return {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM meta")}
+
+    def _set_meta(self, db: sqlite3.Connection, **values: Any) -> None:
+        db.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in values.items()],
+        )
+
+    def _upsert(self, db: sqlite3.Connection, repos: List[Dict[str, Any]]) -> int:
+        """Store repositories, returning how many were new or changed."""
+        changed = 0
+        for repo in repos:
+            row = db.execute(
+                "SELECT updated_at, stars FROM repositories WHERE id = ?", (repo["id"],)
+            ).fetchone()
+            stars = repo.get("stargazers_count", 0)
+            if row and row["updated_at"] == repo["updated_at"] and row["stars"] == stars:
+                continue
+            changed += 1
+            topics = " ".join(repo.get("topics") or [])
+            visibility = repo.get("visibility") or ("private" if repo.get("private") else "public")
+            db.execute(
+                "INSERT OR REPLACE INTO repositories VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    repo["id"],
+                    repo["full_name"],
+                    repo.get("description"),
+                    topics,
+                    repo.get("language"),
+                    stars,
+                    visibility,
+                    int(bool(repo.get("archived"))),
+                    int(bool(repo.get("fork"))),
+                    repo["html_url"],
+                    repo.get("pushed_at"),
+                    repo["updated_at"],
+                ),
+            )
+            db.execute("DELETE FROM repositories_fts WHERE rowid = ?", (repo["id"],))
+            db.execute(
+                "INSERT INTO repositories_fts (rowid, full_name, description, topics, language) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (repo["id"], repo["full_name"], repo.get("description") or "", topics,
+                 repo.get("language") or ""),
+            )
+        return changed
+
+    def status(self) -> Dict[str, Any]:
+        with self._connect() as db:
+            meta = self._meta(db)
+            count = db.execute("SELECT count(*) FROM repositories").fetchone()[0]
+        return {"repositories": count, **meta}
+
+    def is_stale(self) -> bool:
+        refreshed = self.status().get("last_refresh")
+        return refreshed is None or time.time() - refreshed > self.max_age
+
+    def _read_meta(self) -> Dict[str, Any]:
+        with self._connect() as db:
+            return self._meta(db)
+
+    def _store_page(self, repos: List[Dict[str, Any]]) -> int:
+        with self._connect() as db:
+            return self._upsert(db, repos)
+
+    def _finish_refresh(self, full: bool, seen: set, newest: str) -> int:
+        """Record the refresh, dropping unseen repositories after a full one.
+
+        Returns:
+            Number of repositories removed
+        """
+        removed = 0
+        now = time.time()
+        with self._connect() as db:
+            if full:
+                stale = [
+                    row["id"]
+                    for row in db.execute("SELECT id FROM repositories")
+                    if row["id"] not in seen
+                ]
+                for repo_id in stale:
+                    db.execute("DELETE FROM repositories WHERE id = ?", (repo_id,))
+                    db.execute("DELETE FROM repositories_fts WHERE rowid = ?", (repo_id,))
+                removed = len(stale)
+                self._set_meta(db, last_full_refresh=now)
+            self._set_meta(db, last_refresh=now, high_water=newest)
+        return removed
+
+    async def refresh(self, api: GitHubAPI, full: bool = False) -> Dict[str, Any]:
+        """Bring the index up to date with the API.
+
+        Args:
+            api: Client used for the listing requests
+            full: Walk every page and drop repositories no longer listed;
+                implied when the index is empty or the last full refresh is
+                older than FULL_REFRESH_INTERVAL
+
+        Returns:
+            Summary with the mode, pages read, repositories changed and
+            removed, and the API requests made
+        """
+        async with self.lock:
+            # Database work runs on a thread so the event loop is not blocked
+            meta = await asyncio.to_thread(self._read_meta)
+            full = (
+                full
+                or "last_full_refresh" not in meta
+                or time.time() - meta["last_full_refresh"] > FULL_REFRESH_INTERVAL
+            )
+            high_water = meta.get("high_water", "")
+            requests = api.stats["requests"]
+            seen: set = set()
+            changed = pages = 0
+            newest = high_water
+            page = 1
+            while True:
+                repos, headers, cached = await api.get(
+                    "/user/repos",
+                    {
+                        "affiliation": AFFILIATION,
+                        "sort": "updated",
+                        "direction": "desc",
+                        "per_page": MAX_PER_PAGE,
+                        "page": page,
+                    },
+                )
+                pages += 1
+                # Nothing on the newest page changed, so nothing was updated
+                if cached and page == 1 and not full:
+                    break
+                changed += await asyncio.to_thread(self._store_page, repos)
+                seen.update(repo["id"] for repo in repos)
+                newest = max([newest] + [repo["updated_at"] for repo in repos])
+                if not full and repos and repos[-1]["updated_at"] <= high_water:
+                    break
+                if 'rel="next"' not in headers.get("Link", ""):
+                    break
+                page += 1
+
+            removed = await asyncio.to_thread(self._finish_refresh, full, seen, newest)
+            return {
+                "mode": "full" if full else "incremental",
+                "pages": pages,
+                "changed": changed,
+                "removed": removed,
+                "requests": api.stats["requests"] - requests,
+            }
+
+    def find(
+        self,
+        query: str = "",
+        language: Optional[str] = None,
+        topic: Optional[str] = None,
+        owner: Optional[str] = None,
+        visibility: str = "all",
+        min_stars: int = 0,
+        include_archived: bool = True,
+        sort: str = "relevance",
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Look repositories up in the index without touching the API.
+
+        Text is matched as term prefixes against names, descriptions, topics
+        and languages and ranked with BM25, names weighted highest. When no
+        term matches, repositories whose full name contains the query are
+        returned instead.
+        """
+        filters, params = [], []
+        if language:
+            filters.append("lower(r.language) = lower(?)")
+            params.append(language)
+        if topic:
+            filters.append("(' ' || r.topics || ' ') LIKE ?")
+            params.append(f"% {topic.lower()} %")
+        if owner:
+            filters.append("lower(r.full_name) LIKE ?")
+            params.append(f"{owner.lower()}/%")
+        if visibility != "all":
+            filters.append("r.visibility = ?")
+            params.append(visibility)
+        if min_stars:
+            filters.append("r.stars >= ?")
+            params.append(min_stars)
+        if not include_archived:
+            filters.append("r.archived = 0")
+        where = "".join(f" AND {condition}" for condition in filters)
+        order = SORT_ORDERS.get(sort)
+
+        with self._connect() as db:
+            rows = []
+            if query.strip():
+                weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+                rows = db.execute(
+                    f"""
+                    SELECT r.* FROM repositories_fts f
+                    JOIN repositories r ON r.id = f.rowid
+                    WHERE repositories_fts MATCH ?{where}
+                    ORDER BY {order or f"bm25(repositories_fts, {weights})"}
+                    LIMIT ?
+                    """,
+                    [_match_expression(query), *params, limit],
+                ).fetchall()
+                if not rows:
+                    rows = db.execute(
+                        f"""
+                        SELECT r.* FROM repositories r
+                        WHERE r.full_name LIKE ?{where}
+                        ORDER BY {order or "r.stars DESC, r.full_name"}
+                        LIMIT ?
+                        """,
+                        [f"%{query.strip()}%", *params, limit],
+                    ).fetchall()
+            else:
+                rows = db.execute(
+                    f"""
+                    SELECT r.* FROM repositories r
+                    WHERE 1 = 1{where}
+                    ORDER BY {order or "r.stars DESC, r.full_name"}
+                    LIMIT ?
+                    """,
+                    [*params, limit],
+                ).fetchall()
+        return [dict(row) for row in rows]
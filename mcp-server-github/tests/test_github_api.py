@@ -0,0 +1,169 @@
+import asyncio
+import json
+import time
+import urllib.request
+
+import pytest
+
+from github_api import GitHubAPI, GitHubAPIError, RateLimited, ResponseCache, TokenBucket
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_token_bucket_allows_burst_then_refills():
+    async def scenario():
+        bucket = TokenBucket(rate=20.0, capacity=3)
+        waits = [await bucket.acquire() for _ in range(5)]
+        return waits
+
+    waits = run(scenario())
+    assert all(wait < 0.01 for wait in waits[:3])
+    # Each further token takes 1/rate seconds to refill
+    assert all(0.03 < wait < 0.1 for wait in waits[3:])
+
+
+def test_token_bucket_serves_concurrent_waiters_at_rate():
+    async def scenario():
+        bucket = TokenBucket(rate=50.0, capacity=1)
+        started = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        return time.monotonic() - started
+
+    # One token at once, then five more at 50/s
+    assert 0.09 < run(scenario()) < 0.2
+
+
+def test_token_bucket_pause_holds_back_every_caller():
+    async def scenario():
+        bucket = TokenBucket(rate=1000.0, capacity=10)
+        bucket.pause(0.1)
+        return await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+
+    assert all(wait >= 0.09 for wait in run(scenario()))
+
+
+def test_token_bucket_capacity_is_at_least_one():
+    assert TokenBucket(rate=0.1, capacity=0.2).capacity == 1.0
+
+
+@pytest.fixture
+def api(stub, tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_REQUESTS_PER_SECOND", "1000")
+    monkeypatch.setenv("GITHUB_SEARCH_PER_MINUTE", "1000")
+    return lambda: GitHubAPI("token", base_url=stub, cache=ResponseCache(str(tmp_path)))
+
+
+def test_code_search_limits_are_tracked_as_search(api):
+    async def scenario():
+        client = api()
+        try:
+            await client.search_code("parser", limit=3)
+            await client.get("/user/repos", {"per_page": 5})
+            return client.rate_limits
+        finally:
+            await client.client.aclose()
+
+    limits = run(scenario())
+    assert set(limits) == {"search", "core", "graphql"}
+    assert limits["search"]["limit"] == 5000
+
+
+def test_exhausted_search_limit_is_enforced(api):
+    async def scenario():
+        client = api()
+        try:
+            client.rate_limits["search"] = {"remaining": 0, "reset": int(time.time()) + 3600}
+            await client.search_code("parser")
+        finally:
+            await client.client.aclose()
+
+    with pytest.raises(RateLimited, match="search rate limit exhausted"):
+        run(scenario())
+
+
+def test_get_revalidates_cached_responses(api, stub):
+    async def scenario():
+        client = api()
+        try:
+            first = await client.get("/user/repos", {"per_page": 5, "page": 2})
+            second = await client.get("/user/repos", {"per_page": 5, "page": 2})
+            return first, second, client.stats
+        finally:
+            await client.client.aclose()
+
+    (body, headers, hit), (cached_body, cached_headers, cached_hit), stats = run(scenario())
+    assert not hit and cached_hit
+    assert cached_body == body and len(body) == 5
+    assert cached_headers["Link"] == headers["Link"]
+    assert stats["cache_hits"] == 1
+    with urllib.request.urlopen(f"{stub}/_stats") as response:
+        assert json.load(response)["not_modified"] == 1
+
+
+def stub_stats(stub):
+    with urllib.request.urlopen(f"{stub}/_stats") as response:
+        return json.load(response)
+
+
+def search(api, patch=None):
+    async def scenario():
+        client = api()
+        if patch:
+            patch(client)
+        try:
+            return await client.search_code("parser", limit=30)
+        finally:
+            await client.client.aclose()
+
+    return run(scenario())
+
+
+def assert_enriched(items):
+    from stub_api import make_repos
+
+    repos = {repo["full_name"]: repo for repo in make_repos(250)}
+    for item in items:
+        repository = item["repository"]
+        expected = repos[repository["full_name"]]
+        assert repository["description"] == expected["description"]
+        assert repository["visibility"] == expected["visibility"]
+        assert repository["stargazers_count"] == expected["stargazers_count"]
+
+
+def test_search_code_enriches_with_one_graphql_query(api, stub):
+    items = search(api)
+    assert len(items) == 30
+    assert_enriched(items)
+    counts = stub_stats(stub)
+    assert counts["/graphql"] == 1
+    assert counts.get("/repos/{owner}/{repo}", 0) == 0
+
+
+def test_search_code_falls_back_to_rest_when_graphql_fails(api, stub):
+    async def failing(query, variables):
+        raise GitHubAPIError("GraphQL query failed: unavailable")
+
+    items = search(api, lambda client: setattr(client, "graphql", failing))
+    assert_enriched(items)
+    unique = {item["repository"]["full_name"] for item in items}
+    assert stub_stats(stub)["/repos/{owner}/{repo}"] == len(unique)
+
+
+def test_search_code_falls_back_to_rest_for_null_nodes(api, stub):
+    def drop_first_node(client):
+        graphql = client.graphql
+
+        async def partial(query, variables):
+            data = await graphql(query, variables)
+            data["nodes"][0] = None
+            return data
+
+        client.graphql = partial
+
+    items = search(api, drop_first_node)
+    assert_enriched(items)
+    counts = stub_stats(stub)
+    assert counts["/graphql"] == 1
+    assert counts["/repos/{owner}/{repo}"] == 1
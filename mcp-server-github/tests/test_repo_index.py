@@ -0,0 +1,76 @@
+import asyncio
+import urllib.request
+
+import pytest
+
+from github_api import GitHubAPI, ResponseCache
+from repo_index import RepoIndex
+
+
+@pytest.fixture
+def index_and_api(stub, tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_REQUESTS_PER_SECOND", "1000")
+
+    def make():
+        api = GitHubAPI("token", base_url=stub, cache=ResponseCache(str(tmp_path)))
+        return RepoIndex(str(tmp_path / "repos.db")), api
+
+    return make
+
+
+def run(index_and_api, scenario):
+    async def main():
+        index, api = index_and_api()
+        try:
+            return await scenario(index, api)
+        finally:
+            await api.client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_refresh_and_find(index_and_api):
+    async def scenario(index, api):
+        assert await asyncio.to_thread(index.is_stale)
+        summary = await index.refresh(api)
+        return summary, index.status(), index.is_stale(), index.find(limit=3, sort="name")
+
+    summary, status, stale, repos = run(index_and_api, scenario)
+    assert summary["mode"] == "full"
+    assert summary["changed"] == status["repositories"] == 250
+    assert summary["requests"] == 3
+    assert not stale
+    assert [repo["full_name"] for repo in repos] == sorted(repo["full_name"] for repo in repos)
+
+
+def test_incremental_refresh_only_reads_changes(index_and_api, stub):
+    async def scenario(index, api):
+        await index.refresh(api)
+        unchanged = await index.refresh(api)
+        urllib.request.urlopen(urllib.request.Request(f"{stub}/_touch?repo=7", method="POST"))
+        touched = await index.refresh(api)
+        return unchanged, touched
+
+    unchanged, touched = run(index_and_api, scenario)
+    assert unchanged == {
+        "mode": "incremental", "pages": 1, "changed": 0, "removed": 0, "requests": 1
+    }
+    assert touched["mode"] == "incremental"
+    assert touched["changed"] >= 1 and touched["pages"] == 1
+
+
+def test_find_filters_and_prefix_matching(index_and_api):
+    async def scenario(index, api):
+        await index.refresh(api)
+        everything = index.find(limit=100)
+        name = everything[0]["full_name"].split("/")[1]
+        by_prefix = index.find(query=name[:4], limit=100)
+        python = index.find(language="python", limit=100)
+        starred = index.find(min_stars=everything[0]["stars"], limit=100)
+        return name, by_prefix, python, starred, everything
+
+    name, by_prefix, python, starred, everything = run(index_and_api, scenario)
+    assert any(repo["full_name"].endswith("/" + name) for repo in by_prefix)
+    assert python and all(repo["language"].lower() == "python" for repo in python)
+    assert everything[0] in starred
+    assert all(repo["stars"] >= everything[0]["stars"] for repo in starred)